@@ -10,6 +10,7 @@ from nrlf.core.errors import OperationOutcomeError
 from nrlf.core.logger import LogReference, logger
 from nrlf.core.model import ConnectionMetadata, ReadDocumentReferencePathParams
 from nrlf.core.response import Response, SpineErrorConcept, SpineErrorResponse
+from nrlf.core.timing import recorder
 
 
 @request_handler(path=ReadDocumentReferencePathParams)
@@ -57,7 +58,8 @@ def handler(
         )
 
     try:
-        document_reference = DocumentReference.parse_raw(result.document)
+        with recorder.span("reparse"):
+            document_reference = DocumentReference.parse_raw(result.document)
     except ValidationError as exc:
         logger.log(
             LogReference.CONREAD003,
@@ -1,4 +1,6 @@
 import json
+import os
+from unittest import mock
 
 from moto import mock_aws
 
@@ -311,7 +313,8 @@ def test_search_document_reference_invalid_json(repository: DocumentPointerRepos
         },
     )
 
-    result = handler(event, create_mock_context())
+    with mock.patch.dict(os.environ, {"SEARCH_VERIFY_SAMPLE_RATE": "1"}):
+        result = handler(event, create_mock_context())
     body = result.pop("body")
 
     assert result == {
@@ -340,3 +343,138 @@ def test_search_document_reference_invalid_json(repository: DocumentPointerRepos
             }
         ],
     }
+
+
+@mock_aws
+@mock_repository
+def test_search_document_reference_paginated_results(
+    repository: DocumentPointerRepository,
+):
+    doc_ref = load_document_reference("Y05868-736253002-Valid")
+    doc_ids = []
+    for index in range(3):
+        doc_ref.id = f"Y05868-99999-99999-99999{index}"
+        repository.create(DocumentPointer.from_document_reference(doc_ref))
+        doc_ids.append(doc_ref.id)
+
+    event = create_test_api_gateway_event(
+        headers=create_headers(),
+        query_string_parameters={
+            "subject:identifier": "https://fhir.nhs.uk/Id/nhs-number|6700028191",
+        },
+    )
+
+    with mock.patch.dict(os.environ, {"SEARCH_PAGE_SIZE": "2"}):
+        first_result = handler(event, create_mock_context())
+
+    assert first_result["statusCode"] == "200"
+    first_page = json.loads(first_result["body"])
+    assert "total" not in first_page
+    assert [entry["resource"]["id"] for entry in first_page["entry"]] == doc_ids[:2]
+
+    self_link, next_link = first_page["link"]
+    assert self_link["relation"] == "self"
+    assert next_link["relation"] == "next"
+    assert next_link["url"].startswith(self_link["url"] + "&next-page-token=")
+
+    next_page_token = next_link["url"].split("&next-page-token=")[1]
+    event = create_test_api_gateway_event(
+        headers=create_headers(),
+        query_string_parameters={
+            "subject:identifier": "https://fhir.nhs.uk/Id/nhs-number|6700028191",
+            "next-page-token": next_page_token,
+        },
+    )
+
+    with mock.patch.dict(os.environ, {"SEARCH_PAGE_SIZE": "2"}):
+        second_result = handler(event, create_mock_context())
+
+    assert second_result["statusCode"] == "200"
+    second_page = json.loads(second_result["body"])
+    assert "total" not in second_page
+    assert [entry["resource"]["id"] for entry in second_page["entry"]] == doc_ids[2:]
+    assert [link["relation"] for link in second_page["link"]] == ["self"]
+
+
+@mock_aws
+@mock_repository
+def test_search_document_reference_next_page_token_for_other_filters(
+    repository: DocumentPointerRepository,
+):
+    doc_ref = load_document_reference("Y05868-736253002-Valid")
+    for index in range(3):
+        doc_ref.id = f"Y05868-99999-99999-99999{index}"
+        repository.create(DocumentPointer.from_document_reference(doc_ref))
+
+    event = create_test_api_gateway_event(
+        headers=create_headers(),
+        query_string_parameters={
+            "subject:identifier": "https://fhir.nhs.uk/Id/nhs-number|6700028191",
+        },
+    )
+
+    with mock.patch.dict(os.environ, {"SEARCH_PAGE_SIZE": "2"}):
+        first_result = handler(event, create_mock_context())
+
+    _, next_link = json.loads(first_result["body"])["link"]
+    event = create_test_api_gateway_event(
+        headers=create_headers(),
+        query_string_parameters={
+            "subject:identifier": "https://fhir.nhs.uk/Id/nhs-number|6700028191",
+            "type": "http://snomed.info/sct|736253002",
+            "next-page-token": next_link["url"].split("&next-page-token=")[1],
+        },
+    )
+
+    with mock.patch.dict(os.environ, {"SEARCH_PAGE_SIZE": "2"}):
+        second_result = handler(event, create_mock_context())
+
+    assert second_result["statusCode"] == "400"
+    issue = json.loads(second_result["body"])["issue"][0]
+    assert issue["details"]["coding"][0]["code"] == "INVALID_PARAMETER"
+    assert issue["expression"] == ["next-page-token"]
+
+
+@mock_aws
+@mock_repository
+def test_search_document_reference_invalid_next_page_token(
+    repository: DocumentPointerRepository,
+):
+    event = create_test_api_gateway_event(
+        headers=create_headers(),
+        query_string_parameters={
+            "subject:identifier": "https://fhir.nhs.uk/Id/nhs-number|6700028191",
+            "next-page-token": "invalid.token",
+        },
+    )
+
+    result = handler(event, create_mock_context())
+    body = result.pop("body")
+
+    assert result == {
+        "statusCode": "400",
+        "headers": default_response_headers(),
+        "isBase64Encoded": False,
+    }
+
+    parsed_body = json.loads(body)
+    assert parsed_body == {
+        "resourceType": "OperationOutcome",
+        "issue": [
+            {
+                "severity": "error",
+                "code": "invalid",
+                "details": {
+                    "coding": [
+                        {
+                            "code": "INVALID_PARAMETER",
+                            "display": "Invalid parameter",
+                            "system": "https://fhir.nhs.uk/ValueSet/Spine-ErrorOrWarningCode-1",
+                        }
+                    ]
+                },
+                "diagnostics": "Invalid next-page-token (The provided token is not valid for this search)",
+                "expression": ["next-page-token"],
+            }
+        ],
+    }
@@ -1,6 +1,8 @@
+import random
+
 from pydantic import ValidationError
 
-from nrlf.consumer.fhir.r4.model import Bundle, DocumentReference
+from nrlf.consumer.fhir.r4.model import DocumentReference
 from nrlf.core.codes import SpineErrorConcept
 from nrlf.core.config import Config
 from nrlf.core.decorators import request_handler
@@ -8,7 +10,9 @@ from nrlf.core.dynamodb.repository import DocumentPointerRepository
 from nrlf.core.errors import OperationOutcomeError
 from nrlf.core.logger import LogReference, logger
 from nrlf.core.model import ConnectionMetadata, ConsumerRequestParams
+from nrlf.core.pagination import create_next_link, get_start_key, search_filters
 from nrlf.core.response import Response, SpineErrorResponse
+from nrlf.core.timing import recorder
 from nrlf.core.validators import validate_type_system
 
 
@@ -17,6 +21,7 @@ def handler(
     body: ConsumerRequestParams,
     metadata: ConnectionMetadata,
     repository: DocumentPointerRepository,
+    config: Config,
 ) -> Response:
     """
     Search for document references based on the provided parameters.
@@ -25,6 +30,7 @@ def handler(
         body (ConsumerRequestParams): The request parameters for the search.
         metadata (ConnectionMetadata): The metadata containing pointer types.
         repository (DocumentPointerRepository): The repository for document pointers.
+        config (Config): The application config.
 
     Returns:
         Response: The response containing the search results.
@@ -46,7 +52,6 @@ def handler(
             expression="subject:identifier",
         )
 
-    config = Config()
     base_url = f"https://{config.ENVIRONMENT}.api.service.nhs.uk/"
     self_link = f"{base_url}record-locator/consumer/FHIR/R4/DocumentReference?subject:identifier=https://fhir.nhs.uk/Id/nhs-number|{body.nhs_number}"
 
@@ -73,13 +78,23 @@ def handler(
     if body.type:
         self_link += f"&type={body.type.__root__}"
 
-    bundle = {
-        "resourceType": "Bundle",
-        "type": "searchset",
-        "link": [{"relation": "self", "url": self_link}],
-        "total": 0,
-        "entry": [],
-    }
+    page_size = config.SEARCH_PAGE_SIZE
+    start_key = None
+    filters = search_filters(pointer_types, custodian_id)
+    if config.PAGINATION_TOKEN_SECRET:
+        start_key = get_start_key(
+            body.next_page_token,
+            body.nhs_number,
+            filters,
+            config.PAGINATION_TOKEN_SECRET,
+        )
+    else:
+        logger.log(LogReference.CONPOSTSEARCH006)
+        page_size = None
+
+    links = [{"relation": "self", "url": self_link}]
+    documents = []
+    verify_documents = random.random() < config.SEARCH_VERIFY_SAMPLE_RATE
 
     logger.log(
         LogReference.CONPOSTSEARCH003,
@@ -88,34 +103,48 @@ def handler(
         pointer_types=pointer_types,
     )
 
-    for result in repository.search(
-        nhs_number=body.nhs_number, custodian=custodian_id, pointer_types=pointer_types
-    ):
-        try:
-            document_reference = DocumentReference.parse_raw(result.document)
-            bundle["total"] += 1
-            bundle["entry"].append(
-                {"resource": document_reference.dict(exclude_none=True)}
-            )
-            logger.log(
-                LogReference.CONPOSTSEARCH004,
-                id=document_reference.id,
-                count=bundle["total"],
-            )
+    results = repository.search_page(
+        nhs_number=body.nhs_number,
+        custodian=custodian_id,
+        pointer_types=pointer_types,
+        page_size=page_size,
+        start_key=start_key,
+    )
 
-        except ValidationError as exc:
-            logger.log(
-                LogReference.CONPOSTSEARCH005, error=str(exc), document=result.document
+    for result in results.items:
+        if verify_documents:
+            try:
+                with recorder.span("reparse"):
+                    DocumentReference.parse_raw(result.document)
+            except ValidationError as exc:
+                logger.log(
+                    LogReference.CONPOSTSEARCH005,
+                    error=str(exc),
+                    document=result.document,
+                )
+                raise OperationOutcomeError(
+                    status_code="500",
+                    severity="error",
+                    code="exception",
+                    details=SpineErrorConcept.from_code("INTERNAL_SERVER_ERROR"),
+                    diagnostics="An error occurred whilst parsing the document reference search results",
+                ) from exc
+
+        documents.append(result.document)
+        logger.log(LogReference.CONPOSTSEARCH004, id=result.id, count=len(documents))
+
+    if results.last_evaluated_key:
+        links.append(
+            create_next_link(
+                self_link,
+                results.last_evaluated_key,
+                filters,
+                config.PAGINATION_TOKEN_SECRET,
             )
-            raise OperationOutcomeError(
-                status_code="500",
-                severity="error",
-                code="exception",
-                details=SpineErrorConcept.from_code("INTERNAL_SERVER_ERROR"),
-                diagnostics="An error occurred whilst parsing the document reference search results",
-            ) from exc
-
-    response = Response.from_resource(Bundle.parse_obj(bundle))
+        )
+
+    paged = start_key is not None or bool(results.last_evaluated_key)
+    response = Response.from_search_results(documents, links, paged=paged)
     logger.log(LogReference.CONPOSTSEARCH999)
 
     return response
@@ -1,4 +1,6 @@
 import json
+import os
+from unittest import mock
 
 from moto import mock_aws
 
@@ -328,7 +330,8 @@ def test_search_post_document_reference_invalid_json(
         ),
     )
 
-    result = handler(event, create_mock_context())
+    with mock.patch.dict(os.environ, {"SEARCH_VERIFY_SAMPLE_RATE": "1"}):
+        result = handler(event, create_mock_context())
     body = result.pop("body")
 
     assert result == {
@@ -357,3 +360,56 @@ def test_search_post_document_reference_invalid_json(
             }
         ],
     }
+
+
+@mock_aws
+@mock_repository
+def test_search_post_document_reference_paginated_results(
+    repository: DocumentPointerRepository,
+):
+    doc_ref = load_document_reference("Y05868-736253002-Valid")
+    doc_ids = []
+    for index in range(3):
+        doc_ref.id = f"Y05868-99999-99999-99999{index}"
+        repository.create(DocumentPointer.from_document_reference(doc_ref))
+        doc_ids.append(doc_ref.id)
+
+    event = create_test_api_gateway_event(
+        headers=create_headers(),
+        body=json.dumps(
+            {
+                "subject:identifier": "https://fhir.nhs.uk/Id/nhs-number|6700028191",
+            }
+        ),
+    )
+
+    with mock.patch.dict(os.environ, {"SEARCH_PAGE_SIZE": "2"}):
+        first_result = handler(event, create_mock_context())
+
+    assert first_result["statusCode"] == "200"
+    first_page = json.loads(first_result["body"])
+    assert "total" not in first_page
+    assert [entry["resource"]["id"] for entry in first_page["entry"]] == doc_ids[:2]
+
+    self_link, next_link = first_page["link"]
+    assert next_link["relation"] == "next"
+    assert next_link["url"].startswith(self_link["url"] + "&next-page-token=")
+
+    event = create_test_api_gateway_event(
+        headers=create_headers(),
+        body=json.dumps(
+            {
+                "subject:identifier": "https://fhir.nhs.uk/Id/nhs-number|6700028191",
+                "next-page-token": next_link["url"].split("&next-page-token=")[1],
+            }
+        ),
+    )
+
+    with mock.patch.dict(os.environ, {"SEARCH_PAGE_SIZE": "2"}):
+        second_result = handler(event, create_mock_context())
+
+    assert second_result["statusCode"] == "200"
+    second_page = json.loads(second_result["body"])
+    assert "total" not in second_page
+    assert [entry["resource"]["id"] for entry in second_page["entry"]] == doc_ids[2:]
+    assert [link["relation"] for link in second_page["link"]] == ["self"]
@@ -1,7 +1,11 @@
 import sys
 
-from nrlf.core.config import Config
-from nrlf.core.decorators import DocumentPointerRepository, request_handler
+from nrlf.core.config import get_config
+from nrlf.core.decorators import (
+    DocumentPointerRepository,
+    get_repository,
+    request_handler,
+)
 from nrlf.core.logger import LogReference, logger
 from nrlf.core.response import Response
 
@@ -17,10 +21,10 @@ def handler(event, context) -> Response:
     try:
         logger.log(LogReference.STATUS000)
         logger.log(LogReference.STATUS001)
-        config = Config()
+        config = get_config()
 
         logger.log(LogReference.STATUS002)
-        repository = DocumentPointerRepository(table_name=config.TABLE_NAME)
+        repository = get_repository(DocumentPointerRepository, config.TABLE_NAME)
         repository.get_by_id("ODSX-NULL")
 
         response = Response(statusCode="200", body="OK")
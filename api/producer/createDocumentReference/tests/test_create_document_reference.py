@@ -5,11 +5,9 @@ from freezegun import freeze_time
 from moto import mock_aws
 from pytest import mark
 
-from api.producer.createDocumentReference.create_document_reference import (
-    _set_create_time_fields,
-    handler,
-)
+from api.producer.createDocumentReference.create_document_reference import handler
 from nrlf.core.dynamodb.repository import DocumentPointer, DocumentPointerRepository
+from nrlf.core.producer import set_create_time_fields
 from nrlf.producer.fhir.r4.model import (
     DocumentReferenceRelatesTo,
     Identifier,
@@ -1350,7 +1348,7 @@ def test__set_create_time_fields(doc_ref_name: str):
     test_doc_ref = load_document_reference(doc_ref_name)
     test_perms = []
 
-    response = _set_create_time_fields(test_time, test_doc_ref, test_perms)
+    response = set_create_time_fields(test_time, test_doc_ref, test_perms)
 
     assert response.dict(exclude_none=True) == {
         **test_doc_ref.dict(exclude_none=True),
@@ -1374,7 +1372,7 @@ def test__set_create_time_fields_when_doc_has_date_and_perms(doc_ref_name: str):
     test_doc_ref = load_document_reference(doc_ref_name)
     test_perms = ["audit-dates-from-payload"]
 
-    response = _set_create_time_fields(test_time, test_doc_ref, test_perms)
+    response = set_create_time_fields(test_time, test_doc_ref, test_perms)
 
     assert response.dict(exclude_none=True) == {
         **test_doc_ref.dict(exclude_none=True),
@@ -1391,7 +1389,7 @@ def test__set_create_time_fields_when_no_date_but_perms():
     test_doc_ref = load_document_reference("Y05868-736253002-Valid")
     test_perms = ["audit-dates-from-payload"]
 
-    response = _set_create_time_fields(test_time, test_doc_ref, test_perms)
+    response = set_create_time_fields(test_time, test_doc_ref, test_perms)
 
     assert response.dict(exclude_none=True) == {
         **test_doc_ref.dict(exclude_none=True),
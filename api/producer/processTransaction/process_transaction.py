@@ -0,0 +1,191 @@
+import json
+from typing import List, Optional, Tuple
+from uuid import uuid4
+
+from nrlf.core.constants import PRODUCER_URL_PATH
+from nrlf.core.decorators import request_handler
+from nrlf.core.dynamodb.repository import DocumentPointer, DocumentPointerRepository
+from nrlf.core.logger import LogReference, logger
+from nrlf.core.model import ConnectionMetadata
+from nrlf.core.pipeline import DocumentReferencePipeline
+from nrlf.core.producer import check_permissions, create_core_model
+from nrlf.core.response import Response, SpineErrorResponse, json_format
+from nrlf.producer.fhir.r4.model import Bundle, BundleEntry
+
+MAX_BUNDLE_ENTRIES = 100
+BUNDLE_RESPONSE_TYPES = {
+    "batch": "batch-response",
+    "transaction": "transaction-response",
+}
+
+
+def _process_entry(
+    entry: BundleEntry,
+    metadata: ConnectionMetadata,
+) -> Tuple[Optional[DocumentPointer], Optional[Response]]:
+    """
+    Validate a Bundle entry and create the DocumentPointer for it, returning
+    either the DocumentPointer or the error response for the entry
+    """
+    request = entry.request
+    if (
+        not entry.resource
+        or not request
+        or request.method != "POST"
+        or request.url.strip("/") != "DocumentReference"
+    ):
+        logger.log(LogReference.PROTRANS003, request=request)
+        return None, SpineErrorResponse.BAD_REQUEST(
+            diagnostics="Bundle entries must be a POST request to create a DocumentReference",
+            expression="request",
+        )
+
+    resource = entry.resource
+    if resource.relatesTo:
+        logger.log(LogReference.PROTRANS003, request=request)
+        return None, SpineErrorResponse.BAD_REQUEST(
+            diagnostics="Superseding a DocumentReference is not supported in a Bundle",
+            expression="resource.relatesTo",
+        )
+
+    id_prefix = "|".join(metadata.ods_code_parts)
+    resource.id = f"{id_prefix}-{uuid4()}"
+
+    pipeline = DocumentReferencePipeline(resource)
+    result = pipeline.validate()
+    if not result.is_valid:
+        return None, Response.from_issues(issues=result.issues, statusCode="400")
+
+    core_model = create_core_model(pipeline, metadata)
+    if error_response := check_permissions(core_model, metadata):
+        return None, error_response
+
+    return core_model, None
+
+
+def _entry_outcome(response: Response, idx: int) -> dict:
+    """
+    Create the OperationOutcome for a failed Bundle entry, with each issue
+    expression made relative to the Bundle
+    """
+    outcome = json.loads(response.body)
+    for issue in outcome.get("issue", []):
+        if expression := issue.get("expression"):
+            issue["expression"] = [
+                (
+                    f"entry[{idx}].{item}"
+                    if item.startswith(("request", "resource"))
+                    else f"entry[{idx}].resource.{item}"
+                )
+                for item in expression
+            ]
+    return outcome
+
+
+@request_handler(body=Bundle)
+def handler(
+    metadata: ConnectionMetadata,
+    repository: DocumentPointerRepository,
+    body: Bundle,
+) -> Response:
+    """
+    Creates the document references in a batch or transaction Bundle.
+
+    Each entry in a batch is processed independently, so valid entries are
+    created even if others fail. A transaction is only written if every entry
+    is valid, and all of its document references are created atomically.
+
+    Args:
+        metadata (ConnectionMetadata): The connection metadata.
+        repository (DocumentPointerRepository): The document pointer repository.
+        body (Bundle): The Bundle of document references to create.
+
+    Returns:
+        Response: A batch-response or transaction-response Bundle.
+    """
+    logger.log(LogReference.PROTRANS000)
+
+    if body.type not in BUNDLE_RESPONSE_TYPES:
+        logger.log(LogReference.PROTRANS001, type=body.type)
+        return SpineErrorResponse.BAD_REQUEST(
+            diagnostics="The Bundle type must be either 'batch' or 'transaction'",
+            expression="type",
+        )
+
+    entries = body.entry or []
+    if body.type == "transaction" and not entries:
+        logger.log(LogReference.PROTRANS002a)
+        return SpineErrorResponse.BAD_REQUEST(
+            diagnostics="A transaction Bundle must contain at least one entry",
+            expression="entry",
+        )
+
+    if len(entries) > MAX_BUNDLE_ENTRIES:
+        logger.log(LogReference.PROTRANS002, count=len(entries))
+        return SpineErrorResponse.BAD_REQUEST(
+            diagnostics=f"The Bundle must not contain more than {MAX_BUNDLE_ENTRIES} entries",
+            expression="entry",
+        )
+
+    results: List[Tuple[Optional[DocumentPointer], Optional[Response]]] = []
+    for idx, entry in enumerate(entries):
+        core_model, error_response = _process_entry(entry, metadata)
+        if error_response:
+            logger.log(
+                LogReference.PROTRANS004,
+                index=idx,
+                status_code=error_response.statusCode,
+            )
+        results.append((core_model, error_response))
+
+    core_models = [core_model for core_model, _ in results if core_model]
+    if body.type == "transaction":
+        for idx, (_, error_response) in enumerate(results):
+            if error_response:
+                logger.log(LogReference.PROTRANS005, index=idx)
+                return Response(
+                    statusCode=error_response.statusCode,
+                    body=json.dumps(
+                        _entry_outcome(error_response, idx), **json_format()
+                    ),
+                )
+
+        logger.log(LogReference.PROTRANS006, count=len(core_models))
+        repository.create_transaction(core_models)
+    elif core_models:
+        logger.log(LogReference.PROTRANS006, count=len(core_models))
+        repository.create_batch(core_models)
+
+    response_entries = []
+    for idx, (core_model, error_response) in enumerate(results):
+        if error_response:
+            response_entries.append(
+                {
+                    "response": {
+                        "status": error_response.statusCode,
+                        "outcome": _entry_outcome(error_response, idx),
+                    }
+                }
+            )
+        else:
+            response_entries.append(
+                {
+                    "response": {
+                        "status": "201",
+                        "location": f"{PRODUCER_URL_PATH}/{core_model.id}",
+                    }
+                }
+            )
+
+    logger.log(LogReference.PROTRANS999)
+    return Response(
+        statusCode="200",
+        body=json.dumps(
+            {
+                "resourceType": "Bundle",
+                "type": BUNDLE_RESPONSE_TYPES[body.type],
+                "entry": response_entries,
+            },
+            **json_format(),
+        ),
+    )
@@ -0,0 +1,276 @@
+import json
+
+from moto import mock_aws
+
+from api.producer.processTransaction.process_transaction import handler
+from nrlf.core.constants import PRODUCER_URL_PATH
+from nrlf.core.dynamodb.repository import DocumentPointerRepository
+from nrlf.tests.data import load_document_reference_json
+from nrlf.tests.dynamodb import mock_repository
+from nrlf.tests.events import (
+    create_headers,
+    create_mock_context,
+    create_test_api_gateway_event,
+    default_response_headers,
+)
+
+
+def _create_entry(resource: dict, method: str = "POST") -> dict:
+    return {
+        "resource": resource,
+        "request": {"method": method, "url": "DocumentReference"},
+    }
+
+
+def _create_bundle(bundle_type: str, entries: list) -> str:
+    return json.dumps({"resourceType": "Bundle", "type": bundle_type, "entry": entries})
+
+
+def _invalid_custodian_resource() -> dict:
+    resource = load_document_reference_json("Y05868-736253002-Valid")
+    resource["custodian"]["identifier"]["value"] = "X26"
+    return resource
+
+
+def _created_ids(parsed_body: dict) -> list:
+    return [
+        entry["response"]["location"].removeprefix(f"{PRODUCER_URL_PATH}/")
+        for entry in parsed_body["entry"]
+        if entry["response"]["status"] == "201"
+    ]
+
+
+@mock_aws
+@mock_repository
+def test_process_transaction_batch_happy_path(repository: DocumentPointerRepository):
+    resource = load_document_reference_json("Y05868-736253002-Valid")
+    event = create_test_api_gateway_event(
+        headers=create_headers(),
+        body=_create_bundle(
+            "batch", [_create_entry(resource), _create_entry(resource)]
+        ),
+    )
+
+    result = handler(event, create_mock_context())
+    body = result.pop("body")
+
+    assert result == {
+        "statusCode": "200",
+        "headers": default_response_headers(),
+        "isBase64Encoded": False,
+    }
+
+    parsed_body = json.loads(body)
+    assert parsed_body["resourceType"] == "Bundle"
+    assert parsed_body["type"] == "batch-response"
+    assert [entry["response"]["status"] for entry in parsed_body["entry"]] == [
+        "201",
+        "201",
+    ]
+
+    created_ids = _created_ids(parsed_body)
+    assert len(set(created_ids)) == 2
+    for created_id in created_ids:
+        assert created_id.startswith("Y05868-")
+        created_pointer = repository.get_by_id(created_id)
+        assert created_pointer is not None
+        assert json.loads(created_pointer.document)["id"] == created_id
+
+
+@mock_aws
+@mock_repository
+def test_process_transaction_batch_with_invalid_entry(
+    repository: DocumentPointerRepository,
+):
+    resource = load_document_reference_json("Y05868-736253002-Valid")
+    event = create_test_api_gateway_event(
+        headers=create_headers(),
+        body=_create_bundle(
+            "batch",
+            [_create_entry(_invalid_custodian_resource()), _create_entry(resource)],
+        ),
+    )
+
+    result = handler(event, create_mock_context())
+    parsed_body = json.loads(result["body"])
+
+    assert result["statusCode"] == "200"
+    assert parsed_body["entry"][0] == {
+        "response": {
+            "status": "400",
+            "outcome": {
+                "resourceType": "OperationOutcome",
+                "issue": [
+                    {
+                        "severity": "error",
+                        "code": "invalid",
+                        "details": {
+                            "coding": [
+                                {
+                                    "code": "BAD_REQUEST",
+                                    "display": "Bad request",
+                                    "system": "https://fhir.nhs.uk/ValueSet/Spine-ErrorOrWarningCode-1",
+                                }
+                            ]
+                        },
+                        "diagnostics": "The custodian of the provided DocumentReference does not match the expected ODS code for this organisation",
+                        "expression": ["entry[0].resource.custodian.identifier.value"],
+                    }
+                ],
+            },
+        }
+    }
+    assert parsed_body["entry"][1]["response"]["status"] == "201"
+
+    created_ids = _created_ids(parsed_body)
+    assert len(created_ids) == 1
+    assert repository.get_by_id(created_ids[0]) is not None
+
+
+@mock_aws
+@mock_repository
+def test_process_transaction_batch_rejects_non_create_entries(
+    repository: DocumentPointerRepository,
+):
+    resource = load_document_reference_json("Y05868-736253002-Valid")
+    event = create_test_api_gateway_event(
+        headers=create_headers(),
+        body=_create_bundle("batch", [_create_entry(resource, method="PUT")]),
+    )
+
+    result = handler(event, create_mock_context())
+    parsed_body = json.loads(result["body"])
+
+    assert result["statusCode"] == "200"
+    assert parsed_body["entry"][0]["response"]["status"] == "400"
+    assert parsed_body["entry"][0]["response"]["outcome"]["issue"][0] == {
+        "severity": "error",
+        "code": "invalid",
+        "details": {
+            "coding": [
+                {
+                    "code": "BAD_REQUEST",
+                    "display": "Bad request",
+                    "system": "https://fhir.nhs.uk/ValueSet/Spine-ErrorOrWarningCode-1",
+                }
+            ]
+        },
+        "diagnostics": "Bundle entries must be a POST request to create a DocumentReference",
+        "expression": ["entry[0].request"],
+    }
+
+
+@mock_aws
+@mock_repository
+def test_process_transaction_transaction_happy_path(
+    repository: DocumentPointerRepository,
+):
+    resource = load_document_reference_json("Y05868-736253002-Valid")
+    event = create_test_api_gateway_event(
+        headers=create_headers(),
+        body=_create_bundle(
+            "transaction", [_create_entry(resource), _create_entry(resource)]
+        ),
+    )
+
+    result = handler(event, create_mock_context())
+    parsed_body = json.loads(result["body"])
+
+    assert result["statusCode"] == "200"
+    assert parsed_body["type"] == "transaction-response"
+
+    created_ids = _created_ids(parsed_body)
+    assert len(set(created_ids)) == 2
+    for created_id in created_ids:
+        assert repository.get_by_id(created_id) is not None
+
+
+@mock_aws
+@mock_repository
+def test_process_transaction_transaction_with_invalid_entry(
+    repository: DocumentPointerRepository,
+):
+    resource = load_document_reference_json("Y05868-736253002-Valid")
+    event = create_test_api_gateway_event(
+        headers=create_headers(),
+        body=_create_bundle(
+            "transaction",
+            [_create_entry(resource), _create_entry(_invalid_custodian_resource())],
+        ),
+    )
+
+    result = handler(event, create_mock_context())
+    parsed_body = json.loads(result["body"])
+
+    assert result["statusCode"] == "400"
+    assert parsed_body["resourceType"] == "OperationOutcome"
+    assert parsed_body["issue"][0]["expression"] == [
+        "entry[1].resource.custodian.identifier.value"
+    ]
+    assert (
+        repository.count_by_nhs_number(
+            "6700028191", pointer_types=["http://snomed.info/sct|736253002"]
+        )
+        == 0
+    )
+
+
+@mock_aws
+@mock_repository
+def test_process_transaction_invalid_bundle_type(
+    repository: DocumentPointerRepository,
+):
+    event = create_test_api_gateway_event(
+        headers=create_headers(),
+        body=_create_bundle("searchset", []),
+    )
+
+    result = handler(event, create_mock_context())
+    parsed_body = json.loads(result["body"])
+
+    assert result["statusCode"] == "400"
+    assert parsed_body["issue"][0]["diagnostics"] == (
+        "The Bundle type must be either 'batch' or 'transaction'"
+    )
+    assert parsed_body["issue"][0]["expression"] == ["type"]
+
+
+@mock_aws
+@mock_repository
+def test_process_transaction_transaction_without_entries(
+    repository: DocumentPointerRepository,
+):
+    event = create_test_api_gateway_event(
+        headers=create_headers(),
+        body=json.dumps({"resourceType": "Bundle", "type": "transaction"}),
+    )
+
+    result = handler(event, create_mock_context())
+    parsed_body = json.loads(result["body"])
+
+    assert result["statusCode"] == "400"
+    assert parsed_body["issue"][0]["diagnostics"] == (
+        "A transaction Bundle must contain at least one entry"
+    )
+    assert parsed_body["issue"][0]["expression"] == ["entry"]
+
+
+@mock_aws
+@mock_repository
+def test_process_transaction_batch_without_entries(
+    repository: DocumentPointerRepository,
+):
+    event = create_test_api_gateway_event(
+        headers=create_headers(),
+        body=_create_bundle("batch", []),
+    )
+
+    result = handler(event, create_mock_context())
+    parsed_body = json.loads(result["body"])
+
+    assert result["statusCode"] == "200"
+    assert parsed_body == {
+        "resourceType": "Bundle",
+        "type": "batch-response",
+        "entry": [],
+    }
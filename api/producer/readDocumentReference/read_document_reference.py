@@ -9,6 +9,7 @@ from nrlf.core.errors import OperationOutcomeError
 from nrlf.core.logger import LogReference, logger
 from nrlf.core.model import ConnectionMetadata, ReadDocumentReferencePathParams
 from nrlf.core.response import Response, SpineErrorResponse
+from nrlf.core.timing import recorder
 from nrlf.producer.fhir.r4.model import DocumentReference
 
 
@@ -56,7 +57,8 @@ def handler(
         )
 
     try:
-        document_reference = DocumentReference.parse_raw(result.document)
+        with recorder.span("reparse"):
+            document_reference = DocumentReference.parse_raw(result.document)
     except ValidationError as exc:
         logger.log(
             LogReference.PROREAD003,
@@ -1,13 +1,18 @@
+import random
+
 from pydantic import ValidationError
 
 from nrlf.core.codes import SpineErrorConcept
+from nrlf.core.config import Config
 from nrlf.core.decorators import DocumentPointerRepository, request_handler
 from nrlf.core.errors import OperationOutcomeError
 from nrlf.core.logger import LogReference, logger
-from nrlf.core.model import ConnectionMetadata, ProducerRequestParams
+from nrlf.core.model import ConnectionMetadata
+from nrlf.core.producer import ProducerRequestParams
 from nrlf.core.response import Response, SpineErrorResponse
+from nrlf.core.timing import recorder
 from nrlf.core.validators import validate_type_system
-from nrlf.producer.fhir.r4.model import Bundle, DocumentReference
+from nrlf.producer.fhir.r4.model import DocumentReference
 
 
 @request_handler(params=ProducerRequestParams)
@@ -15,6 +20,7 @@ def handler(
     metadata: ConnectionMetadata,
     params: ProducerRequestParams,
     repository: DocumentPointerRepository,
+    config: Config,
 ) -> Response:
     """
     Search for document references based on the provided parameters.
@@ -23,6 +29,7 @@ def handler(
         metadata (ConnectionMetadata): The connection metadata.
         params (ProducerRequestParams): The request parameters.
         repository (DocumentPointerRepository): The document pointer repository.
+        config (Config): The application config.
 
     Returns:
         Response: The response containing the search results.
@@ -60,7 +67,8 @@ def handler(
         )
 
     pointer_types = [params.type.__root__] if params.type else metadata.pointer_types
-    bundle = {"resourceType": "Bundle", "type": "searchset", "total": 0, "entry": []}
+    documents = []
+    verify_documents = random.random() < config.SEARCH_VERIFY_SAMPLE_RATE
 
     logger.log(
         LogReference.PROSEARCH003,
@@ -76,30 +84,25 @@ def handler(
         nhs_number=params.nhs_number,
         pointer_types=pointer_types,
     ):
-        try:
-            document_reference = DocumentReference.parse_raw(result.document)
-            bundle["total"] += 1
-            bundle["entry"].append(
-                {"resource": document_reference.dict(exclude_none=True)}
-            )
-            logger.log(
-                LogReference.PROSEARCH004,
-                id=document_reference.id,
-                count=bundle["total"],
-            )
+        if verify_documents:
+            try:
+                with recorder.span("reparse"):
+                    DocumentReference.parse_raw(result.document)
+            except ValidationError as exc:
+                logger.log(
+                    LogReference.PROSEARCH005, error=str(exc), document=result.document
+                )
+                raise OperationOutcomeError(
+                    status_code="500",
+                    severity="error",
+                    code="exception",
+                    details=SpineErrorConcept.from_code("INTERNAL_SERVER_ERROR"),
+                    diagnostics="An error occurred whilst parsing the document reference search results",
+                ) from exc
 
-        except ValidationError as exc:
-            logger.log(
-                LogReference.PROSEARCH005, error=str(exc), document=result.document
-            )
-            raise OperationOutcomeError(
-                status_code="500",
-                severity="error",
-                code="exception",
-                details=SpineErrorConcept.from_code("INTERNAL_SERVER_ERROR"),
-                diagnostics="An error occurred whilst parsing the document reference search results",
-            )
+        documents.append(result.document)
+        logger.log(LogReference.PROSEARCH004, id=result.id, count=len(documents))
 
-    response = Response.from_resource(Bundle.parse_obj(bundle))
+    response = Response.from_search_results(documents)
     logger.log(LogReference.PROSEARCH999)
     return response
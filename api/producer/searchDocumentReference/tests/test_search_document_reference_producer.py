@@ -1,4 +1,6 @@
 import json
+import os
+from unittest import mock
 
 from moto import mock_aws
 
@@ -322,7 +324,8 @@ def test_search_document_reference_invalid_json(repository: DocumentPointerRepos
         },
     )
 
-    result = handler(event, create_mock_context())
+    with mock.patch.dict(os.environ, {"SEARCH_VERIFY_SAMPLE_RATE": "1"}):
+        result = handler(event, create_mock_context())
     body = result.pop("body")
 
     assert result == {
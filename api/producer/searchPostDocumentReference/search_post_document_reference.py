@@ -1,13 +1,18 @@
+import random
+
 from pydantic import ValidationError
 
 from nrlf.core.codes import SpineErrorConcept
+from nrlf.core.config import Config
 from nrlf.core.decorators import DocumentPointerRepository, request_handler
 from nrlf.core.errors import OperationOutcomeError
 from nrlf.core.logger import LogReference, logger
-from nrlf.core.model import ConnectionMetadata, ProducerRequestParams
+from nrlf.core.model import ConnectionMetadata
+from nrlf.core.producer import ProducerRequestParams
 from nrlf.core.response import Response, SpineErrorResponse
+from nrlf.core.timing import recorder
 from nrlf.core.validators import validate_type_system
-from nrlf.producer.fhir.r4.model import Bundle, DocumentReference
+from nrlf.producer.fhir.r4.model import DocumentReference
 
 
 @request_handler(body=ProducerRequestParams)
@@ -15,6 +20,7 @@ def handler(
     body: ProducerRequestParams,
     metadata: ConnectionMetadata,
     repository: DocumentPointerRepository,
+    config: Config,
 ) -> Response:
     """
     Search for document references based on the provided parameters.
@@ -23,6 +29,7 @@ def handler(
         body (ProducerRequestParams): The request parameters for the search.
         metadata (ConnectionMetadata): The connection metadata.
         repository (DocumentPointerRepository): The repository for document pointers.
+        config (Config): The application config.
 
     Returns:
         Response: The response containing the search results.
@@ -54,7 +61,8 @@ def handler(
         )
 
     pointer_types = [body.type.__root__] if body.type else metadata.pointer_types
-    bundle = {"resourceType": "Bundle", "type": "searchset", "total": 0, "entry": []}
+    documents = []
+    verify_documents = random.random() < config.SEARCH_VERIFY_SAMPLE_RATE
 
     logger.log(
         LogReference.PROPOSTSEARCH003,
@@ -70,29 +78,26 @@ def handler(
         nhs_number=body.nhs_number,
         pointer_types=pointer_types,
     ):
-        try:
-            document_reference = DocumentReference.parse_raw(result.document)
-            bundle["total"] += 1
-            bundle["entry"].append(
-                {"resource": document_reference.dict(exclude_none=True)}
-            )
-            logger.log(
-                LogReference.PROPOSTSEARCH004,
-                id=document_reference.id,
-                count=bundle["total"],
-            )
+        if verify_documents:
+            try:
+                with recorder.span("reparse"):
+                    DocumentReference.parse_raw(result.document)
+            except ValidationError as exc:
+                logger.log(
+                    LogReference.PROPOSTSEARCH005,
+                    error=str(exc),
+                    document=result.document,
+                )
+                raise OperationOutcomeError(
+                    status_code="500",
+                    severity="error",
+                    code="exception",
+                    details=SpineErrorConcept.from_code("INTERNAL_SERVER_ERROR"),
+                    diagnostics="An error occurred whilst parsing the document reference search results",
+                ) from exc
 
-        except ValidationError as exc:
-            logger.log(
-                LogReference.PROPOSTSEARCH005, error=str(exc), document=result.document
-            )
-            raise OperationOutcomeError(
-                status_code="500",
-                severity="error",
-                code="exception",
-                details=SpineErrorConcept.from_code("INTERNAL_SERVER_ERROR"),
-                diagnostics="An error occurred whilst parsing the document reference search results",
-            )
+        documents.append(result.document)
+        logger.log(LogReference.PROPOSTSEARCH004, id=result.id, count=len(documents))
 
     logger.log(LogReference.PROPOSTSEARCH999)
-    return Response.from_resource(Bundle.parse_obj(bundle))
+    return Response.from_search_results(documents)
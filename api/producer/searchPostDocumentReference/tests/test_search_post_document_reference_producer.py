@@ -1,4 +1,6 @@
 import json
+import os
+from unittest import mock
 
 from moto import mock_aws
 
@@ -335,7 +337,8 @@ def test_search_post_document_reference_invalid_json(
         ),
     )
 
-    result = handler(event, create_mock_context())
+    with mock.patch.dict(os.environ, {"SEARCH_VERIFY_SAMPLE_RATE": "1"}):
+        result = handler(event, create_mock_context())
     body = result.pop("body")
 
     assert result == {
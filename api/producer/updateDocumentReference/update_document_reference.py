@@ -9,6 +9,7 @@ from nrlf.core.errors import OperationOutcomeError
 from nrlf.core.logger import LogReference, logger
 from nrlf.core.model import ConnectionMetadata, UpdateDocumentReferencePathParams
 from nrlf.core.response import NRLResponse, Response, SpineErrorResponse
+from nrlf.core.timing import recorder
 from nrlf.core.utils import create_fhir_instant
 from nrlf.core.validators import DocumentReferenceValidator
 from nrlf.producer.fhir.r4.model import DocumentReference, Meta
@@ -79,7 +80,8 @@ def handler(
         )
 
     try:
-        existing_resource = DocumentReference.parse_raw(existing_model.document)
+        with recorder.span("reparse"):
+            existing_resource = DocumentReference.parse_raw(existing_model.document)
     except ValidationError as exc:
         logger.log(LogReference.PROUPDATE002, error=exc)
         raise OperationOutcomeError(
@@ -9,9 +9,9 @@ from nrlf.core.dynamodb.repository import DocumentPointer, DocumentPointerReposi
 from nrlf.core.errors import OperationOutcomeError
 from nrlf.core.logger import LogReference, logger
 from nrlf.core.model import ConnectionMetadata
+from nrlf.core.pipeline import DocumentReferencePipeline
 from nrlf.core.response import NRLResponse, Response, SpineErrorResponse
 from nrlf.core.utils import create_fhir_instant
-from nrlf.core.validators import DocumentReferenceValidator
 from nrlf.producer.fhir.r4.model import DocumentReference, Meta
 
 
@@ -41,20 +41,20 @@ def _set_upsert_time_fields(
     return document_reference
 
 
-def _create_core_model(resource: DocumentReference, metadata: ConnectionMetadata):
+def _create_core_model(
+    pipeline: DocumentReferencePipeline, metadata: ConnectionMetadata
+):
     """
     Create the DocumentPointer model from the provided DocumentReference
     """
     creation_time = create_fhir_instant()
-    document_reference = _set_upsert_time_fields(
+    _set_upsert_time_fields(
         creation_time,
-        document_reference=resource,
+        document_reference=pipeline.resource,
         nrl_permissions=metadata.nrl_permissions,
     )
 
-    return DocumentPointer.from_document_reference(
-        document_reference, created_on=creation_time
-    )
+    return pipeline.to_pointer(created_on=creation_time)
 
 
 def _check_permissions(
@@ -117,21 +117,31 @@ def _get_document_ids_to_supersede(
         return []
 
     logger.log(LogReference.PROUPSERT006, relatesTo=resource.relatesTo)
-    ids_to_delete = []
+    identifiers = []
 
     for idx, relates_to in enumerate(resource.relatesTo):
         identifier = _validate_identifier(relates_to, idx)
         _validate_producer_id(identifier, metadata, idx)
-        if can_ignore_delete_fail:
-            logger.log(
-                LogReference.PROUPSERT006a,
-                pointer_id=resource.id,
-                relatesTo=resource.relatesTo,
+        identifiers.append(identifier)
+
+    if can_ignore_delete_fail:
+        logger.log(
+            LogReference.PROUPSERT006a,
+            pointer_id=resource.id,
+            relatesTo=resource.relatesTo,
+        )
+    else:
+        existing_pointers = repository.get_many(
+            identifiers, fields=["nhs_number", "type"]
+        )
+        for idx, identifier in enumerate(identifiers):
+            existing_pointer = _check_existing_pointer(
+                identifier, existing_pointers, idx
             )
-        else:
-            existing_pointer = _check_existing_pointer(identifier, repository, idx)
             _validate_pointer_details(existing_pointer, core_model, identifier, idx)
 
+    ids_to_delete = []
+    for relates_to, identifier in zip(resource.relatesTo, identifiers, strict=True):
         _append_id_if_replaces(relates_to, ids_to_delete, identifier)
 
     return ids_to_delete
@@ -167,11 +177,11 @@ def _validate_producer_id(identifier, metadata, idx):
         )
 
 
-def _check_existing_pointer(identifier, repository, idx):
+def _check_existing_pointer(identifier, existing_pointers, idx):
     """
     Check that there is an existing pointer that will be deleted when superseding
     """
-    existing_pointer = repository.get_by_id(identifier)
+    existing_pointer = existing_pointers.get(identifier)
     if not existing_pointer:
         logger.log(LogReference.PROUPSERT007c, related_identifier=identifier)
         _raise_operation_outcome_error(
@@ -237,14 +247,14 @@ def handler(
     logger.log(LogReference.PROUPSERT000)
 
     logger.log(LogReference.PROUPSERT001, resource=body)
-    validator = DocumentReferenceValidator()
-    result = validator.validate(body)
+    pipeline = DocumentReferencePipeline(body)
+    result = pipeline.validate()
 
     if not result.is_valid:
         logger.log(LogReference.PROUPSERT002)
         return Response.from_issues(issues=result.issues, statusCode="400")
 
-    core_model = _create_core_model(result.resource, metadata)
+    core_model = _create_core_model(pipeline, metadata)
 
     if metadata.ods_code_parts != tuple(core_model.producer_id.split("|")):
         logger.log(
@@ -0,0 +1,14 @@
+import pytest
+
+from nrlf.core.config import refresh_config
+
+
+@pytest.fixture(autouse=True)
+def refresh_cached_config():
+    """
+    Rebuild the cached Config for each test, so that changes to the
+    environment made by a test are picked up and do not leak into other tests
+    """
+    refresh_config()
+    yield
+    refresh_config()
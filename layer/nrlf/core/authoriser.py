@@ -1,6 +1,12 @@
+import functools
 import json
 import sys
+import threading
+import time
+from collections import OrderedDict
 from os import path
+from pathlib import Path
+from typing import NamedTuple, Optional, Tuple
 
 from botocore.exceptions import ClientError
 
@@ -9,12 +15,83 @@ from nrlf.core.config import Config
 from nrlf.core.logger import LogReference, logger
 from nrlf.core.model import ConnectionMetadata
 
+PermissionsCacheKey = Tuple[str, str, Optional[str]]
+
+
+class PermissionsCacheEntry(NamedTuple):
+    pointer_types: list[str]
+    etag: Optional[str]
+    expires_at: float
+
+
+class PermissionsCache:
+    """
+    A process-level LRU cache of the pointer types retrieved from S3, so that
+    warm Lambda containers do not need to retrieve them on every request
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: OrderedDict[PermissionsCacheKey, PermissionsCacheEntry] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(self, key: PermissionsCacheKey) -> Optional[PermissionsCacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(
+        self,
+        key: PermissionsCacheKey,
+        pointer_types: list[str],
+        etag: Optional[str],
+        ttl: int,
+    ):
+        with self._lock:
+            self._entries[key] = PermissionsCacheEntry(
+                pointer_types=pointer_types,
+                etag=etag,
+                expires_at=time.monotonic() + ttl,
+            )
+            self._entries.move_to_end(key)
+            self._evict()
+
+    def resize(self, max_size: int):
+        """
+        Change the maximum size of the cache, evicting the least recently used
+        entries that no longer fit
+        """
+        with self._lock:
+            self.max_size = max_size
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _evict(self):
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+
+permissions_cache = PermissionsCache(
+    Config.__fields__["PERMISSIONS_CACHE_MAX_SIZE"].default
+)
+
+
+def get_permissions_cache(config: Config) -> PermissionsCache:
+    if permissions_cache.max_size != config.PERMISSIONS_CACHE_MAX_SIZE:
+        permissions_cache.resize(config.PERMISSIONS_CACHE_MAX_SIZE)
+    return permissions_cache
+
 
 def get_pointer_types(
     connection_metadata: ConnectionMetadata, config: Config
 ) -> list[str]:
-    ods_code = ".".join(connection_metadata.ods_code)
-
     app_id = connection_metadata.nrl_app_id
     ods_code = connection_metadata.ods_code
     ods_code_extension = connection_metadata.ods_code_extension
@@ -24,18 +101,53 @@ def get_pointer_types(
     else:
         key = f"{app_id}/{ods_code}.json"
 
+    cache = get_permissions_cache(config)
+    cache_key = (app_id, ods_code, ods_code_extension)
+    cached = cache.get(cache_key)
+
+    if cached and cached.expires_at > time.monotonic():
+        logger.log(LogReference.S3PERMISSIONS006, key=key)
+        return list(cached.pointer_types)
+
     logger.log(LogReference.S3PERMISSIONS001, bucket=config.AUTH_STORE, key=key)
     s3_client = get_s3_client()
 
+    request = {"Bucket": config.AUTH_STORE, "Key": key}
+    if cached and cached.etag:
+        request["IfNoneMatch"] = cached.etag
+
     try:
-        response = s3_client.get_object(Bucket=config.AUTH_STORE, Key=key)
+        response = s3_client.get_object(**request)
         pointer_types = json.loads(response["Body"].read())
         logger.log(LogReference.S3PERMISSIONS002, pointer_types=pointer_types)
-        return pointer_types
+        cache.set(
+            cache_key,
+            pointer_types,
+            etag=response.get("ETag"),
+            ttl=config.PERMISSIONS_CACHE_TTL_SECONDS,
+        )
+        return list(pointer_types)
 
     except ClientError as exc:
-        if exc.response.get("Error", {}).get("Code") == "NoSuchKey":
+        error_code = exc.response.get("Error", {}).get("Code")
+        if cached and error_code in ("304", "NotModified"):
+            logger.log(LogReference.S3PERMISSIONS007, key=key)
+            cache.set(
+                cache_key,
+                cached.pointer_types,
+                etag=cached.etag,
+                ttl=config.PERMISSIONS_CACHE_TTL_SECONDS,
+            )
+            return list(cached.pointer_types)
+
+        if error_code == "NoSuchKey":
             logger.log(LogReference.S3PERMISSIONS003, error=str(exc))
+            cache.set(
+                cache_key,
+                [],
+                etag=None,
+                ttl=config.PERMISSIONS_CACHE_NEGATIVE_TTL_SECONDS,
+            )
             return []
 
         logger.log(
@@ -56,11 +168,61 @@ def get_pointer_types(
         raise exc
 
 
+PERMISSIONS_DIRECTORY = "/opt/python/nrlf_permissions"
+TEST_PERMISSIONS_DIRECTORY = "layer/test_permissions"
+PERMISSIONS_INDEX_FILE = "permissions_index.json"
+
+
+def build_permissions_index(permissions_directory: str) -> dict[str, list[str]]:
+    """
+    Compile every permissions file in the directory into a single index of
+    pointer types, keyed by the path of the file relative to the directory
+    """
+    index = {}
+    root = Path(permissions_directory)
+    for file_path in sorted(root.rglob("*.json")):
+        if file_path.name == PERMISSIONS_INDEX_FILE:
+            continue
+
+        with open(file_path) as file:
+            index[file_path.relative_to(root).as_posix()] = json.load(file)
+
+    return index
+
+
+def write_permissions_index(permissions_directory: str) -> str:
+    """
+    Write the compiled permissions index into the permissions directory
+    """
+    index = build_permissions_index(permissions_directory)
+    index_path = path.join(permissions_directory, PERMISSIONS_INDEX_FILE)
+    with open(index_path, "w") as file:
+        json.dump(index, file, separators=(",", ":"))
+    return index_path
+
+
+@functools.cache
+def load_permissions_index(
+    permissions_directory: str,
+) -> Optional[dict[str, tuple[str, ...]]]:
+    """
+    Load the compiled permissions index from the permissions directory. This
+    happens once per container, so lookups do not touch the filesystem.
+    """
+    index_path = path.join(permissions_directory, PERMISSIONS_INDEX_FILE)
+    if not path.exists(index_path):
+        return None
+
+    with open(index_path) as file:
+        index = json.load(file)
+
+    logger.log(LogReference.S3PERMISSIONS008, count=len(index))
+    return {key: tuple(pointer_types) for key, pointer_types in index.items()}
+
+
 def parse_permissions_file(
     connection_metadata: ConnectionMetadata,
 ) -> list[str]:
-    ods_code = ".".join(connection_metadata.ods_code)
-
     app_id = connection_metadata.nrl_app_id
     ods_code = connection_metadata.ods_code
     ods_code_extension = connection_metadata.ods_code_extension
@@ -70,11 +232,24 @@ def parse_permissions_file(
     else:
         key = f"{app_id}/{ods_code}.json"
 
-    file_path = f"/opt/python/nrlf_permissions/{key}"
-
+    permissions_directory = PERMISSIONS_DIRECTORY
     if connection_metadata.is_test_event:
-        file_path = path.abspath(f"layer/test_permissions/{key}")
+        permissions_directory = path.abspath(TEST_PERMISSIONS_DIRECTORY)
+
+    index = load_permissions_index(permissions_directory)
+    if index is not None:
+        return list(index.get(key, ()))
+
+    return list(_load_permissions_file(f"{permissions_directory}/{key}"))
+
 
+@functools.lru_cache(maxsize=1024)
+def _load_permissions_file(file_path: str) -> tuple[str, ...]:
+    """
+    Load the pointer types from an embedded permissions file. The files are
+    part of the Lambda layer, so they cannot change during the lifetime of the
+    container and are only read once.
+    """
     pointer_types = []
     try:
         with open(file_path) as file:
@@ -86,4 +261,4 @@ def parse_permissions_file(
             stacklevel=5,
             error=str(exc),
         )
-    return pointer_types
+    return tuple(pointer_types)
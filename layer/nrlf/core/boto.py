@@ -1,22 +1,28 @@
 import functools
 
-import boto3
-
+from nrlf.core.timing import register_dynamodb_spans
 from nrlf.core.types import DynamoDBServiceResource, S3Client
 
 
 @functools.cache
 def get_boto3_client(service_name: str):
+    import boto3
+
     return boto3.client(service_name)  # type: ignore
 
 
 @functools.cache
 def get_boto3_resource(service_name: str):
+    import boto3
+
     return boto3.resource(service_name)  # type: ignore
 
 
+@functools.cache
 def get_dynamodb_resource() -> DynamoDBServiceResource:
-    return get_boto3_resource("dynamodb")
+    resource = get_boto3_resource("dynamodb")
+    register_dynamodb_spans(resource.meta.client)
+    return resource
 
 
 @functools.cache
@@ -1,12 +1,13 @@
-from typing import Dict
+import functools
+from typing import Dict, Type
 
 from nrlf.consumer.fhir.r4 import model as consumer_model
-from nrlf.producer.fhir.r4 import model as producer_model
 
 
-class _CodeableConcept(producer_model.CodeableConcept, consumer_model.CodeableConcept):
+class _CodeableConcept(consumer_model.CodeableConcept):
     """
     Represents a codeable concept with a mapping of codes to text values.
+    The producer models accept it as a CodeableConcept of their own.
     """
 
     _TEXT_MAP: Dict[str, str] = {}
@@ -20,15 +21,26 @@ class _CodeableConcept(producer_model.CodeableConcept, consumer_model.CodeableCo
         if code not in cls._TEXT_MAP:
             raise ValueError(f"Unknown code: {code}")
 
-        return cls(
-            coding=[
-                producer_model.Coding(
-                    system=cls._SYSTEM,
-                    code=code,
-                    display=cls._TEXT_MAP[code],
-                )
-            ]
-        )
+        return _concept_from_code(cls, code)
+
+
+@functools.cache
+def _concept_from_code(
+    concept_cls: Type[_CodeableConcept], code: str
+) -> _CodeableConcept:
+    """
+    Build the CodeableConcept for the code once, as there are only a handful of
+    codes. The cached concepts are shared, so must not be modified.
+    """
+    return concept_cls(
+        coding=[
+            consumer_model.Coding(
+                system=concept_cls._SYSTEM,
+                code=code,
+                display=concept_cls._TEXT_MAP[code],
+            )
+        ]
+    )
 
 
 class NRLResponseConcept(_CodeableConcept):
@@ -1,3 +1,6 @@
+import functools
+from typing import Optional
+
 from pydantic import BaseSettings, Field
 
 
@@ -20,3 +23,36 @@ class Config(BaseSettings):
     SOURCE: str = Field(default=..., env="SOURCE")
     AUTH_STORE: str = Field(default=..., env="AUTH_STORE")
     TABLE_NAME: str = Field(default=..., env="TABLE_NAME")
+    SEARCH_PAGE_SIZE: int = Field(default=20, env="SEARCH_PAGE_SIZE")
+    PAGINATION_TOKEN_SECRET: Optional[str] = Field(
+        default=None, env="PAGINATION_TOKEN_SECRET"
+    )
+    SEARCH_VERIFY_SAMPLE_RATE: float = Field(
+        default=0.0, env="SEARCH_VERIFY_SAMPLE_RATE"
+    )
+    PERMISSIONS_CACHE_TTL_SECONDS: int = Field(
+        default=60, env="PERMISSIONS_CACHE_TTL_SECONDS"
+    )
+    PERMISSIONS_CACHE_NEGATIVE_TTL_SECONDS: int = Field(
+        default=30, env="PERMISSIONS_CACHE_NEGATIVE_TTL_SECONDS"
+    )
+    PERMISSIONS_CACHE_MAX_SIZE: int = Field(
+        default=1024, env="PERMISSIONS_CACHE_MAX_SIZE"
+    )
+
+
+@functools.cache
+def get_config() -> Config:
+    """
+    Get the Config for the process. The environment is only read and validated
+    once per Lambda container, so use refresh_config if it changes.
+    """
+    return Config()
+
+
+def refresh_config():
+    """
+    Discard the cached Config so that it is rebuilt from the environment on
+    the next call to get_config
+    """
+    get_config.cache_clear()
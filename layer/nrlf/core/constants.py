@@ -18,14 +18,16 @@ KEY_SEPARATOR = "#"
 ODS_SYSTEM = "https://fhir.nhs.uk/Id/ods-organization-code"
 NHS_NUMBER_SYSTEM_URL = "https://fhir.nhs.uk/Id/nhs-number"
 RELATES_TO_REPLACES = "replaces"
-ALLOWED_RELATES_TO_CODES = {
-    RELATES_TO_REPLACES,
-    "transforms",
-    "signs",
-    "appends",
-    "incorporates",
-    "summarizes",
-}
+ALLOWED_RELATES_TO_CODES = frozenset(
+    {
+        RELATES_TO_REPLACES,
+        "transforms",
+        "signs",
+        "appends",
+        "incorporates",
+        "summarizes",
+    }
+)
 CLIENT_RP_DETAILS = "nhsd-client-rp-details"
 CONNECTION_METADATA = "nhsd-connection-metadata"
 PERMISSION_AUDIT_DATES_FROM_PAYLOAD = "audit-dates-from-payload"
@@ -37,6 +39,7 @@ NHSD_REQUEST_ID_HEADER = "NHSD-Request-Id"
 NHSD_CORRELATION_ID_HEADER = "NHSD-Correlation-Id"
 X_REQUEST_ID_HEADER = "X-Request-Id"
 X_CORRELATION_ID_HEADER = "X-Correlation-Id"
+SERVER_TIMING_HEADER = "Server-Timing"
 
 
 PRODUCER_URL_PATH = "/producer/FHIR/R4/DocumentReference"
@@ -13,10 +13,11 @@ from pydantic import BaseModel
 
 from nrlf.core.authoriser import get_pointer_types, parse_permissions_file
 from nrlf.core.codes import SpineErrorConcept
-from nrlf.core.config import Config
+from nrlf.core.config import Config, get_config
 from nrlf.core.constants import (
     NHSD_CORRELATION_ID_HEADER,
     PERMISSION_ALLOW_ALL_POINTER_TYPES,
+    SERVER_TIMING_HEADER,
     X_CORRELATION_ID_HEADER,
     X_REQUEST_ID_HEADER,
     PointerTypes,
@@ -24,8 +25,14 @@ from nrlf.core.constants import (
 from nrlf.core.dynamodb.repository import DocumentPointerRepository
 from nrlf.core.errors import OperationOutcomeError, ParseError
 from nrlf.core.logger import LogReference, logger
+from nrlf.core.metrics import (
+    emit_consumed_capacity,
+    organisation_dimensions,
+    request_metrics,
+)
 from nrlf.core.request import parse_body, parse_headers, parse_params, parse_path
 from nrlf.core.response import Response
+from nrlf.core.timing import recorder, server_timing_enabled
 
 RequestHandler = Callable[..., Response]
 
@@ -75,12 +82,19 @@ def header_handler(
     def wrapper(*args, **kwargs) -> Dict[str, Any]:
         event: APIGatewayProxyEvent = args[0]
 
+        recorder.reset()
+        request_metrics.reset()
+        request_metrics.set_dimensions(Endpoint=f"{event.http_method} {event.resource}")
         response = wrapped_func(*args, **kwargs)
 
         try:
             if "headers" not in response:
                 response["headers"] = {}
 
+            logger.log(LogReference.HANDLER019, timings=recorder.summary)
+            if server_timing_enabled():
+                response["headers"][SERVER_TIMING_HEADER] = recorder.server_timing()
+
             echoed_headers = {
                 name: event.get_header_value(name)
                 for name in [
@@ -98,6 +112,20 @@ def header_handler(
                 log_reference=LogReference.ERROR003.name,
             )
 
+        try:
+            request_metrics.emit(
+                status_code=str(response.get("statusCode", "")),
+                body=response.get("body"),
+                duration_ms=recorder.summary()["total_ms"],
+            )
+        except Exception as exc:
+            logger.log(
+                LogReference.METRICS003,
+                exc_info=sys.exc_info(),
+                stacklevel=5,
+                error=str(exc),
+            )
+
         logger.log(
             LogReference.HANDLER016,
             status_code=getattr(response, "statusCode", ""),
@@ -120,8 +148,12 @@ def logger_initialiser(
         event: APIGatewayProxyEvent = args[0]
 
         correlation_id = event.get_header_value(NHSD_CORRELATION_ID_HEADER)
+        debug_sampled = logger.sample_debug_logging(correlation_id)
+
         if correlation_id:
             logger.set_correlation_id(correlation_id)
+            if debug_sampled:
+                logger.log(LogReference.HANDLER018)
         else:
             logger.log(
                 LogReference.HANDLER017,
@@ -139,24 +171,57 @@ RepositoryType = Union[Type[DocumentPointerRepository], None]
 
 def load_connection_metadata(headers: Dict[str, str], config: Config):
     logger.log(LogReference.HANDLER002, headers=headers)
-    metadata = parse_headers(headers)
-    logger.log(LogReference.HANDLER003, metadata=metadata.dict())
+    with recorder.span("headers"):
+        metadata = parse_headers(headers)
+    logger.log(LogReference.HANDLER003, metadata=metadata.dict)
     if PERMISSION_ALLOW_ALL_POINTER_TYPES in metadata.nrl_permissions:
         logger.log(LogReference.HANDLER004a)
         metadata.pointer_types = PointerTypes.list()
         return metadata
 
     logger.log(LogReference.HANDLER004b)
-    pointer_types = parse_permissions_file(metadata)
-    if not pointer_types and not metadata.is_test_event:
-        logger.log(LogReference.HANDLER004)
-        pointer_types = get_pointer_types(metadata, config)
+    with recorder.span("permissions"):
+        pointer_types = parse_permissions_file(metadata)
+        if not pointer_types and not metadata.is_test_event:
+            logger.log(LogReference.HANDLER004)
+            pointer_types = get_pointer_types(metadata, config)
 
     metadata.pointer_types = pointer_types
 
     return metadata
 
 
+def get_pointer_type(*models: Optional[BaseModel]) -> Optional[str]:
+    """
+    Get the pointer type requested by the parsed query parameters or body, so
+    that request metrics can be broken down by pointer type
+    """
+    for model in models:
+        pointer_type = getattr(model, "type", None)
+        if pointer_type is None or isinstance(pointer_type, str):
+            continue
+
+        if hasattr(pointer_type, "__root__"):
+            return pointer_type.__root__
+
+        coding = getattr(pointer_type, "coding", None)
+        if coding:
+            return f"{coding[0].system}|{coding[0].code}"
+
+    return None
+
+
+@functools.cache
+def get_repository(
+    repository: Type[DocumentPointerRepository], table_name: str
+) -> DocumentPointerRepository:
+    """
+    Get the repository for the table, which is shared by all the requests
+    handled by a warm Lambda container
+    """
+    return repository(table_name=table_name)
+
+
 def filter_kwargs(handler_func: RequestHandler, kwargs: Dict[str, Any]):
     function_kwargs = {}
     signature = inspect.signature(handler_func)
@@ -209,7 +274,7 @@ def basic_handler(
     logger.log(
         LogReference.HANDLER999,
         status_code=response.statusCode,
-        response=response.dict(),
+        response=response.dict,
     )
     return response.dict()
 
@@ -251,9 +316,12 @@ def request_handler(
 
             verify_request_ids(event)
 
-            config = Config()
-            logger.log(LogReference.HANDLER001, config=config.dict())
+            config = get_config()
+            logger.log(LogReference.HANDLER001, config=config.dict)
             metadata = load_connection_metadata(event.headers, config)
+            request_metrics.set_dimensions(
+                OdsCode=organisation_dimensions(metadata)["OdsCode"]
+            )
 
             if metadata.pointer_types == []:
                 logger.log(
@@ -269,30 +337,41 @@ def request_handler(
                     diagnostics=f"Your organisation '{metadata.ods_code}' does not have permission to access this resource. Contact the onboarding team.",
                 )
 
-            kwargs = {
-                "event": event,
-                "context": context,
-                "config": metadata,
-                "metadata": metadata,
-                "params": parse_params(params, event.query_string_parameters),
-                "body": parse_body(body, event.body),
-                "path": parse_path(path, event.path_parameters),
-            }
+            with recorder.span("parse"):
+                kwargs = {
+                    "event": event,
+                    "context": context,
+                    "config": config,
+                    "metadata": metadata,
+                    "params": parse_params(params, event.query_string_parameters),
+                    "body": parse_body(body, event.body),
+                    "path": parse_path(path, event.path_parameters),
+                }
+
+            pointer_type = get_pointer_type(kwargs["params"], kwargs["body"])
+            if pointer_type in metadata.pointer_types:
+                request_metrics.set_dimensions(PointerType=pointer_type)
 
             if repository is not None:
-                kwargs["repository"] = repository(table_name=config.TABLE_NAME)
+                kwargs["repository"] = get_repository(repository, config.TABLE_NAME)
 
             function_kwargs = filter_kwargs(func, kwargs)
 
             logger.log(LogReference.HANDLER013)
-            response = func(**function_kwargs)
+            try:
+                with recorder.span("handler"):
+                    response = func(**function_kwargs)
+            finally:
+                emit_consumed_capacity(metadata, recorder.summary())
 
+            request_metrics.result_count = response.result_count
             logger.log(
                 LogReference.HANDLER999,
                 status_code=response.statusCode,
-                response=response.dict(),
+                response=response.dict,
             )
-            return response.dict()
+            with recorder.span("serialise"):
+                return response.dict()
 
         decorators = [
             functools.wraps(func),
@@ -1,5 +1,6 @@
 import re
 from datetime import datetime
+from decimal import Decimal
 from enum import Enum
 from typing import Any, Dict, Optional
 
@@ -42,6 +43,28 @@ class DynamoDBModel(BaseModel):
         super().__init__(**data)
         self._from_dynamo = data.get("_from_dynamo", False)
 
+    @classmethod
+    def from_dynamo(
+        cls, item: Dict[str, Any], partial: bool = False
+    ) -> "DynamoDBModel":
+        """
+        Create the model from an item read from DynamoDB without re-validating it.
+        Items are validated before they are written, so the stored values are
+        trusted. Items missing a required field fall back to full validation,
+        unless the item is a partial projection of the stored fields.
+        """
+        values = {name: item[name] for name in cls.__fields__ if name in item}
+
+        if not partial and any(
+            field.required and name not in values
+            for name, field in cls.__fields__.items()
+        ):
+            return cls.parse_obj({"_from_dynamo": True, **item})
+
+        model = cls.construct(**values)
+        model._from_dynamo = True
+        return model
+
     @classmethod
     def public_alias(cls) -> str:
         return cls.__name__
@@ -77,9 +100,32 @@ class DocumentPointer(DynamoDBModel):
             **self.indexes,
         }
 
+    @classmethod
+    def from_dynamo(
+        cls, item: Dict[str, Any], partial: bool = False
+    ) -> "DocumentPointer":
+        """
+        Create a DocumentPointer from an item read from DynamoDB, deriving the
+        fields that are not stored and restoring the types DynamoDB converts
+        """
+        values = dict(item)
+
+        producer_id, _, document_id = values.get("id", "").partition("-")
+        if document_id:
+            values["producer_id"] = producer_id
+            values["document_id"] = document_id
+
+        if isinstance(values.get("version"), Decimal):
+            values["version"] = int(values["version"])
+
+        return super().from_dynamo(values, partial=partial)
+
     @classmethod
     def from_document_reference(
-        cls, resource: DocumentReference, created_on: Optional[str] = None
+        cls,
+        resource: DocumentReference,
+        created_on: Optional[str] = None,
+        document: Optional[str] = None,
     ) -> "DocumentPointer":
         resource_id = getattr(resource, "id")
 
@@ -134,7 +180,7 @@ class DocumentPointer(DynamoDBModel):
             category_id=category_id,
             source="NRLF",
             version=1,
-            document=resource.json(exclude_none=True),
+            document=document or resource.json(exclude_none=True),
             created_on=created_on or create_fhir_instant(),
         )
 
@@ -1,20 +1,49 @@
+import functools
+import heapq
+import itertools
+import operator
+import queue
 import sys
+import threading
+import time
 from abc import ABC
-from typing import Generic, Iterator, List, Optional, Type, TypeVar
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from enum import Enum
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Generic,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
 
 from botocore.exceptions import ClientError
 from pydantic import ValidationError
 
 from nrlf.core.boto import get_dynamodb_resource, get_dynamodb_table
 from nrlf.core.codes import SpineErrorConcept
-from nrlf.core.constants import SYSTEM_SHORT_IDS, TYPE_CATEGORIES
-from nrlf.core.dynamodb.model import DocumentPointer, DynamoDBModel
+from nrlf.core.constants import EMPTY_VALUES, SYSTEM_SHORT_IDS, TYPE_CATEGORIES
+from nrlf.core.dynamodb.model import DBPrefix, DocumentPointer, DynamoDBModel
 from nrlf.core.errors import OperationOutcomeError
 from nrlf.core.logger import LogReference, logger
 
 RepositoryModel = TypeVar("RepositoryModel", bound=DynamoDBModel)
 
 
+@dataclass
+class PaginatedResult(Generic[RepositoryModel]):
+    items: List[RepositoryModel]
+    last_evaluated_key: Optional[Dict[str, Any]] = None
+
+
 def _get_sk_ids_for_type(pointer_type: str) -> tuple:
     if pointer_type not in TYPE_CATEGORIES:
         raise ValueError(f"Cannot find category for pointer type: {pointer_type}")
@@ -33,6 +62,207 @@ def _get_sk_ids_for_type(pointer_type: str) -> tuple:
     return category_id, type_id
 
 
+# Cardinality hints for the patient_gsi query planner
+MAX_TYPE_QUERIES_PER_CATEGORY = 3
+MAX_PLANNED_QUERIES = 6
+
+# Buffering for concurrent patient_gsi queries
+QUERY_BUFFER_SIZE = 100
+QUERY_BUFFER_TIMEOUT = 0.1
+_END_OF_QUERY = object()
+
+PATIENT_GSI_KEYS = ("pk", "sk", "patient_key", "patient_sort")
+PATIENT_PROJECTION_KEYS = (*PATIENT_GSI_KEYS, "id", "created_on")
+
+BATCH_GET_MAX_KEYS = 100
+BATCH_GET_MAX_ATTEMPTS = 5
+BATCH_GET_BACKOFF_SECONDS = 0.05
+TRANSACT_WRITE_MAX_ITEMS = 100
+
+
+def _with_projection(
+    request: Dict[str, Any], fields: Optional[List[str]], required: Tuple[str, ...]
+) -> Dict[str, Any]:
+    """
+    Add a ProjectionExpression to a DynamoDB request so that only the requested
+    fields, and the keys the repository needs, are read
+    """
+    if not fields:
+        return request
+
+    attributes = sorted(set(fields).union(required).difference(("document_id",)))
+    expression_names = dict(request.get("ExpressionAttributeNames", {}))
+    projection = []
+    for index, attribute in enumerate(attributes):
+        expression_names[f"#field_{index}"] = attribute
+        projection.append(f"#field_{index}")
+
+    return {
+        **request,
+        "ProjectionExpression": ", ".join(projection),
+        "ExpressionAttributeNames": expression_names,
+    }
+
+
+class SearchOrder(str, Enum):
+    PATIENT_SORT = "patient_sort"
+    CREATED_ON_DESC = "-created_on"
+
+
+_MERGE_ORDERINGS: Dict[SearchOrder, Tuple[Callable[[Dict[str, Any]], Any], bool]] = {
+    SearchOrder.PATIENT_SORT: (operator.itemgetter("patient_sort"), False),
+    SearchOrder.CREATED_ON_DESC: (
+        operator.itemgetter("created_on", "patient_sort"),
+        True,
+    ),
+}
+
+
+@dataclass(frozen=True)
+class PatientSortQuery:
+    """
+    A single patient_gsi key condition, restricted to the patient_sort prefix
+    and optionally filtered down to the given pointer types
+    """
+
+    sort_prefix: str = ""
+    pointer_types: Tuple[str, ...] = ()
+
+    def is_before(self, patient_sort: str) -> bool:
+        """
+        Whether every item matched by this query sorts before patient_sort
+        """
+        return patient_sort > self.sort_prefix and not patient_sort.startswith(
+            self.sort_prefix
+        )
+
+
+@functools.cache
+def _get_category_type_counts() -> Dict[str, int]:
+    """
+    Get the number of known pointer types within each category sort key id
+    """
+    return Counter(
+        _get_sk_ids_for_type(pointer_type)[0] for pointer_type in TYPE_CATEGORIES
+    )
+
+
+def _plan_patient_sort_queries(pointer_types: List[str]) -> List[PatientSortQuery]:
+    """
+    Plan the patient_gsi queries required to search for the given pointer types
+
+    Pointer types are grouped by category. Each category is then read with
+    either one begins_with query per type, or a single category prefix query
+    with a type filter when most of the category has been requested. If the
+    pointer types cannot be mapped to the sort key, or the plan would read every
+    category or require too many queries, the whole patient partition is read.
+
+    Queries are returned in patient_sort order and never overlap, so results
+    can be concatenated (or resumed from a key) without reordering.
+    """
+    if not pointer_types:
+        return [PatientSortQuery()]
+
+    requested_types = tuple(dict.fromkeys(pointer_types))
+    partition_query = PatientSortQuery(pointer_types=requested_types)
+
+    types_by_category: Dict[str, Dict[str, str]] = {}
+    try:
+        for pointer_type in requested_types:
+            category_id, type_id = _get_sk_ids_for_type(pointer_type)
+            types_by_category.setdefault(category_id, {})[pointer_type] = type_id
+    except ValueError:
+        return [partition_query]
+
+    category_type_counts = _get_category_type_counts()
+    queries = []
+
+    for category_id, category_types in types_by_category.items():
+        if (
+            len(category_types) == category_type_counts[category_id]
+            or len(category_types) > MAX_TYPE_QUERIES_PER_CATEGORY
+        ):
+            queries.append(
+                PatientSortQuery(
+                    sort_prefix=f"C#{category_id}#",
+                    pointer_types=tuple(category_types),
+                )
+            )
+            continue
+
+        queries.extend(
+            PatientSortQuery(sort_prefix=f"C#{category_id}#T#{type_id}#")
+            for type_id in category_types.values()
+        )
+
+    reads_every_category = len(types_by_category) == len(category_type_counts) and all(
+        query.pointer_types for query in queries
+    )
+
+    if reads_every_category or len(queries) > MAX_PLANNED_QUERIES:
+        return [partition_query]
+
+    return sorted(queries, key=lambda query: query.sort_prefix)
+
+
+def _resume_patient_queries(
+    queries: List[Dict[str, Any]], start_key: Optional[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """
+    Drop the queries that sort before start_key and resume the query containing
+    it, so that a search can continue from the last item of a previous page
+    """
+    if not start_key:
+        return queries
+
+    resume_sort = start_key["patient_sort"]
+    resumed_queries = []
+
+    for query in queries:
+        sort_prefix = query["ExpressionAttributeValues"].get(":patient_sort", "")
+
+        if not resumed_queries:
+            if PatientSortQuery(sort_prefix).is_before(resume_sort):
+                continue
+
+            if resume_sort.startswith(sort_prefix):
+                resumed_queries.append({**query, "ExclusiveStartKey": start_key})
+                continue
+
+        resumed_queries.append(query)
+
+    return resumed_queries
+
+
+def _is_single_type_query(query: Dict[str, Any]) -> bool:
+    sort_prefix = query["ExpressionAttributeValues"].get(":patient_sort", "")
+    return f"#{DBPrefix.Type.value}#" in sort_prefix
+
+
+def _put_until_stopped(buffer: queue.Queue, value: Any, stop: threading.Event) -> bool:
+    """
+    Put a value into the buffer, giving up if the consumer has stopped reading
+    """
+    while not stop.is_set():
+        try:
+            buffer.put(value, timeout=QUERY_BUFFER_TIMEOUT)
+            return True
+        except queue.Full:
+            continue
+
+    return False
+
+
+def _drain_query_buffer(buffer: queue.Queue) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the items put into the buffer by a query worker
+    """
+    while (value := buffer.get()) is not _END_OF_QUERY:
+        if isinstance(value, Exception):
+            raise value
+        yield value
+
+
 class Repository(ABC, Generic[RepositoryModel]):
     ITEM_TYPE: Type[RepositoryModel]
 
@@ -93,17 +323,27 @@ class DocumentPointerRepository(Repository[DocumentPointer]):
 
         return item
 
-    def get_by_id(self, id: str) -> Optional[DocumentPointer]:
+    def get_by_id(
+        self, id: str, fields: Optional[List[str]] = None
+    ) -> Optional[DocumentPointer]:
         """
         Get a DocumentPointer resource by ID
+
+        If fields are provided, only those fields are read and the returned
+        DocumentPointer is a partial record containing just those fields
         """
         doc_key = f"D#{id}"
+        request = _with_projection(
+            {
+                "Key": {"pk": doc_key, "sk": doc_key},
+                "ReturnConsumedCapacity": "INDEXES",
+            },
+            fields,
+            required=("pk", "sk", "id"),
+        )
 
         try:
-            result = self.table.get_item(
-                Key={"pk": doc_key, "sk": doc_key},
-                ReturnConsumedCapacity="INDEXES",
-            )
+            result = self.table.get_item(**request)
         except ClientError as exc:
             logger.log(
                 LogReference.REPOSITORY007,
@@ -119,9 +359,9 @@ class DocumentPointerRepository(Repository[DocumentPointer]):
 
         item = result["Item"]
         try:
-            parsed_item = self.ITEM_TYPE.parse_obj({"_from_dynamo": True, **item})
+            parsed_item = self.ITEM_TYPE.from_dynamo(item, partial=bool(fields))
             logger.log(LogReference.REPOSITORY011)
-            logger.log(LogReference.REPOSITORY011a, result=parsed_item.dict())
+            logger.log(LogReference.REPOSITORY011a, result=item)
             return parsed_item
         except ValidationError as exc:
             logger.log(
@@ -137,6 +377,87 @@ class DocumentPointerRepository(Repository[DocumentPointer]):
                 details=SpineErrorConcept.from_code("INTERNAL_SERVER_ERROR"),
             ) from exc
 
+    def get_many(
+        self, ids: List[str], fields: Optional[List[str]] = None
+    ) -> Dict[str, DocumentPointer]:
+        """
+        Get multiple DocumentPointer resources by ID using BatchGetItem, returning
+        the pointers that exist keyed by their ID
+
+        If fields are provided, only those fields are read and the returned
+        DocumentPointers are partial records containing just those fields
+        """
+        unique_ids = list(dict.fromkeys(ids))
+        logger.log(LogReference.REPOSITORY034, ids=unique_ids)
+
+        items = []
+        for index in range(0, len(unique_ids), BATCH_GET_MAX_KEYS):
+            keys = [
+                {"pk": f"D#{id_}", "sk": f"D#{id_}"}
+                for id_ in unique_ids[index : index + BATCH_GET_MAX_KEYS]
+            ]
+            request = _with_projection(
+                {"Keys": keys}, fields, required=("pk", "sk", "id")
+            )
+            items.extend(self._batch_get_items(request))
+
+        pointers = {}
+        for item in items:
+            pointer = self._parse_item(item, partial=bool(fields))
+            pointers[pointer.id] = pointer
+
+        logger.log(LogReference.REPOSITORY035, count=len(pointers))
+        return pointers
+
+    def _batch_get_items(self, request: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Perform a BatchGetItem request, retrying any unprocessed keys with
+        exponential backoff
+        """
+        items = []
+        request_items = {self.table_name: request}
+
+        for attempt in range(BATCH_GET_MAX_ATTEMPTS):
+            if attempt:
+                delay = BATCH_GET_BACKOFF_SECONDS * 2 ** (attempt - 1)
+                logger.log(
+                    LogReference.REPOSITORY036,
+                    attempt=attempt,
+                    delay=delay,
+                    unprocessed=len(request_items[self.table_name]["Keys"]),
+                )
+                time.sleep(delay)
+
+            try:
+                result = self.dynamodb.batch_get_item(
+                    RequestItems=request_items, ReturnConsumedCapacity="INDEXES"
+                )
+            except ClientError as exc:
+                logger.log(
+                    LogReference.REPOSITORY007,
+                    exc_info=sys.exc_info(),
+                    stacklevel=5,
+                    error=str(exc),
+                )
+                raise exc
+
+            items.extend(result["Responses"].get(self.table_name, []))
+
+            request_items = result.get("UnprocessedKeys")
+            if not request_items:
+                return items
+
+        logger.log(
+            LogReference.REPOSITORY037,
+            unprocessed=len(request_items[self.table_name]["Keys"]),
+        )
+        raise OperationOutcomeError(
+            status_code="500",
+            severity="error",
+            code="exception",
+            details=SpineErrorConcept.from_code("INTERNAL_SERVER_ERROR"),
+        )
+
     def count_by_nhs_number(
         self,
         nhs_number: str,
@@ -151,48 +472,20 @@ class DocumentPointerRepository(Repository[DocumentPointer]):
             pointer_types=pointer_types,
         )
 
-        key_conditions = ["patient_key = :patient_key"]
-        filter_expressions = []
-        expression_names = {}
-        expression_values = {":patient_key": f"P#{nhs_number}"}
-
-        if len(pointer_types) == 1:
-            # Optimisation for single pointer type
-            category_id, type_id = _get_sk_ids_for_type(pointer_types[0])
-            patient_sort = f"C#{category_id}#T#{type_id}"
-            key_conditions.append("begins_with(patient_sort, :patient_sort)")
-            expression_values[":patient_sort"] = patient_sort
-
-        # Handle multiple categories and pointer types with filter expressions
-        if len(pointer_types) > 1:
-            expression_names["#pointer_type"] = "type"
-            types_filters = [
-                f"#pointer_type = :type_{i}" for i in range(len(pointer_types))
-            ]
-            types_filter_values = {
-                f":type_{i}": pointer_types[i] for i in range(len(pointer_types))
-            }
-            filter_expressions.append(f"({' OR '.join(types_filters)})")
-            expression_values.update(types_filter_values)
-
-        query = {
-            "IndexName": "patient_gsi",
-            "KeyConditionExpression": " AND ".join(key_conditions),
-            "ExpressionAttributeValues": expression_values,
-            "Select": "COUNT",
-            "ReturnConsumedCapacity": "INDEXES",
-        }
-
-        if filter_expressions:
-            query["FilterExpression"] = " AND ".join(filter_expressions)
-
-        if expression_names:
-            query["ExpressionAttributeNames"] = expression_names
-
-        logger.log(LogReference.REPOSITORY017, query=query)
+        queries = [
+            {**query, "Select": "COUNT"}
+            for query in self._build_patient_queries(nhs_number, pointer_types or [])
+        ]
 
         try:
-            result = self.table.query(**query)
+            if len(queries) == 1:
+                counts = [self._count_query(queries[0])]
+            else:
+                with ThreadPoolExecutor(
+                    max_workers=len(queries), thread_name_prefix="nrlf-query"
+                ) as executor:
+                    counts = list(executor.map(self._count_query, queries))
+
         except ClientError as exc:
             logger.log(
                 LogReference.REPOSITORY019,
@@ -207,49 +500,95 @@ class DocumentPointerRepository(Repository[DocumentPointer]):
                 details=SpineErrorConcept.from_code("INTERNAL_SERVER_ERROR"),
             ) from exc
 
-        logger.log(LogReference.REPOSITORY018, count=result["Count"])
-        logger.log(LogReference.REPOSITORY018a, result=result)
+        return sum(counts)
+
+    def _count_query(self, query: Dict[str, Any]) -> int:
+        """
+        Count the items matched by a query, following LastEvaluatedKey
+        """
+        logger.log(LogReference.REPOSITORY017, query=query)
+
+        count = 0
+        paginator = self.dynamodb.meta.client.get_paginator("query")
+        for result in paginator.paginate(TableName=self.table_name, **query):
+            logger.log(LogReference.REPOSITORY018, count=result["Count"])
+            logger.log(LogReference.REPOSITORY018a, result=result)
+            count += result["Count"]
 
-        return result["Count"]
+        return count
 
-    def search(
+    def search(  # noqa: PLR0913
         self,
         nhs_number: str,
         custodian: Optional[str] = None,
         custodian_suffix: Optional[str] = None,
-        pointer_types: Optional[List[str]] = [],
+        pointer_types: Optional[List[str]] = None,
+        order_by: SearchOrder = SearchOrder.PATIENT_SORT,
+        fields: Optional[List[str]] = None,
     ) -> Iterator[DocumentPointer]:
-        """"""
+        """
+        Search for DocumentPointer records, returning the results of every
+        planned query merged in the requested order
+
+        If fields are provided, only those fields are read and partial
+        DocumentPointer records are returned
+        """
         logger.log(
             LogReference.REPOSITORY020,
             nhs_number=nhs_number,
             custodian=custodian,
             pointer_types=pointer_types,
         )
+        queries = self._build_patient_queries(
+            nhs_number, pointer_types, custodian, custodian_suffix, fields
+        )
+        for item in self._fan_out(queries, order_by=order_by):
+            yield self._parse_item(item, partial=bool(fields))
 
-        key_conditions = ["patient_key = :patient_key"]
-        filter_expressions = []
-        expression_names = {}
-        expression_values = {":patient_key": f"P#{nhs_number}"}
-
-        if len(pointer_types) == 1:
-            # Optimisation for single pointer type
-            category_id, type_id = _get_sk_ids_for_type(pointer_types[0])
-            patient_sort = f"C#{category_id}#T#{type_id}"
-            key_conditions.append("begins_with(patient_sort, :patient_sort)")
-            expression_values[":patient_sort"] = patient_sort
-
-        # Handle multiple categories and pointer types with filter expressions
-        if len(pointer_types) > 1:
-            expression_names["#pointer_type"] = "type"
-            types_filters = [
-                f"#pointer_type = :type_{i}" for i in range(len(pointer_types))
-            ]
-            types_filter_values = {
-                f":type_{i}": pointer_types[i] for i in range(len(pointer_types))
-            }
-            filter_expressions.append(f"({' OR '.join(types_filters)})")
-            expression_values.update(types_filter_values)
+    def search_page(  # noqa: PLR0913
+        self,
+        nhs_number: str,
+        custodian: Optional[str] = None,
+        custodian_suffix: Optional[str] = None,
+        pointer_types: Optional[List[str]] = None,
+        page_size: Optional[int] = None,
+        start_key: Optional[Dict[str, Any]] = None,
+        fields: Optional[List[str]] = None,
+    ) -> PaginatedResult:
+        """
+        Search for DocumentPointer records, returning at most page_size results
+        along with the key to continue the search from
+
+        If fields are provided, only those fields are read and partial
+        DocumentPointer records are returned
+        """
+        logger.log(
+            LogReference.REPOSITORY020,
+            nhs_number=nhs_number,
+            custodian=custodian,
+            pointer_types=pointer_types,
+            page_size=page_size,
+        )
+        queries = self._build_patient_queries(
+            nhs_number, pointer_types, custodian, custodian_suffix, fields
+        )
+        return self._query_page(
+            queries, page_size=page_size, start_key=start_key, partial=bool(fields)
+        )
+
+    def _build_patient_queries(
+        self,
+        nhs_number: str,
+        pointer_types: Optional[List[str]],
+        custodian: Optional[str] = None,
+        custodian_suffix: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Build the patient_gsi queries used to search for DocumentPointer records
+        """
+        base_filter_expressions = []
+        base_expression_values = {":patient_key": f"P#{nhs_number}"}
 
         if custodian:
             logger.log(
@@ -257,8 +596,8 @@ class DocumentPointerRepository(Repository[DocumentPointer]):
                 expression="custodian = :custodian",
                 values=["custodian"],
             )
-            filter_expressions.append("custodian = :custodian")
-            expression_values[":custodian"] = custodian
+            base_filter_expressions.append("custodian = :custodian")
+            base_expression_values[":custodian"] = custodian
 
         if custodian_suffix:
             logger.log(
@@ -266,23 +605,59 @@ class DocumentPointerRepository(Repository[DocumentPointer]):
                 expression="custodian_suffix = :custodian_suffix",
                 values=["custodian_suffix"],
             )
-            filter_expressions.append("custodian_suffix = :custodian_suffix")
-            expression_values[":custodian_suffix"] = custodian_suffix
+            base_filter_expressions.append("custodian_suffix = :custodian_suffix")
+            base_expression_values[":custodian_suffix"] = custodian_suffix
 
-        query = {
-            "IndexName": "patient_gsi",
-            "KeyConditionExpression": " AND ".join(key_conditions),
-            "ExpressionAttributeValues": expression_values,
-            "ReturnConsumedCapacity": "INDEXES",
-        }
+        planned_queries = _plan_patient_sort_queries(pointer_types or [])
+        logger.log(
+            LogReference.REPOSITORY032,
+            pointer_types=pointer_types,
+            plan=[query.sort_prefix or "*" for query in planned_queries],
+        )
 
-        if filter_expressions:
-            query["FilterExpression"] = " AND ".join(filter_expressions)
+        queries = []
+        for planned_query in planned_queries:
+            key_conditions = ["patient_key = :patient_key"]
+            filter_expressions = list(base_filter_expressions)
+            expression_names = {}
+            expression_values = dict(base_expression_values)
 
-        if expression_names:
-            query["ExpressionAttributeNames"] = expression_names
+            if planned_query.sort_prefix:
+                key_conditions.append("begins_with(patient_sort, :patient_sort)")
+                expression_values[":patient_sort"] = planned_query.sort_prefix
 
-        yield from self._query(**query)
+            if planned_query.pointer_types:
+                expression_names["#pointer_type"] = "type"
+                types_filters = [
+                    f"#pointer_type = :type_{i}"
+                    for i in range(len(planned_query.pointer_types))
+                ]
+                expression_values.update(
+                    {
+                        f":type_{i}": pointer_type
+                        for i, pointer_type in enumerate(planned_query.pointer_types)
+                    }
+                )
+                filter_expressions.insert(0, f"({' OR '.join(types_filters)})")
+
+            query = {
+                "IndexName": "patient_gsi",
+                "KeyConditionExpression": " AND ".join(key_conditions),
+                "ExpressionAttributeValues": expression_values,
+                "ReturnConsumedCapacity": "INDEXES",
+            }
+
+            if filter_expressions:
+                query["FilterExpression"] = " AND ".join(filter_expressions)
+
+            if expression_names:
+                query["ExpressionAttributeNames"] = expression_names
+
+            queries.append(
+                _with_projection(query, fields, required=PATIENT_PROJECTION_KEYS)
+            )
+
+        return queries
 
     def save(self, item: DocumentPointer) -> DocumentPointer:
         """
@@ -301,13 +676,155 @@ class DocumentPointerRepository(Repository[DocumentPointer]):
         ids_to_delete: List[str],
         can_ignore_delete_fail: bool = False,
     ) -> DocumentPointer:
-        """ """
-        saved_item = self.create(item)
+        """
+        Create a DocumentPointer and delete the pointers it supersedes
+
+        Unless failed deletes can be ignored, the create and the deletes are
+        written in a single transaction so that a supersede is never left half
+        complete. Transactions are limited to 100 items, so superseding more
+        than 99 pointers is split across multiple transactions.
+        """
+        if can_ignore_delete_fail:
+            saved_item = self.create(item)
+
+            for id_ in ids_to_delete:
+                self.delete_by_id(id_, can_ignore_delete_fail)
+
+            return saved_item
+
+        transact_items = [
+            {
+                "Put": {
+                    "TableName": self.table_name,
+                    "Item": item.dict(),
+                    "ConditionExpression": "attribute_not_exists(pk) AND attribute_not_exists(sk)",
+                }
+            },
+            *(
+                {
+                    "Delete": {
+                        "TableName": self.table_name,
+                        "Key": {"pk": f"D#{id_}", "sk": f"D#{id_}"},
+                        "ConditionExpression": "attribute_exists(pk) AND attribute_exists(sk)",
+                    }
+                }
+                for id_ in dict.fromkeys(ids_to_delete)
+            ),
+        ]
+
+        logger.log(
+            LogReference.REPOSITORY038,
+            indexes=item.indexes,
+            ids_to_delete=ids_to_delete,
+        )
+        for index in range(0, len(transact_items), TRANSACT_WRITE_MAX_ITEMS):
+            self._transact_write(
+                transact_items[index : index + TRANSACT_WRITE_MAX_ITEMS]
+            )
+
+        return item
+
+    def create_batch(self, items: List[DocumentPointer]) -> List[DocumentPointer]:
+        """
+        Create multiple DocumentPointer resources using BatchWriteItem
+
+        Batch writes cannot be conditional, so the items must have unique
+        server-generated IDs. The batch writer splits the items into requests
+        of 25 and resends any unprocessed items.
+        """
+        logger.log(LogReference.REPOSITORY042, count=len(items))
+
+        try:
+            with self.table.batch_writer() as batch:
+                for item in items:
+                    batch.put_item(Item=item.dict())
+
+        except ClientError as exc:
+            logger.log(
+                LogReference.REPOSITORY005,
+                exc_info=sys.exc_info(),
+                stacklevel=5,
+                error=str(exc),
+            )
+            raise exc
+
+        logger.log(LogReference.REPOSITORY043, count=len(items))
+        return items
+
+    def create_transaction(self, items: List[DocumentPointer]) -> List[DocumentPointer]:
+        """
+        Create up to 100 DocumentPointer resources atomically using TransactWriteItems
+        """
+        if len(items) > TRANSACT_WRITE_MAX_ITEMS:
+            raise ValueError(
+                f"Cannot create more than {TRANSACT_WRITE_MAX_ITEMS} items in a transaction"
+            )
+
+        logger.log(LogReference.REPOSITORY044, count=len(items))
+        self._transact_write(
+            [
+                {
+                    "Put": {
+                        "TableName": self.table_name,
+                        "Item": item.dict(),
+                        "ConditionExpression": "attribute_not_exists(pk) AND attribute_not_exists(sk)",
+                    }
+                }
+                for item in items
+            ]
+        )
+        return items
+
+    def _transact_write(self, transact_items: List[Dict[str, Any]]) -> None:
+        """
+        Perform a TransactWriteItems request, mapping cancelled conditions onto
+        the matching OperationOutcome errors
+        """
+        try:
+            result = self.dynamodb.meta.client.transact_write_items(
+                TransactItems=transact_items, ReturnConsumedCapacity="INDEXES"
+            )
+            logger.log(LogReference.REPOSITORY039, result=result)
 
-        for id_ in ids_to_delete:
-            self.delete_by_id(id_, can_ignore_delete_fail)
+        except ClientError as exc:
+            reasons = [
+                reason.get("Code")
+                for reason in exc.response.get("CancellationReasons", [])
+            ]
 
-        return saved_item
+            # There is one reason for each item, unless the reasons are missing
+            failed_items = [
+                transact_item
+                for transact_item, reason in zip(transact_items, reasons, strict=False)
+                if reason == "ConditionalCheckFailed"
+            ]
+
+            if any("Put" in transact_item for transact_item in failed_items):
+                logger.log(LogReference.REPOSITORY004)
+                raise OperationOutcomeError(
+                    status_code="409",
+                    severity="error",
+                    code="conflict",
+                    details=SpineErrorConcept.from_code("DUPLICATE_REJECTED"),
+                ) from None
+
+            if failed_items:
+                logger.log(LogReference.REPOSITORY040, reasons=reasons)
+                raise OperationOutcomeError(
+                    severity="error",
+                    code="invalid",
+                    details=SpineErrorConcept.from_code("BAD_REQUEST"),
+                    diagnostics="The relatesTo target document does not exist",
+                ) from None
+
+            logger.log(
+                LogReference.REPOSITORY041,
+                exc_info=sys.exc_info(),
+                stacklevel=5,
+                error=str(exc),
+                reasons=reasons,
+            )
+            raise exc
 
     def delete(self, item: DocumentPointer) -> None:
         """
@@ -352,50 +869,98 @@ class DocumentPointerRepository(Repository[DocumentPointer]):
                     error=str(exc),
                 )
 
-    def _query(self, **kwargs) -> Iterator[DocumentPointer]:
+    def _query_page(
+        self,
+        queries: List[Dict[str, Any]],
+        page_size: Optional[int] = None,
+        start_key: Optional[Dict[str, Any]] = None,
+        partial: bool = False,
+    ) -> PaginatedResult:
         """
-        Wrapper around DynamoDB query method to handle pagination
-        Returns an iterator of DocumentPointer objects
+        Retrieve a single page of results across one or more patient_gsi queries,
+        which must be provided in patient_sort order. The page is resumed from
+        start_key and ends after page_size results have been matched, or when
+        there are no more items to evaluate
         """
-        # Remove empty fields from the search query
-        query = {key: value for key, value in kwargs.items() if value}
+        logger.log(
+            LogReference.REPOSITORY030,
+            queries=queries,
+            table=self.table_name,
+            page_size=page_size,
+            start_key=start_key,
+        )
 
-        logger.log(LogReference.REPOSITORY021, query=query, table=self.table_name)
+        queries = _resume_patient_queries(queries, start_key)
+        if page_size:
+            # Request one extra item so the next page can be detected without
+            # making another round trip to DynamoDB
+            queries = [{**query, "Limit": page_size + 1} for query in queries]
 
+        results = self._fan_out(queries)
         try:
-            paginator = self.dynamodb.meta.client.get_paginator("query")
-            response_iterator = paginator.paginate(TableName=self.table_name, **query)
+            raw_items = list(itertools.islice(results, page_size))
+            has_next_page = bool(page_size) and next(results, None) is not None
+        finally:
+            results.close()
 
-            for page in response_iterator:
-                logger.log(
-                    LogReference.REPOSITORY028,
-                    stats={
-                        "count": page["Count"],
-                        "scanned_count": page["ScannedCount"],
-                        "last_evaluated_key": page.get("LastEvaluatedKey"),
-                    },
+        items = [self._parse_item(item, partial=partial) for item in raw_items]
+        next_key = None
+        if has_next_page and raw_items:
+            next_key = {key: raw_items[-1][key] for key in PATIENT_GSI_KEYS}
+
+        logger.log(
+            LogReference.REPOSITORY031,
+            count=len(items),
+            has_next_page=next_key is not None,
+        )
+        return PaginatedResult(items=items, last_evaluated_key=next_key)
+
+    def _fan_out(
+        self,
+        queries: List[Dict[str, Any]],
+        order_by: SearchOrder = SearchOrder.PATIENT_SORT,
+    ) -> Generator[Dict[str, Any], None, None]:
+        """
+        Run the provided queries concurrently and merge their items in order
+
+        Each query is streamed by a worker thread (sharing the cached boto3
+        client) into a bounded buffer, and the buffers are combined with a
+        k-way merge, so items are yielded as soon as they are available and
+        workers stop reading once the consumer has finished with the results.
+        """
+        if order_by == SearchOrder.CREATED_ON_DESC:
+            queries = [{**query, "ScanIndexForward": False} for query in queries]
+
+        merge_key, reverse = _MERGE_ORDERINGS[order_by]
+        executor, stop = None, None
+
+        try:
+            if len(queries) == 1:
+                streams = [self._iter_query_items(queries[0])]
+            else:
+                logger.log(LogReference.REPOSITORY033, query_count=len(queries))
+                stop = threading.Event()
+                executor = ThreadPoolExecutor(
+                    max_workers=len(queries), thread_name_prefix="nrlf-query"
                 )
-                logger.log(LogReference.REPOSITORY028a, result=page)
-
-                for item in page["Items"]:
-                    try:
-                        yield self.ITEM_TYPE.parse_obj({"_from_dynamo": True, **item})
-
-                    except ValidationError as exc:
-                        logger.log(
-                            LogReference.REPOSITORY010,
-                            exc_info=sys.exc_info(),
-                            stacklevel=5,
-                            error=str(exc),
-                        )
-                        raise OperationOutcomeError(
-                            status_code="500",
-                            severity="error",
-                            code="exception",
-                            details=SpineErrorConcept.from_code(
-                                "INTERNAL_SERVER_ERROR"
-                            ),
-                        ) from exc
+                streams = []
+                for query in queries:
+                    buffer = queue.Queue(maxsize=QUERY_BUFFER_SIZE)
+                    executor.submit(self._stream_query_items, query, buffer, stop)
+                    streams.append(_drain_query_buffer(buffer))
+
+            if order_by == SearchOrder.CREATED_ON_DESC:
+                # Only single type queries are returned in created_on order
+                streams = [
+                    (
+                        stream
+                        if _is_single_type_query(query)
+                        else iter(sorted(stream, key=merge_key, reverse=reverse))
+                    )
+                    for query, stream in zip(queries, streams, strict=True)
+                ]
+
+            yield from heapq.merge(*streams, key=merge_key, reverse=reverse)
 
         except ClientError as exc:
             logger.log(
@@ -406,6 +971,85 @@ class DocumentPointerRepository(Repository[DocumentPointer]):
             )
             raise exc
 
+        finally:
+            if executor is not None:
+                stop.set()
+                executor.shutdown(wait=False)
+
+    def _stream_query_items(
+        self,
+        query: Dict[str, Any],
+        buffer: queue.Queue,
+        stop: threading.Event,
+    ):
+        """
+        Worker that reads the items for a query into the provided buffer
+        """
+        try:
+            for item in self._iter_query_items(query):
+                if not _put_until_stopped(buffer, item, stop):
+                    return
+
+        except Exception as exc:  # re-raised by the consuming thread
+            _put_until_stopped(buffer, exc, stop)
+            return
+
+        _put_until_stopped(buffer, _END_OF_QUERY, stop)
+
+    def _iter_query_items(self, query: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """
+        Wrapper around DynamoDB query method to handle pagination
+        Returns an iterator of the raw items returned by DynamoDB
+        """
+        # Remove empty fields from the search query
+        query = {
+            key: value for key, value in query.items() if value not in EMPTY_VALUES
+        }
+
+        logger.log(LogReference.REPOSITORY021, query=query, table=self.table_name)
+
+        while True:
+            page = self.dynamodb.meta.client.query(TableName=self.table_name, **query)
+            logger.log(
+                LogReference.REPOSITORY028,
+                stats={
+                    "count": page["Count"],
+                    "scanned_count": page["ScannedCount"],
+                    "last_evaluated_key": page.get("LastEvaluatedKey"),
+                },
+            )
+            logger.log(LogReference.REPOSITORY028a, result=page)
+
+            yield from page["Items"]
+
+            if not (last_evaluated_key := page.get("LastEvaluatedKey")):
+                return
+
+            query["ExclusiveStartKey"] = last_evaluated_key
+
+    def _parse_item(
+        self, item: Dict[str, Any], partial: bool = False
+    ) -> RepositoryModel:
+        """
+        Parse an item returned from DynamoDB into the repository model
+        """
+        try:
+            return self.ITEM_TYPE.from_dynamo(item, partial=partial)
+
+        except ValidationError as exc:
+            logger.log(
+                LogReference.REPOSITORY010,
+                exc_info=sys.exc_info(),
+                stacklevel=5,
+                error=str(exc),
+            )
+            raise OperationOutcomeError(
+                status_code="500",
+                severity="error",
+                code="exception",
+                details=SpineErrorConcept.from_code("INTERNAL_SERVER_ERROR"),
+            ) from exc
+
     def update(self, item: DocumentPointer) -> DocumentPointer:
         """
         Update a DocumentPointer resource
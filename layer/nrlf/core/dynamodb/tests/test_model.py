@@ -1,7 +1,9 @@
 import json
+from decimal import Decimal
 
 import pytest
 from freezegun import freeze_time
+from pydantic import ValidationError
 
 from nrlf.core.constants import PointerTypes
 from nrlf.core.dynamodb.model import DocumentPointer, DynamoDBModel
@@ -112,6 +114,16 @@ def test_document_pointer_from_document_reference_valid():
     assert json.loads(document) == doc_ref.dict(exclude_none=True)
 
 
+def test_document_pointer_from_document_reference_with_document():
+    doc_ref = load_document_reference("Y05868-736253002-Valid")
+    document = '{"resourceType":"DocumentReference"}'
+
+    model = DocumentPointer.from_document_reference(doc_ref, document=document)
+
+    assert model.document == document
+    assert model.id == "Y05868-99999-99999-999999"
+
+
 def test_document_pointer_from_document_reference_valid_with_created_on():
     doc_ref = load_document_reference("Y05868-736253002-Valid")
     model = DocumentPointer.from_document_reference(
@@ -280,3 +292,45 @@ def test_validate_id(id_):
 def test_validate_id_invalid(id_):
     with pytest.raises(ValueError):
         DocumentPointer.validate_id(id_)
+
+
+def test_document_pointer_from_dynamo():
+    doc_ref = load_document_reference("Y05868-736253002-Valid")
+    pointer = DocumentPointer.from_document_reference(doc_ref)
+    item = {**pointer.dict(), "version": Decimal(1)}
+
+    model = DocumentPointer.from_dynamo(item)
+
+    assert model._from_dynamo is True
+    assert model.version == 1
+    assert model.producer_id == "Y05868"
+    assert model.document_id == pointer.document_id
+    assert model.dict() == pointer.dict()
+    assert model == DocumentPointer.parse_obj({"_from_dynamo": True, **item})
+
+
+def test_document_pointer_from_dynamo_skips_validation():
+    doc_ref = load_document_reference("Y05868-736253002-Valid")
+    item = {**DocumentPointer.from_document_reference(doc_ref).dict()}
+    item["nhs_number"] = "invalid"
+
+    model = DocumentPointer.from_dynamo(item)
+
+    assert model.nhs_number == "invalid"
+
+
+def test_document_pointer_from_dynamo_missing_fields():
+    doc_ref = load_document_reference("Y05868-736253002-Valid")
+    item = {**DocumentPointer.from_document_reference(doc_ref).dict()}
+    item.pop("document")
+
+    with pytest.raises(ValidationError) as error:
+        DocumentPointer.from_dynamo(item)
+
+    assert error.value.errors() == [
+        {
+            "loc": ("document",),
+            "msg": "field required",
+            "type": "value_error.missing",
+        }
+    ]
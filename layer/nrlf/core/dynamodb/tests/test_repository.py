@@ -1,15 +1,34 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
 import pytest
+from botocore.exceptions import ClientError
+from moto import mock_aws
+
+from nrlf.core.constants import Categories, PointerTypes
+from nrlf.core.dynamodb.repository import (
+    DocumentPointer,
+    DocumentPointerRepository,
+    PatientSortQuery,
+    SearchOrder,
+    _get_sk_ids_for_type,
+    _plan_patient_sort_queries,
+)
+from nrlf.core.errors import OperationOutcomeError
+from nrlf.core.logger import LogReference
+from nrlf.tests.data import load_document_reference
+from nrlf.tests.dynamodb import mock_repository
 
-from nrlf.core.constants import PointerTypes
-from nrlf.core.dynamodb.repository import _get_sk_ids_for_type
+CARE_PLAN_PREFIX = "C#SCT-734163000#"
+OBSERVATIONS_PREFIX = "C#SCT-1102421000000108#"
 
 
 def test_get_sk_ids_for_type_exception_thrown_for_invalid_type():
-    with pytest.raises(ValueError) as error:
+    with pytest.raises(
+        ValueError, match="Cannot find category for pointer type: invalid_type"
+    ):
         _get_sk_ids_for_type("invalid_type")
 
-    assert str(error.value) == "Cannot find category for pointer type: invalid_type"
-
 
 def test_get_sk_ids_for_type_returns_type_and_category_for_every_type():
     for each in PointerTypes.list():
@@ -20,14 +39,534 @@ def test_get_sk_ids_for_type_returns_type_and_category_for_every_type():
 def test_get_sk_ids_for_type_exception_thrown_if_new_type_has_no_category():
     pointer_types = PointerTypes.list()
     pointer_types.append("some_pointer_type")
-    with pytest.raises(ValueError) as error:
+    with pytest.raises(
+        ValueError, match="Cannot find category for pointer type: some_pointer_type"
+    ):
         for each in pointer_types:
             category, pointer_type = _get_sk_ids_for_type(each)
             assert category and pointer_type
 
+
+def test_plan_patient_sort_queries_no_pointer_types():
+    assert _plan_patient_sort_queries([]) == [PatientSortQuery()]
+
+
+def test_plan_patient_sort_queries_single_pointer_type():
+    assert _plan_patient_sort_queries([PointerTypes.MENTAL_HEALTH_PLAN.value]) == [
+        PatientSortQuery(sort_prefix=f"{CARE_PLAN_PREFIX}T#SCT-736253002#")
+    ]
+
+
+def test_plan_patient_sort_queries_few_types_in_category():
+    assert _plan_patient_sort_queries(
+        [PointerTypes.EOL_CARE_PLAN.value, PointerTypes.MENTAL_HEALTH_PLAN.value]
+    ) == [
+        PatientSortQuery(sort_prefix=f"{CARE_PLAN_PREFIX}T#SCT-736253002#"),
+        PatientSortQuery(sort_prefix=f"{CARE_PLAN_PREFIX}T#SCT-736373009#"),
+    ]
+
+
+def test_plan_patient_sort_queries_many_types_in_category():
+    pointer_types = [
+        PointerTypes.MENTAL_HEALTH_PLAN.value,
+        PointerTypes.EOL_CARE_PLAN.value,
+        PointerTypes.RESPECT_FORM.value,
+        PointerTypes.LLOYD_GEORGE_FOLDER.value,
+    ]
+
+    assert _plan_patient_sort_queries(pointer_types) == [
+        PatientSortQuery(
+            sort_prefix=CARE_PLAN_PREFIX, pointer_types=tuple(pointer_types)
+        )
+    ]
+
+
+def test_plan_patient_sort_queries_whole_category_and_single_types():
+    assert _plan_patient_sort_queries(
+        [PointerTypes.NEWS2_CHART.value, PointerTypes.MENTAL_HEALTH_PLAN.value]
+    ) == [
+        PatientSortQuery(
+            sort_prefix=OBSERVATIONS_PREFIX,
+            pointer_types=(PointerTypes.NEWS2_CHART.value,),
+        ),
+        PatientSortQuery(sort_prefix=f"{CARE_PLAN_PREFIX}T#SCT-736253002#"),
+    ]
+
+
+def test_plan_patient_sort_queries_all_pointer_types():
+    assert _plan_patient_sort_queries(PointerTypes.list()) == [
+        PatientSortQuery(pointer_types=tuple(PointerTypes.list()))
+    ]
+
+
+def test_plan_patient_sort_queries_unknown_pointer_type():
+    pointer_types = [PointerTypes.MENTAL_HEALTH_PLAN.value, "http://unknown|1234"]
+
+    assert _plan_patient_sort_queries(pointer_types) == [
+        PatientSortQuery(pointer_types=tuple(pointer_types))
+    ]
+
+
+def test_plan_patient_sort_queries_too_many_queries(mocker):
+    mocker.patch("nrlf.core.dynamodb.repository.MAX_PLANNED_QUERIES", 1)
+    pointer_types = [
+        PointerTypes.MENTAL_HEALTH_PLAN.value,
+        PointerTypes.EOL_CARE_PLAN.value,
+    ]
+
+    assert _plan_patient_sort_queries(pointer_types) == [
+        PatientSortQuery(pointer_types=tuple(pointer_types))
+    ]
+
+
+def test_patient_sort_query_is_before():
+    query = PatientSortQuery(sort_prefix=f"{CARE_PLAN_PREFIX}T#SCT-736253002#")
+
+    assert query.is_before(f"{CARE_PLAN_PREFIX}T#SCT-736373009#CO#2024")
+    assert not query.is_before(f"{CARE_PLAN_PREFIX}T#SCT-736253002#CO#2024")
+    assert not query.is_before(OBSERVATIONS_PREFIX)
+    assert not PatientSortQuery().is_before(CARE_PLAN_PREFIX)
+
+
+def _create_pointer(
+    repository: DocumentPointerRepository,
+    doc_id: str,
+    pointer_type: PointerTypes,
+    category: Categories,
+    created_on: str | None = None,
+):
+    doc_ref = load_document_reference("Y05868-736253002-Valid")
+    doc_ref.id = doc_id
+    doc_ref.type.coding[0].code = pointer_type.coding_value()
+    doc_ref.category[0].coding[0].code = category.coding_value()
+    repository.create(
+        DocumentPointer.from_document_reference(doc_ref, created_on=created_on)
+    )
+
+
+@mock_aws
+@mock_repository
+def test_search_page_across_planned_queries(repository: DocumentPointerRepository):
+    _create_pointer(
+        repository, "Y05868-1", PointerTypes.MENTAL_HEALTH_PLAN, Categories.CARE_PLAN
+    )
+    _create_pointer(
+        repository, "Y05868-2", PointerTypes.EOL_CARE_PLAN, Categories.CARE_PLAN
+    )
+    _create_pointer(
+        repository, "Y05868-3", PointerTypes.NEWS2_CHART, Categories.OBSERVATIONS
+    )
+    _create_pointer(
+        repository, "Y05868-4", PointerTypes.MENTAL_HEALTH_PLAN, Categories.CARE_PLAN
+    )
+
+    pointer_types = [
+        PointerTypes.MENTAL_HEALTH_PLAN.value,
+        PointerTypes.NEWS2_CHART.value,
+    ]
+    pages = []
+    start_key = None
+
+    while True:
+        result = repository.search_page(
+            nhs_number="6700028191",
+            pointer_types=pointer_types,
+            page_size=2,
+            start_key=start_key,
+        )
+        pages.append([item.id for item in result.items])
+        if not (start_key := result.last_evaluated_key):
+            break
+
+    assert pages == [["Y05868-3", "Y05868-1"], ["Y05868-4"]]
+    assert [
+        item.id
+        for item in repository.search(
+            nhs_number="6700028191", pointer_types=pointer_types
+        )
+    ] == ["Y05868-3", "Y05868-1", "Y05868-4"]
+    assert (
+        repository.count_by_nhs_number(
+            nhs_number="6700028191", pointer_types=pointer_types
+        )
+        == 3
+    )
+
+
+@mock_aws
+@mock_repository
+def test_search_page_without_pointer_types(repository: DocumentPointerRepository):
+    _create_pointer(
+        repository, "Y05868-1", PointerTypes.MENTAL_HEALTH_PLAN, Categories.CARE_PLAN
+    )
+    _create_pointer(
+        repository, "Y05868-2", PointerTypes.NEWS2_CHART, Categories.OBSERVATIONS
+    )
+
+    result = repository.search_page(nhs_number="6700028191")
+
+    assert sorted(item.id for item in result.items) == ["Y05868-1", "Y05868-2"]
+    assert result.last_evaluated_key is None
+
+
+@mock_aws
+@mock_repository
+def test_search_merges_concurrent_queries_by_created_on(
+    repository: DocumentPointerRepository,
+):
+    _create_pointer(
+        repository,
+        "Y05868-1",
+        PointerTypes.MENTAL_HEALTH_PLAN,
+        Categories.CARE_PLAN,
+        created_on="2024-01-01T00:00:00.000Z",
+    )
+    _create_pointer(
+        repository,
+        "Y05868-2",
+        PointerTypes.EOL_CARE_PLAN,
+        Categories.CARE_PLAN,
+        created_on="2024-01-03T00:00:00.000Z",
+    )
+    _create_pointer(
+        repository,
+        "Y05868-3",
+        PointerTypes.NEWS2_CHART,
+        Categories.OBSERVATIONS,
+        created_on="2024-01-02T00:00:00.000Z",
+    )
+    _create_pointer(
+        repository,
+        "Y05868-4",
+        PointerTypes.MENTAL_HEALTH_PLAN,
+        Categories.CARE_PLAN,
+        created_on="2024-01-04T00:00:00.000Z",
+    )
+
+    results = repository.search(
+        nhs_number="6700028191",
+        pointer_types=[
+            PointerTypes.MENTAL_HEALTH_PLAN.value,
+            PointerTypes.EOL_CARE_PLAN.value,
+            PointerTypes.NEWS2_CHART.value,
+        ],
+        order_by=SearchOrder.CREATED_ON_DESC,
+    )
+
+    assert [item.id for item in results] == [
+        "Y05868-4",
+        "Y05868-2",
+        "Y05868-3",
+        "Y05868-1",
+    ]
+
+
+@mock_aws
+@mock_repository
+def test_search_raises_errors_from_concurrent_queries(
+    repository: DocumentPointerRepository,
+):
+    error = ClientError({"Error": {"Code": "InternalServerError"}}, "Query")
+    client = repository.dynamodb.meta.client
+
+    with mock.patch.object(client, "query", side_effect=error), pytest.raises(
+        ClientError
+    ):
+        list(
+            repository.search(
+                nhs_number="6700028191",
+                pointer_types=[
+                    PointerTypes.MENTAL_HEALTH_PLAN.value,
+                    PointerTypes.EOL_CARE_PLAN.value,
+                ],
+            )
+        )
+
+
+@mock_aws
+@mock_repository
+def test_search_cleans_up_after_errors_sorting_concurrent_queries(
+    repository: DocumentPointerRepository,
+):
+    error = ClientError({"Error": {"Code": "InternalServerError"}}, "Query")
+    client = repository.dynamodb.meta.client
+
+    with mock.patch.object(client, "query", side_effect=error), mock.patch.object(
+        ThreadPoolExecutor, "shutdown", autospec=True
+    ) as mock_shutdown, mock.patch(
+        "nrlf.core.dynamodb.repository.logger"
+    ) as mock_logger, pytest.raises(
+        ClientError
+    ):
+        list(
+            repository.search(
+                nhs_number="6700028191",
+                pointer_types=[
+                    PointerTypes.MENTAL_HEALTH_PLAN.value,
+                    PointerTypes.EOL_CARE_PLAN.value,
+                    PointerTypes.NEWS2_CHART.value,
+                ],
+                order_by=SearchOrder.CREATED_ON_DESC,
+            )
+        )
+
+    mock_shutdown.assert_called_once()
+    assert LogReference.REPOSITORY022 in [
+        call.args[0] for call in mock_logger.log.call_args_list
+    ]
+
+
+@mock_aws
+@mock_repository
+def test_get_by_id_with_fields(repository: DocumentPointerRepository):
+    _create_pointer(
+        repository, "Y05868-1", PointerTypes.MENTAL_HEALTH_PLAN, Categories.CARE_PLAN
+    )
+
+    result = repository.get_by_id("Y05868-1", fields=["nhs_number", "type"])
+
+    assert result is not None
+    assert result._from_dynamo is True
+    assert result.id == "Y05868-1"
+    assert result.nhs_number == "6700028191"
+    assert result.type == PointerTypes.MENTAL_HEALTH_PLAN.value
+    assert "document" not in result.__dict__
+    assert "custodian" not in result.__dict__
+
+
+@mock_aws
+@mock_repository
+def test_search_page_with_fields(repository: DocumentPointerRepository):
+    _create_pointer(
+        repository, "Y05868-1", PointerTypes.MENTAL_HEALTH_PLAN, Categories.CARE_PLAN
+    )
+    _create_pointer(
+        repository, "Y05868-2", PointerTypes.NEWS2_CHART, Categories.OBSERVATIONS
+    )
+    _create_pointer(
+        repository, "Y05868-3", PointerTypes.MENTAL_HEALTH_PLAN, Categories.CARE_PLAN
+    )
+    pointer_types = [
+        PointerTypes.MENTAL_HEALTH_PLAN.value,
+        PointerTypes.NEWS2_CHART.value,
+    ]
+
+    first_page = repository.search_page(
+        nhs_number="6700028191",
+        pointer_types=pointer_types,
+        page_size=2,
+        fields=["type"],
+    )
+    second_page = repository.search_page(
+        nhs_number="6700028191",
+        pointer_types=pointer_types,
+        page_size=2,
+        start_key=first_page.last_evaluated_key,
+        fields=["type"],
+    )
+
+    assert [item.id for item in first_page.items + second_page.items] == [
+        "Y05868-2",
+        "Y05868-1",
+        "Y05868-3",
+    ]
+    assert second_page.last_evaluated_key is None
+    for item in first_page.items + second_page.items:
+        assert set(item.__dict__) == {
+            "id",
+            "producer_id",
+            "document_id",
+            "type",
+            "created_on",
+            "custodian_suffix",
+            "master_identifier",
+            "updated_on",
+            "schemas",
+        }
+
+
+@mock_aws
+@mock_repository
+def test_get_many(repository: DocumentPointerRepository):
+    _create_pointer(
+        repository, "Y05868-1", PointerTypes.MENTAL_HEALTH_PLAN, Categories.CARE_PLAN
+    )
+    _create_pointer(
+        repository, "Y05868-2", PointerTypes.NEWS2_CHART, Categories.OBSERVATIONS
+    )
+
+    result = repository.get_many(["Y05868-1", "Y05868-2", "Y05868-3", "Y05868-1"])
+
+    assert set(result) == {"Y05868-1", "Y05868-2"}
+    assert result["Y05868-1"] == repository.get_by_id("Y05868-1")
+    assert result["Y05868-2"] == repository.get_by_id("Y05868-2")
+
+
+@mock_aws
+@mock_repository
+def test_get_many_retries_unprocessed_keys(repository: DocumentPointerRepository):
+    _create_pointer(
+        repository, "Y05868-1", PointerTypes.MENTAL_HEALTH_PLAN, Categories.CARE_PLAN
+    )
+    batch_get_item = repository.dynamodb.batch_get_item
+    unprocessed = {"Responses": {}, "UnprocessedKeys": None}
+
+    def _batch_get_item(**kwargs):
+        if unprocessed["UnprocessedKeys"] is None:
+            unprocessed["UnprocessedKeys"] = kwargs["RequestItems"]
+            return unprocessed
+        return batch_get_item(**kwargs)
+
+    with mock.patch.object(
+        repository.dynamodb, "batch_get_item", side_effect=_batch_get_item
+    ) as mock_batch_get_item, mock.patch("time.sleep") as mock_sleep:
+        result = repository.get_many(["Y05868-1"], fields=["type"])
+
+    assert mock_batch_get_item.call_count == 2
+    mock_sleep.assert_called_once_with(0.05)
+    assert list(result) == ["Y05868-1"]
+    assert result["Y05868-1"].type == PointerTypes.MENTAL_HEALTH_PLAN.value
+
+
+@mock_aws
+@mock_repository
+def test_get_many_raises_when_keys_remain_unprocessed(
+    repository: DocumentPointerRepository,
+):
+    def _batch_get_item(**kwargs):
+        return {"Responses": {}, "UnprocessedKeys": kwargs["RequestItems"]}
+
+    with mock.patch.object(
+        repository.dynamodb, "batch_get_item", side_effect=_batch_get_item
+    ), mock.patch("time.sleep") as mock_sleep, pytest.raises(
+        OperationOutcomeError
+    ) as error:
+        repository.get_many(["Y05868-1"])
+
+    assert error.value.status_code == "500"
+    assert [call.args[0] for call in mock_sleep.call_args_list] == [
+        0.05,
+        0.1,
+        0.2,
+        0.4,
+    ]
+
+
+def _pointer(doc_id: str) -> DocumentPointer:
+    doc_ref = load_document_reference("Y05868-736253002-Valid")
+    doc_ref.id = doc_id
+    return DocumentPointer.from_document_reference(doc_ref)
+
+
+@mock_aws
+@mock_repository
+def test_supersede(repository: DocumentPointerRepository):
+    repository.create(_pointer("Y05868-1"))
+    repository.create(_pointer("Y05868-2"))
+
+    result = repository.supersede(_pointer("Y05868-3"), ["Y05868-1", "Y05868-2"])
+
+    assert result.id == "Y05868-3"
+    assert repository.get_by_id("Y05868-1") is None
+    assert repository.get_by_id("Y05868-2") is None
+    assert repository.get_by_id("Y05868-3") is not None
+
+
+@mock_aws
+@mock_repository
+def test_supersede_in_multiple_transactions(repository: DocumentPointerRepository):
+    ids_to_delete = [f"Y05868-{i}" for i in range(1, 6)]
+    for id_ in ids_to_delete:
+        repository.create(_pointer(id_))
+    client = repository.dynamodb.meta.client
+
+    with mock.patch(
+        "nrlf.core.dynamodb.repository.TRANSACT_WRITE_MAX_ITEMS", 2
+    ), mock.patch.object(
+        client, "transact_write_items", wraps=client.transact_write_items
+    ) as mock_transact_write_items:
+        repository.supersede(_pointer("Y05868-6"), ids_to_delete)
+
+    assert mock_transact_write_items.call_count == 3
+    assert all(repository.get_by_id(id_) is None for id_ in ids_to_delete)
+    assert repository.get_by_id("Y05868-6") is not None
+
+
+@mock_aws
+@mock_repository
+def test_supersede_missing_pointer_is_atomic(repository: DocumentPointerRepository):
+    repository.create(_pointer("Y05868-1"))
+
+    with pytest.raises(OperationOutcomeError) as error:
+        repository.supersede(_pointer("Y05868-3"), ["Y05868-1", "Y05868-2"])
+
+    assert error.value.status_code == "400"
     assert (
-        str(error.value) == "Cannot find category for pointer type: some_pointer_type"
+        error.value.operation_outcome.issue[0].diagnostics
+        == "The relatesTo target document does not exist"
     )
+    assert repository.get_by_id("Y05868-1") is not None
+    assert repository.get_by_id("Y05868-3") is None
+
+
+@mock_aws
+@mock_repository
+def test_supersede_existing_pointer(repository: DocumentPointerRepository):
+    repository.create(_pointer("Y05868-1"))
+    repository.create(_pointer("Y05868-3"))
+
+    with pytest.raises(OperationOutcomeError) as error:
+        repository.supersede(_pointer("Y05868-3"), ["Y05868-1"])
+
+    assert error.value.status_code == "409"
+    assert repository.get_by_id("Y05868-1") is not None
+
+
+@mock_aws
+@mock_repository
+def test_supersede_can_ignore_delete_fail(repository: DocumentPointerRepository):
+    repository.create(_pointer("Y05868-1"))
+    client = repository.dynamodb.meta.client
+
+    with mock.patch.object(client, "transact_write_items") as mock_transact:
+        repository.supersede(
+            _pointer("Y05868-3"),
+            ["Y05868-1", "Y05868-2"],
+            can_ignore_delete_fail=True,
+        )
+
+    mock_transact.assert_not_called()
+    assert repository.get_by_id("Y05868-1") is None
+    assert repository.get_by_id("Y05868-3") is not None
+
+
+@mock_aws
+@mock_repository
+def test_create_batch(repository: DocumentPointerRepository):
+    pointers = [_pointer(f"Y05868-{i}") for i in range(1, 31)]
+
+    assert repository.create_batch(pointers) == pointers
+    assert all(repository.get_by_id(pointer.id) for pointer in pointers)
+
+
+@mock_aws
+@mock_repository
+def test_create_transaction_existing_pointer(repository: DocumentPointerRepository):
+    repository.create(_pointer("Y05868-2"))
+
+    with pytest.raises(OperationOutcomeError) as error:
+        repository.create_transaction([_pointer("Y05868-1"), _pointer("Y05868-2")])
+
+    assert error.value.status_code == "409"
+    assert repository.get_by_id("Y05868-1") is None
+
 
+def test_create_transaction_too_many_items():
+    repository = mock.Mock(spec=DocumentPointerRepository)
 
-# TODO: Add unit tests for Repository Class
+    with pytest.raises(
+        ValueError, match="Cannot create more than 100 items in a transaction"
+    ):
+        DocumentPointerRepository.create_transaction(
+            repository, [_pointer(f"Y05868-{i}") for i in range(101)]
+        )
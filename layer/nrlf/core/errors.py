@@ -2,10 +2,8 @@ from typing import List, Optional
 
 from pydantic import ValidationError
 
-from nrlf.core.response import Response
-from nrlf.core.types import CodeableConcept
-from nrlf.producer.fhir.r4 import model as producer_model
-from nrlf.producer.fhir.r4.model import OperationOutcome, OperationOutcomeIssue
+from nrlf.core.response import Response, json_format
+from nrlf.core.types import CodeableConcept, OperationOutcomeIssue
 
 
 class OperationOutcomeError(Exception):
@@ -22,10 +20,12 @@ class OperationOutcomeError(Exception):
         expression: Optional[list[str]] = None,
         status_code: str = "400",
     ):
-        self.operation_outcome = OperationOutcome(
+        from nrlf.producer.fhir.r4 import model as producer_model
+
+        self.operation_outcome = producer_model.OperationOutcome(
             resourceType="OperationOutcome",
             issue=[
-                OperationOutcomeIssue(
+                producer_model.OperationOutcomeIssue(
                     severity=severity,
                     code=code,
                     details=details,  # type: ignore
@@ -40,7 +40,7 @@ class OperationOutcomeError(Exception):
     def response(self) -> Response:
         return Response(
             statusCode=self.status_code,
-            body=self.operation_outcome.json(exclude_none=True, indent=2),
+            body=self.operation_outcome.json(exclude_none=True, **json_format()),
         )
 
 
@@ -54,6 +54,8 @@ class ParseError(Exception):
     def from_validation_error(
         cls, exc: ValidationError, details: CodeableConcept, msg: str = ""
     ):
+        from nrlf.producer.fhir.r4 import model as producer_model
+
         issues = [
             producer_model.OperationOutcomeIssue(
                 severity="error",
@@ -69,10 +71,12 @@ class ParseError(Exception):
 
     @property
     def response(self):
+        from nrlf.producer.fhir.r4 import model as producer_model
+
         return Response(
             statusCode="400",
             body=producer_model.OperationOutcome(
                 resourceType="OperationOutcome",
                 issue=self.issues,
-            ).json(exclude_none=True, indent=2),
+            ).json(exclude_none=True, **json_format()),
         )
@@ -34,6 +34,8 @@ class LogReference(Enum):
     )
     HANDLER016 = _Reference("INFO", "Set response headers")
     HANDLER017 = _Reference("WARN", "Correlation ID not found in request headers")
+    HANDLER018 = _Reference("INFO", "Sampled request for debug logging")
+    HANDLER019 = _Reference("INFO", "Recorded request timings")
     HANDLER999 = _Reference("INFO", "Request handler returned successfully")
 
     # Error Logs
@@ -61,6 +63,11 @@ class LogReference(Enum):
         "EXCEPTION",
         "An error occurred whilst pasrsing embedded permissions files from S3",
     )
+    S3PERMISSIONS006 = _Reference("DEBUG", "Using cached pointer types")
+    S3PERMISSIONS007 = _Reference(
+        "INFO", "Cached pointer types have not been modified in S3"
+    )
+    S3PERMISSIONS008 = _Reference("INFO", "Loaded compiled permissions index")
 
     # Parse Logs
     PARSE000 = _Reference("DEBUG", "Attempting to parse data against model")
@@ -125,6 +132,36 @@ class LogReference(Enum):
     REPOSITORY028 = _Reference("INFO", "Received page of search results")
     REPOSITORY028a = _Reference("DEBUG", "Received page of search results with result")
     REPOSITORY029a = _Reference("DEBUG", "Updated item with result")
+    REPOSITORY030 = _Reference("INFO", "Performing paginated DynamoDB query")
+    REPOSITORY031 = _Reference("INFO", "Paginated query returned a page of results")
+    REPOSITORY032 = _Reference("DEBUG", "Planned patient queries for pointer types")
+    REPOSITORY033 = _Reference("DEBUG", "Running patient queries concurrently")
+    REPOSITORY034 = _Reference("INFO", "Performing DynamoDB batch get")
+    REPOSITORY035 = _Reference("INFO", "Successfully retrieved items from DynamoDB")
+    REPOSITORY036 = _Reference(
+        "WARN", "Retrying unprocessed keys from DynamoDB batch get"
+    )
+    REPOSITORY037 = _Reference(
+        "ERROR", "DynamoDB batch get did not process all keys after retrying"
+    )
+    REPOSITORY038 = _Reference("INFO", "Superseding items in a DynamoDB transaction")
+    REPOSITORY039 = _Reference("INFO", "Successfully wrote transaction to DynamoDB")
+    REPOSITORY040 = _Reference(
+        "WARN", "Supersede transaction cancelled as a superseded item does not exist"
+    )
+    REPOSITORY041 = _Reference("EXCEPTION", "Failed to write transaction to DynamoDB")
+    REPOSITORY042 = _Reference("INFO", "Creating batch of items in DynamoDB")
+    REPOSITORY043 = _Reference(
+        "INFO", "Successfully created batch of items in DynamoDB"
+    )
+    REPOSITORY044 = _Reference("INFO", "Creating items in a DynamoDB transaction")
+
+    # Pagination logs
+    PAGINATION001 = _Reference("WARN", "Unable to decode the provided page token")
+    PAGINATION002 = _Reference(
+        "WARN", "Provided page token does not match the search criteria"
+    )
+    PAGINATION003 = _Reference("DEBUG", "Created next page link for search results")
 
     # Model logs
     DOCPOINTER001 = _Reference("DEBUG", "Extracting custodian suffix from custodian")
@@ -137,6 +174,9 @@ class LogReference(Enum):
     DOCPOINTER006 = _Reference(
         "EXCEPTION", "Unsupported system defined for document reference"
     )
+    DOCPOINTER007 = _Reference(
+        "DEBUG", "Rendered canonical JSON for DocumentReference resource"
+    )
 
     # Consumer - CountDocumentReference
     CONCOUNT000 = _Reference(
@@ -175,12 +215,13 @@ class LogReference(Enum):
         "INFO", "Invalid document type provided in the query parameters"
     )
     CONSEARCH003 = _Reference("DEBUG", "Performing search by NHS number")
-    CONSEARCH004 = _Reference(
-        "DEBUG", "Parsed DocumentReference and added to search results"
-    )
+    CONSEARCH004 = _Reference("DEBUG", "Added DocumentReference to search results")
     CONSEARCH005 = _Reference(
         "EXCEPTION", "The DocumentReference resource could not be parsed"
     )
+    CONSEARCH006 = _Reference(
+        "WARN", "Search pagination is disabled as no page token secret is configured"
+    )
     CONSEARCH999 = _Reference(
         "INFO", "Successfully completed consumer searchDocumentReference"
     )
@@ -196,12 +237,14 @@ class LogReference(Enum):
         "INFO", "Invalid document type provided in the request body"
     )
     CONPOSTSEARCH003 = _Reference("DEBUG", "Performing search by NHS number")
-    CONPOSTSEARCH004 = _Reference(
-        "DEBUG", "Parsed DocumentReference and added to search results"
-    )
+    CONPOSTSEARCH004 = _Reference("DEBUG", "Added DocumentReference to search results")
     CONPOSTSEARCH005 = _Reference(
         "EXCEPTION", "The DocumentReference resource could not be parsed"
     )
+    CONPOSTSEARCH006 = _Reference(
+        "WARN",
+        "POST search pagination is disabled as no page token secret is configured",
+    )
     CONPOSTSEARCH999 = _Reference(
         "INFO", "Successfully completed consumer searchPostDocumentReference"
     )
@@ -310,6 +353,23 @@ class LogReference(Enum):
         "INFO", "Successfully completed producer upsertDocumentReference"
     )
 
+    # Producer - ProcessTransaction
+    PROTRANS000 = _Reference("INFO", "Starting to process producer processTransaction")
+    PROTRANS001 = _Reference("WARN", "Bundle type is not batch or transaction")
+    PROTRANS002 = _Reference("WARN", "Bundle contains too many entries")
+    PROTRANS002a = _Reference("WARN", "Transaction Bundle contains no entries")
+    PROTRANS003 = _Reference(
+        "WARN", "Bundle entry is not a request to create a DocumentReference"
+    )
+    PROTRANS004 = _Reference("WARN", "Bundle entry failed validation")
+    PROTRANS005 = _Reference(
+        "WARN", "Transaction Bundle rejected as an entry failed validation"
+    )
+    PROTRANS006 = _Reference("INFO", "Creating document references from Bundle")
+    PROTRANS999 = _Reference(
+        "INFO", "Successfully completed producer processTransaction"
+    )
+
     # Producer - DeleteDocumentReference
     PRODELETE000 = _Reference(
         "INFO", "Starting to process producer deleteDocumentReference"
@@ -350,11 +410,10 @@ class LogReference(Enum):
         "INFO", "Invalid document type provided in the query parameters"
     )
     PROSEARCH003 = _Reference("DEBUG", "Performing search by custodian")
-    PROSEARCH004 = _Reference(
-        "DEBUG", "Parsed DocumentReference and added to search results"
-    )
+    PROSEARCH004 = _Reference("DEBUG", "Added DocumentReference to search results")
     PROSEARCH005 = _Reference(
-        "EXCEPTION", "The DocumentReference esource could not be parsed"
+        "EXCEPTION",
+        "The DocumentReference resource could not be parsed in the producer search",
     )
     PROSEARCH999 = _Reference(
         "INFO", "Successfully completed producer searchDocumentReference"
@@ -371,9 +430,7 @@ class LogReference(Enum):
         "INFO", "Invalid document type provided in the request body"
     )
     PROPOSTSEARCH003 = _Reference("DEBUG", "Performing search by custodian")
-    PROPOSTSEARCH004 = _Reference(
-        "DEBUG", "Parsed DocumentReference and added to search results"
-    )
+    PROPOSTSEARCH004 = _Reference("DEBUG", "Added DocumentReference to search results")
     PROPOSTSEARCH005 = _Reference(
         "EXCEPTION", "The DocumentReference resource could not be parsed"
     )
@@ -415,3 +472,10 @@ class LogReference(Enum):
     STATUS002 = _Reference("DEBUG", "Checking database connection")
     STATUS003 = _Reference("EXCEPTION", "An error occurred during the status check")
     STATUS999 = _Reference("INFO", "Successfully completed consumer status")
+
+    # Metrics Logs
+    METRICS001 = _Reference("DEBUG", "Emitting consumed capacity metrics")
+    METRICS002 = _Reference("DEBUG", "Emitting request metrics")
+    METRICS003 = _Reference(
+        "EXCEPTION", "An error occurred whilst emitting request metrics"
+    )
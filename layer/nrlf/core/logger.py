@@ -1,5 +1,10 @@
+import hashlib
+import logging
 import os
 from datetime import datetime
+from functools import partial
+from types import FunctionType, MethodType
+from typing import Optional
 
 from aws_lambda_powertools import Logger as PowertoolsLogger
 from aws_lambda_powertools.logging.formatter import LambdaPowertoolsFormatter
@@ -29,8 +34,79 @@ class SplunkFormatter(LambdaPowertoolsFormatter):
         )
 
 
+_LOG_LEVELS = {
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARN": logging.WARNING,
+    "ERROR": logging.ERROR,
+    "CRITICAL": logging.CRITICAL,
+    "EXCEPTION": logging.ERROR,
+}
+
+_LAZY_VALUE_TYPES = (FunctionType, MethodType, partial)
+
+DEBUG_LOG_SAMPLE_RATE_ENV = "DEBUG_LOG_SAMPLE_RATE"
+DEBUG_LOG_CORRELATION_IDS_ENV = "DEBUG_LOG_CORRELATION_IDS"
+
+
+def is_debug_sampled(correlation_id: str, sample_rate: float) -> bool:
+    """
+    Deterministically decide whether a request should be logged at DEBUG, so
+    that every log line for the same correlation ID is sampled the same way
+    """
+    if sample_rate <= 0:
+        return False
+
+    digest = hashlib.sha256(correlation_id.encode()).digest()
+    return int.from_bytes(digest[:8], "big") / 2**64 < sample_rate
+
+
 class Logger(PowertoolsLogger):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._default_log_level = self._logger.level
+
+    def setLevel(self, level):
+        super().setLevel(level)
+        self._default_log_level = self._logger.level
+
+    def sample_debug_logging(self, correlation_id: Optional[str]) -> bool:
+        """
+        Log the current request at DEBUG if its correlation ID is in the
+        DEBUG_LOG_CORRELATION_IDS allow-list or is sampled at the
+        DEBUG_LOG_SAMPLE_RATE. Otherwise, log at the default level.
+        """
+        debug = False
+        if correlation_id:
+            allowed_ids = os.getenv(DEBUG_LOG_CORRELATION_IDS_ENV, "").split(",")
+            sample_rate = float(os.getenv(DEBUG_LOG_SAMPLE_RATE_ENV) or 0)
+            debug = correlation_id in allowed_ids or is_debug_sampled(
+                correlation_id, sample_rate
+            )
+
+        self._logger.setLevel(logging.DEBUG if debug else self._default_log_level)
+        return debug
+
+    def isEnabledFor(self, code: LogReference) -> bool:
+        """
+        Check whether the log reference would be emitted at the current level
+        """
+        return self._logger.isEnabledFor(_LOG_LEVELS[code.value.level])
+
     def log(self, code: LogReference, **kwargs):
+        """
+        Log the message for the log reference. Nothing is done if the level of
+        the reference is not enabled, and any values that are functions (e.g.
+        lambda: model.dict()) are only called when the message is emitted, so
+        that expensive payloads are not built for discarded messages.
+        """
+        if not self.isEnabledFor(code):
+            return
+
+        kwargs = {
+            key: value() if isinstance(value, _LAZY_VALUE_TYPES) else value
+            for key, value in kwargs.items()
+        }
         kwargs["log_reference"] = code.name
         match code.value.level:
             case "DEBUG":
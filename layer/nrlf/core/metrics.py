@@ -0,0 +1,120 @@
+import os
+from typing import Any, Dict, Optional
+
+from aws_lambda_powertools.metrics import EphemeralMetrics, MetricUnit
+
+from nrlf.core.logger import LogReference, logger
+from nrlf.core.model import ConnectionMetadata
+
+METRICS_NAMESPACE_ENV = "METRICS_NAMESPACE"
+DEFAULT_METRICS_NAMESPACE = "NRLF"
+
+
+def create_metrics(dimensions: Dict[str, Optional[str]]) -> EphemeralMetrics:
+    """
+    Create a set of CloudWatch Embedded Metric Format metrics with the given
+    dimensions. Dimensions without a value are left out.
+    """
+    metrics = EphemeralMetrics(
+        namespace=os.getenv(METRICS_NAMESPACE_ENV, DEFAULT_METRICS_NAMESPACE)
+    )
+    for name, value in dimensions.items():
+        if value:
+            metrics.add_dimension(name=name, value=value)
+    return metrics
+
+
+def organisation_dimensions(metadata: ConnectionMetadata) -> Dict[str, Optional[str]]:
+    """
+    Get the metric dimensions that identify the requesting organisation
+    """
+    return {
+        "OdsCode": ".".join(metadata.ods_code_parts),
+        "AppId": metadata.nrl_app_id,
+    }
+
+
+def emit_consumed_capacity(metadata: ConnectionMetadata, timings: Dict[str, Any]):
+    """
+    Emit the DynamoDB capacity consumed by the request, so that the cost of
+    each organisation's requests can be attributed
+    """
+    read_units = timings.get("read_capacity_units", 0.0)
+    write_units = timings.get("write_capacity_units", 0.0)
+    if not read_units and not write_units:
+        return
+
+    logger.log(
+        LogReference.METRICS001,
+        read_capacity_units=read_units,
+        write_capacity_units=write_units,
+    )
+
+    metrics = create_metrics(organisation_dimensions(metadata))
+    metrics.add_metric(
+        name="ReadCapacityUnits", unit=MetricUnit.Count, value=read_units
+    )
+    metrics.add_metric(
+        name="WriteCapacityUnits", unit=MetricUnit.Count, value=write_units
+    )
+    metrics.flush_metrics()
+
+
+class RequestMetrics:
+    """
+    Collects the dimensions of the current request as it is handled, so that
+    its latency and throughput metrics can be emitted once the final response
+    is known
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.dimensions: Dict[str, Optional[str]] = {}
+        self.result_count: Optional[int] = None
+
+    def set_dimensions(self, **dimensions: Optional[str]):
+        self.dimensions.update(dimensions)
+
+    def emit(self, status_code: str, body: Optional[str], duration_ms: float):
+        """
+        Emit the latency and throughput metrics for the request
+        """
+        response_bytes = len(body.encode()) if body else 0
+        logger.log(
+            LogReference.METRICS002,
+            dimensions=self.dimensions,
+            status_code=status_code,
+            duration_ms=duration_ms,
+            result_count=self.result_count,
+            response_bytes=response_bytes,
+        )
+
+        metrics = create_metrics(self.dimensions)
+        metrics.add_metadata(key="StatusCode", value=status_code)
+        metrics.add_metric(name="Requests", unit=MetricUnit.Count, value=1)
+        metrics.add_metric(
+            name="Duration", unit=MetricUnit.Milliseconds, value=duration_ms
+        )
+        metrics.add_metric(
+            name="ResponseBytes", unit=MetricUnit.Bytes, value=response_bytes
+        )
+        metrics.add_metric(
+            name="ClientErrors",
+            unit=MetricUnit.Count,
+            value=int(status_code.startswith("4")),
+        )
+        metrics.add_metric(
+            name="ServerErrors",
+            unit=MetricUnit.Count,
+            value=int(status_code.startswith("5")),
+        )
+        if self.result_count is not None:
+            metrics.add_metric(
+                name="ResultCount", unit=MetricUnit.Count, value=self.result_count
+            )
+        metrics.flush_metrics()
+
+
+request_metrics = RequestMetrics()
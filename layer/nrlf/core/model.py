@@ -4,7 +4,6 @@ from nhs_number import is_valid as is_valid_nhs_number
 from pydantic import BaseModel, Extra, Field, StrictStr
 
 import nrlf.consumer.fhir.r4.model as consumer_model
-import nrlf.producer.fhir.r4.model as producer_model
 
 
 class _NhsNumberMixin:
@@ -21,10 +20,6 @@ class _NhsNumberMixin:
         return nhs_number
 
 
-class ProducerRequestParams(producer_model.RequestParams, _NhsNumberMixin):
-    pass
-
-
 class ConsumerRequestParams(consumer_model.RequestParams, _NhsNumberMixin):
     class Config:
         extra = Extra.forbid
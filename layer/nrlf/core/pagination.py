@@ -0,0 +1,136 @@
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+from typing import Any, Dict, List, Optional
+
+from nrlf.consumer.fhir.r4.model import NextPageToken
+from nrlf.core.codes import SpineErrorConcept
+from nrlf.core.dynamodb.model import DBPrefix
+from nrlf.core.errors import OperationOutcomeError
+from nrlf.core.logger import LogReference, logger
+
+PAGE_TOKEN_SEPARATOR = "."
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _sign(payload: str, secret: str) -> bytes:
+    return hmac.new(secret.encode(), payload.encode(), hashlib.sha256).digest()
+
+
+def encode_page_token(data: Dict[str, Any], secret: str) -> str:
+    """
+    Encode a search cursor into an opaque, signed page token
+    """
+    payload = _b64encode(
+        json.dumps(data, separators=(",", ":"), sort_keys=True).encode()
+    )
+    signature = _b64encode(_sign(payload, secret))
+    return PAGE_TOKEN_SEPARATOR.join([payload, signature])
+
+
+def decode_page_token(token: str, secret: str) -> Dict[str, Any]:
+    """
+    Decode and verify a page token created by encode_page_token
+    """
+    payload, _, signature = token.partition(PAGE_TOKEN_SEPARATOR)
+    if not payload or not signature:
+        raise ValueError("Page token is not correctly formed")
+
+    try:
+        provided_signature = _b64decode(signature)
+    except (binascii.Error, ValueError):
+        raise ValueError("Page token signature could not be decoded") from None
+
+    if not hmac.compare_digest(_sign(payload, secret), provided_signature):
+        raise ValueError("Page token signature is invalid")
+
+    try:
+        data = json.loads(_b64decode(payload))
+    except (binascii.Error, ValueError):
+        raise ValueError("Page token payload could not be decoded") from None
+
+    if not isinstance(data, dict):
+        raise ValueError("Page token payload is not correctly formed")
+
+    return data
+
+
+def search_filters(
+    pointer_types: Optional[List[str]],
+    custodian: Optional[str] = None,
+    custodian_suffix: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Get the search filters that a page token is signed for. A token can only
+    continue a search with the same filters, as the key it holds would skip
+    results that only match the new filters.
+    """
+    return {
+        "pointer_types": sorted(pointer_types or []),
+        "custodian": custodian,
+        "custodian_suffix": custodian_suffix,
+    }
+
+
+def get_start_key(
+    next_page_token: Optional[NextPageToken],
+    nhs_number: str,
+    filters: Dict[str, Any],
+    secret: str,
+) -> Optional[Dict[str, Any]]:
+    """
+    Get the DynamoDB ExclusiveStartKey for a search from the provided page token
+    """
+    if not next_page_token:
+        return None
+
+    try:
+        data = decode_page_token(next_page_token.__root__, secret)
+    except ValueError as exc:
+        logger.log(LogReference.PAGINATION001, error=str(exc))
+        raise _invalid_page_token_error() from None
+
+    start_key = data.get("key")
+    if not isinstance(start_key, dict):
+        logger.log(
+            LogReference.PAGINATION001, error="Page token key is not correctly formed"
+        )
+        raise _invalid_page_token_error()
+
+    patient_key = "#".join([DBPrefix.Patient.value, nhs_number])
+    if start_key.get("patient_key") != patient_key or data.get("filters") != filters:
+        logger.log(LogReference.PAGINATION002)
+        raise _invalid_page_token_error()
+
+    return start_key
+
+
+def create_next_link(
+    self_link: str, next_key: Dict[str, Any], filters: Dict[str, Any], secret: str
+) -> dict:
+    """
+    Create the Bundle 'next' link used to retrieve the following page of results
+    """
+    next_page_token = encode_page_token({"key": next_key, "filters": filters}, secret)
+    logger.log(LogReference.PAGINATION003)
+    return {"relation": "next", "url": f"{self_link}&next-page-token={next_page_token}"}
+
+
+def _invalid_page_token_error() -> OperationOutcomeError:
+    return OperationOutcomeError(
+        status_code="400",
+        severity="error",
+        code="invalid",
+        details=SpineErrorConcept.from_code("INVALID_PARAMETER"),
+        diagnostics="Invalid next-page-token (The provided token is not valid for this search)",
+        expression=["next-page-token"],
+    )
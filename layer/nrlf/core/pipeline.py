@@ -0,0 +1,73 @@
+import json
+from typing import Any, Dict, Optional, Union
+
+from nrlf.core.dynamodb.model import DocumentPointer
+from nrlf.core.logger import LogReference, logger
+from nrlf.core.timing import recorder
+from nrlf.core.validators import DocumentReferenceValidator, ValidationResult
+from nrlf.producer.fhir.r4.model import DocumentReference
+
+
+class DocumentReferencePipeline:
+    """
+    Carries a DocumentReference through the write path, so that it is parsed,
+    validated and rendered to its canonical JSON once each.
+
+    The canonical JSON is the same as resource.json(exclude_none=True). It is
+    rendered once the server fields have been set, and reused for the stored
+    document.
+    """
+
+    def __init__(
+        self,
+        resource: DocumentReference,
+        data: Optional[Dict[str, Any]] = None,
+    ):
+        self.resource = resource
+        self.data = data
+        self.result: Optional[ValidationResult] = None
+        self._document: Optional[str] = None
+
+    @classmethod
+    def from_raw(cls, raw: Union[str, bytes]) -> "DocumentReferencePipeline":
+        """
+        Parse a DocumentReference from raw JSON. As with validating a dict,
+        fields that are not in the model are rejected rather than ignored.
+        """
+        data = json.loads(raw)
+        resource = DocumentReferenceValidator.parse(data)
+        return cls(resource, data=data)
+
+    def validate(self) -> ValidationResult:
+        """
+        Validate the DocumentReference, returning the same result if it has
+        already been validated
+        """
+        if self.result is None:
+            validator = DocumentReferenceValidator()
+            if self.data is not None:
+                self.result = validator.validate(self.data, resource=self.resource)
+            else:
+                self.result = validator.validate(self.resource)
+        return self.result
+
+    @property
+    def document(self) -> str:
+        """
+        The canonical JSON of the DocumentReference, rendered when first needed
+        """
+        if self._document is None:
+            with recorder.span("render_document"):
+                logger.log(LogReference.DOCPOINTER007)
+                self._document = self.resource.json(exclude_none=True)
+        return self._document
+
+    def to_pointer(self, created_on: Optional[str] = None) -> DocumentPointer:
+        """
+        Create the DocumentPointer for the DocumentReference, reusing the
+        canonical JSON. The server fields must be set before this is called.
+        """
+        self._document = None
+        return DocumentPointer.from_document_reference(
+            self.resource, created_on=created_on, document=self.document
+        )
@@ -57,7 +57,7 @@ def parse_params(
 
     try:
         result = model.parse_obj(query_string_params or {})
-        logger.log(LogReference.HANDLER007, parsed_params=result.dict())
+        logger.log(LogReference.HANDLER007, parsed_params=result.dict)
         return result
 
     except ValidationError as exc:
@@ -88,7 +88,7 @@ def parse_body(
 
     try:
         result = model.parse_raw(body)
-        logger.log(LogReference.HANDLER009, parsed_body=result.dict())
+        logger.log(LogReference.HANDLER009, parsed_body=result.dict)
         return result
 
     except ValidationError as exc:
@@ -114,7 +114,7 @@ def parse_path(
 
     try:
         result = model.parse_obj(path_params or {})
-        logger.log(LogReference.HANDLER011, parsed_path=result.dict())
+        logger.log(LogReference.HANDLER011, parsed_path=result.dict)
         return result
 
     except ValidationError as exc:
@@ -1,12 +1,67 @@
 # ruff: noqa: N803, N815
 
-from typing import List
+import functools
+import json
+import os
+from typing import Any, Dict, List, Optional, Sequence, Type
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
-from nrlf.core.codes import NRLResponseConcept, SpineErrorConcept
+from nrlf.core.codes import NRLResponseConcept, SpineErrorConcept, _CodeableConcept
 from nrlf.core.constants import PRODUCER_URL_PATH
-from nrlf.producer.fhir.r4 import model as producer_model
+
+COMPACT_JSON_RESPONSES_ENV = "COMPACT_JSON_RESPONSES"
+OPERATION_OUTCOME_CACHE_SIZE = 256
+
+
+def compact_json_enabled() -> bool:
+    return os.getenv(COMPACT_JSON_RESPONSES_ENV, "false").lower() == "true"
+
+
+def json_format(compact: Optional[bool] = None) -> Dict[str, Any]:
+    """
+    Get the json.dumps arguments used to render response bodies. Bodies are
+    indented unless compact JSON responses are enabled.
+    """
+    if compact is None:
+        compact = compact_json_enabled()
+    if compact:
+        return {"separators": (",", ":")}
+    return {"indent": 2}
+
+
+@functools.lru_cache(maxsize=OPERATION_OUTCOME_CACHE_SIZE)
+def render_operation_outcome(  # noqa: PLR0913
+    severity: str,
+    code: str,
+    concept: Type[_CodeableConcept],
+    concept_code: str,
+    diagnostics: Optional[str] = None,
+    expression: Optional[str] = None,
+    compact: bool = False,
+) -> str:
+    """
+    Render an OperationOutcome with a single issue. Most responses are built
+    from a small set of codes and diagnostics, so the rendered JSON is cached.
+    """
+    from nrlf.producer.fhir.r4 import model as producer_model
+
+    return producer_model.OperationOutcome(
+        resourceType="OperationOutcome",
+        issue=[
+            producer_model.OperationOutcomeIssue(
+                severity=severity,
+                code=code,
+                details=concept.from_code(concept_code),
+                diagnostics=diagnostics,
+                expression=(
+                    [producer_model.ExpressionItem(__root__=expression)]
+                    if expression
+                    else None
+                ),
+            )
+        ],
+    ).json(exclude_none=True, **json_format(compact))
 
 
 class Response(BaseModel):
@@ -19,27 +74,98 @@ class Response(BaseModel):
     headers: dict = Field(default_factory=dict)
     isBase64Encoded: bool = Field(default=False)
 
+    # The number of resources returned, used for metrics only
+    _result_count: Optional[int] = PrivateAttr(default=None)
+
+    @property
+    def result_count(self) -> Optional[int]:
+        return self._result_count
+
     @classmethod
     def from_resource(cls, resource: BaseModel, **kwargs) -> "Response":
         status_code = kwargs.pop("statusCode", "200")
-        return cls(
+        response = cls(
             statusCode=status_code,
-            body=resource.json(indent=2, exclude_none=True, exclude_defaults=True),
+            body=resource.json(
+                exclude_none=True, exclude_defaults=True, **json_format()
+            ),
             **kwargs,
         )
+        response._result_count = getattr(resource, "total", 1)
+        return response
+
+    @classmethod
+    def from_search_results(
+        cls,
+        documents: Sequence[str],
+        links: Optional[List[dict]] = None,
+        paged: bool = False,
+        **kwargs,
+    ) -> "Response":
+        """
+        Create a searchset Bundle response from stored DocumentReference JSON.
+
+        The documents are validated when they are written, so they are spliced
+        into the Bundle as-is rather than being parsed and re-serialised. The
+        envelope is rendered in the same single-line format as the stored
+        documents, whether or not compact JSON responses are enabled, so the
+        whole body has one format. The total is the number of matches, which
+        is only known when the Bundle holds all of them, so it is left out of
+        paged results.
+        """
+        status_code = kwargs.pop("statusCode", "200")
+        envelope = {"resourceType": "Bundle", "type": "searchset"}
+        if links is not None:
+            envelope["link"] = links
+        if not paged:
+            envelope["total"] = len(documents)
+
+        entries = ", ".join(f'{{"resource": {document}}}' for document in documents)
+        body = f'{json.dumps(envelope)[:-1]}, "entry": [{entries}]}}'
+        response = cls(statusCode=status_code, body=body, **kwargs)
+        response._result_count = len(documents)
+        return response
 
     @classmethod
     def from_issues(cls, issues: List[BaseModel], **kwargs) -> "Response":
+        from nrlf.producer.fhir.r4 import model as producer_model
+
         return cls(
             body=producer_model.OperationOutcome(
                 resourceType="OperationOutcome",
                 issue=issues,  # type: ignore
-            ).json(exclude_none=True, indent=2),
+            ).json(exclude_none=True, **json_format()),
+            **kwargs,
+        )
+
+    @classmethod
+    def from_issue(  # noqa: PLR0913
+        cls,
+        severity: str,
+        code: str,
+        concept: Type[_CodeableConcept],
+        concept_code: str,
+        diagnostics: Optional[str] = None,
+        expression: Optional[str] = None,
+        **kwargs,
+    ) -> "Response":
+        return cls(
+            body=render_operation_outcome(
+                severity,
+                code,
+                concept,
+                concept_code,
+                diagnostics,
+                expression,
+                compact_json_enabled(),
+            ),
             **kwargs,
         )
 
     @classmethod
     def from_exception(cls, exc: Exception) -> "Response":
+        from nrlf.producer.fhir.r4 import model as producer_model
+
         return cls(
             statusCode="500",
             body=producer_model.OperationOutcome(
@@ -52,66 +178,54 @@ class Response(BaseModel):
                         details=SpineErrorConcept.from_code("INTERNAL_SERVER_ERROR"),
                     )
                 ],
-            ).json(exclude_none=True, indent=2),
+            ).json(exclude_none=True, **json_format()),
         )
 
 
 class NRLResponse(Response):
     @classmethod
     def RESOURCE_CREATED(cls, resource_id: str):
-        return cls.from_issues(
-            issues=[
-                producer_model.OperationOutcomeIssue(
-                    severity="information",
-                    code="informational",
-                    details=NRLResponseConcept.from_code("RESOURCE_CREATED"),
-                    diagnostics="The document has been created",
-                )
-            ],
+        return cls.from_issue(
+            severity="information",
+            code="informational",
+            concept=NRLResponseConcept,
+            concept_code="RESOURCE_CREATED",
+            diagnostics="The document has been created",
             statusCode="201",
             headers={"Location": f"{PRODUCER_URL_PATH}/{resource_id}"},
         )
 
     @classmethod
     def RESOURCE_SUPERSEDED(cls, resource_id: str):
-        return cls.from_issues(
-            issues=[
-                producer_model.OperationOutcomeIssue(
-                    severity="information",
-                    code="informational",
-                    details=NRLResponseConcept.from_code("RESOURCE_SUPERSEDED"),
-                    diagnostics="The document has been superseded by a new version",
-                )
-            ],
+        return cls.from_issue(
+            severity="information",
+            code="informational",
+            concept=NRLResponseConcept,
+            concept_code="RESOURCE_SUPERSEDED",
+            diagnostics="The document has been superseded by a new version",
             statusCode="201",
             headers={"Location": f"{PRODUCER_URL_PATH}/{resource_id}"},
         )
 
     @classmethod
     def RESOURCE_UPDATED(cls):
-        return cls.from_issues(
-            issues=[
-                producer_model.OperationOutcomeIssue(
-                    severity="information",
-                    code="informational",
-                    details=NRLResponseConcept.from_code("RESOURCE_UPDATED"),
-                    diagnostics="The DocumentReference has been updated",
-                )
-            ],
+        return cls.from_issue(
+            severity="information",
+            code="informational",
+            concept=NRLResponseConcept,
+            concept_code="RESOURCE_UPDATED",
+            diagnostics="The DocumentReference has been updated",
             statusCode="200",
         )
 
     @classmethod
     def RESOURCE_DELETED(cls):
-        return cls.from_issues(
-            issues=[
-                producer_model.OperationOutcomeIssue(
-                    severity="information",
-                    code="informational",
-                    details=NRLResponseConcept.from_code("RESOURCE_DELETED"),
-                    diagnostics="The requested DocumentReference has been deleted",
-                )
-            ],
+        return cls.from_issue(
+            severity="information",
+            code="informational",
+            concept=NRLResponseConcept,
+            concept_code="RESOURCE_DELETED",
+            diagnostics="The requested DocumentReference has been deleted",
             statusCode="200",
         )
 
@@ -121,29 +235,23 @@ class SpineErrorResponse(Response):
     def NO_RECORD_FOUND(
         cls, diagnostics: str = "The requested resource could not be found"
     ) -> "Response":
-        return cls.from_issues(
-            issues=[
-                producer_model.OperationOutcomeIssue(
-                    severity="error",
-                    code="not-found",
-                    details=SpineErrorConcept.from_code("NO_RECORD_FOUND"),
-                    diagnostics=diagnostics,
-                )
-            ],
+        return cls.from_issue(
+            severity="error",
+            code="not-found",
+            concept=SpineErrorConcept,
+            concept_code="NO_RECORD_FOUND",
+            diagnostics=diagnostics,
             statusCode="404",
         )
 
     @classmethod
     def ACCESS_DENIED(cls, diagnostics: str = "Access denied") -> "Response":
-        return cls.from_issues(
-            issues=[
-                producer_model.OperationOutcomeIssue(
-                    severity="error",
-                    code="forbidden",
-                    details=SpineErrorConcept.from_code("ACCESS DENIED"),
-                    diagnostics=diagnostics,
-                )
-            ],
+        return cls.from_issue(
+            severity="error",
+            code="forbidden",
+            concept=SpineErrorConcept,
+            concept_code="ACCESS DENIED",
+            diagnostics=diagnostics,
             statusCode="403",
         )
 
@@ -153,20 +261,13 @@ class SpineErrorResponse(Response):
         diagnostics: str = "Invalid identifier value",
         expression: str | None = None,
     ):
-        return cls.from_issues(
-            issues=[
-                producer_model.OperationOutcomeIssue(
-                    severity="error",
-                    code="invalid",
-                    details=SpineErrorConcept.from_code("INVALID_IDENTIFIER_VALUE"),
-                    diagnostics=diagnostics,
-                    expression=(
-                        [producer_model.ExpressionItem(__root__=expression)]
-                        if expression
-                        else None
-                    ),
-                )
-            ],
+        return cls.from_issue(
+            severity="error",
+            code="invalid",
+            concept=SpineErrorConcept,
+            concept_code="INVALID_IDENTIFIER_VALUE",
+            diagnostics=diagnostics,
+            expression=expression,
             statusCode="400",
         )
 
@@ -174,20 +275,13 @@ class SpineErrorResponse(Response):
     def INVALID_NHS_NUMBER(
         cls, diagnostics: str = "Invalid NHS number", expression: str | None = None
     ) -> "Response":
-        return cls.from_issues(
-            issues=[
-                producer_model.OperationOutcomeIssue(
-                    severity="error",
-                    code="invalid",
-                    details=SpineErrorConcept.from_code("INVALID_NHS_NUMBER"),
-                    diagnostics=diagnostics,
-                    expression=(
-                        [producer_model.ExpressionItem(__root__=expression)]
-                        if expression
-                        else None
-                    ),
-                )
-            ],
+        return cls.from_issue(
+            severity="error",
+            code="invalid",
+            concept=SpineErrorConcept,
+            concept_code="INVALID_NHS_NUMBER",
+            diagnostics=diagnostics,
+            expression=expression,
             statusCode="400",
         )
 
@@ -195,20 +289,13 @@ class SpineErrorResponse(Response):
     def INVALID_CODE_SYSTEM(
         cls, diagnostics: str = "Invalid code system", expression: str | None = None
     ) -> "Response":
-        return cls.from_issues(
-            issues=[
-                producer_model.OperationOutcomeIssue(
-                    severity="error",
-                    code="code-invalid",
-                    details=SpineErrorConcept.from_code("INVALID_CODE_SYSTEM"),
-                    diagnostics=diagnostics,
-                    expression=(
-                        [producer_model.ExpressionItem(__root__=expression)]
-                        if expression
-                        else None
-                    ),
-                )
-            ],
+        return cls.from_issue(
+            severity="error",
+            code="code-invalid",
+            concept=SpineErrorConcept,
+            concept_code="INVALID_CODE_SYSTEM",
+            diagnostics=diagnostics,
+            expression=expression,
             statusCode="400",
         )
 
@@ -216,20 +303,13 @@ class SpineErrorResponse(Response):
     def BAD_REQUEST(
         cls, diagnostics: str = "Bad request", expression: str | None = None
     ) -> "Response":
-        return cls.from_issues(
-            issues=[
-                producer_model.OperationOutcomeIssue(
-                    severity="error",
-                    code="invalid",
-                    details=SpineErrorConcept.from_code("BAD_REQUEST"),
-                    diagnostics=diagnostics,
-                    expression=(
-                        [producer_model.ExpressionItem(__root__=expression)]
-                        if expression
-                        else None
-                    ),
-                )
-            ],
+        return cls.from_issue(
+            severity="error",
+            code="invalid",
+            concept=SpineErrorConcept,
+            concept_code="BAD_REQUEST",
+            diagnostics=diagnostics,
+            expression=expression,
             statusCode="400",
         )
 
@@ -237,19 +317,12 @@ class SpineErrorResponse(Response):
     def AUTHOR_CREDENTIALS_ERROR(
         cls, diagnostics: str, expression: str | None = None
     ) -> "Response":
-        return cls.from_issues(
-            issues=[
-                producer_model.OperationOutcomeIssue(
-                    severity="error",
-                    code="forbidden",
-                    details=SpineErrorConcept.from_code("AUTHOR_CREDENTIALS_ERROR"),
-                    diagnostics=diagnostics,
-                    expression=(
-                        [producer_model.ExpressionItem(__root__=expression)]
-                        if expression
-                        else None
-                    ),
-                )
-            ],
+        return cls.from_issue(
+            severity="error",
+            code="forbidden",
+            concept=SpineErrorConcept,
+            concept_code="AUTHOR_CREDENTIALS_ERROR",
+            diagnostics=diagnostics,
+            expression=expression,
             statusCode="403",
         )
@@ -0,0 +1,197 @@
+import json
+from pathlib import Path
+from unittest import mock
+
+import pytest
+from moto import mock_aws
+
+from nrlf.core.authoriser import (
+    PermissionsCache,
+    build_permissions_index,
+    get_permissions_cache,
+    get_pointer_types,
+    load_permissions_index,
+    parse_permissions_file,
+    write_permissions_index,
+)
+from nrlf.core.boto import get_s3_client
+from nrlf.core.config import Config
+from nrlf.core.request import parse_headers
+from nrlf.tests.events import create_headers
+
+POINTER_TYPES = ["http://snomed.info/sct|736253002"]
+
+
+@pytest.fixture(autouse=True)
+def clear_permissions_cache():
+    get_permissions_cache(Config()).clear()
+    yield
+    get_permissions_cache(Config()).clear()
+
+
+def _create_auth_store(pointer_types=None):
+    s3_client = get_s3_client()
+    s3_client.create_bucket(
+        Bucket="auth-store",
+        CreateBucketConfiguration={"LocationConstraint": "eu-west-2"},
+    )
+    if pointer_types is not None:
+        s3_client.put_object(
+            Bucket="auth-store",
+            Key="Y05868-app-id/Y05868.json",
+            Body=json.dumps(pointer_types),
+        )
+    return s3_client
+
+
+def _metadata():
+    return parse_headers(create_headers(nrl_app_id="Y05868-app-id"))
+
+
+@mock_aws
+def test_get_pointer_types_caches_result():
+    s3_client = _create_auth_store(POINTER_TYPES)
+    config = Config()
+
+    assert get_pointer_types(_metadata(), config) == POINTER_TYPES
+
+    s3_client.delete_object(Bucket="auth-store", Key="Y05868-app-id/Y05868.json")
+
+    assert get_pointer_types(_metadata(), config) == POINTER_TYPES
+
+
+@mock_aws
+def test_get_pointer_types_caches_missing_permissions():
+    s3_client = _create_auth_store()
+    config = Config()
+
+    assert get_pointer_types(_metadata(), config) == []
+
+    s3_client.put_object(
+        Bucket="auth-store",
+        Key="Y05868-app-id/Y05868.json",
+        Body=json.dumps(POINTER_TYPES),
+    )
+
+    assert get_pointer_types(_metadata(), config) == []
+
+
+@mock_aws
+def test_get_pointer_types_revalidates_expired_entry_with_etag():
+    _create_auth_store(POINTER_TYPES)
+    config = Config(PERMISSIONS_CACHE_TTL_SECONDS=0)
+
+    assert get_pointer_types(_metadata(), config) == POINTER_TYPES
+
+    s3_client = get_s3_client()
+    with mock.patch.object(
+        s3_client, "get_object", wraps=s3_client.get_object
+    ) as mock_get_object:
+        assert get_pointer_types(_metadata(), config) == POINTER_TYPES
+
+    assert mock_get_object.call_args.kwargs["IfNoneMatch"]
+
+
+@mock_aws
+def test_get_pointer_types_refreshes_modified_entry():
+    s3_client = _create_auth_store(POINTER_TYPES)
+    config = Config(PERMISSIONS_CACHE_TTL_SECONDS=0)
+
+    assert get_pointer_types(_metadata(), config) == POINTER_TYPES
+
+    updated_pointer_types = [*POINTER_TYPES, "http://snomed.info/sct|861421000000109"]
+    s3_client.put_object(
+        Bucket="auth-store",
+        Key="Y05868-app-id/Y05868.json",
+        Body=json.dumps(updated_pointer_types),
+    )
+
+    assert get_pointer_types(_metadata(), config) == updated_pointer_types
+
+
+def test_permissions_cache_evicts_least_recently_used():
+    cache = PermissionsCache(max_size=2)
+
+    cache.set(("app", "A", None), ["a"], etag=None, ttl=60)
+    cache.set(("app", "B", None), ["b"], etag=None, ttl=60)
+    cache.get(("app", "A", None))
+    cache.set(("app", "C", None), ["c"], etag=None, ttl=60)
+
+    assert cache.get(("app", "A", None)).pointer_types == ["a"]
+    assert cache.get(("app", "B", None)) is None
+    assert cache.get(("app", "C", None)).pointer_types == ["c"]
+
+
+def test_permissions_cache_resize_evicts_least_recently_used():
+    cache = PermissionsCache(max_size=3)
+
+    cache.set(("app", "A", None), ["a"], etag=None, ttl=60)
+    cache.set(("app", "B", None), ["b"], etag=None, ttl=60)
+    cache.set(("app", "C", None), ["c"], etag=None, ttl=60)
+    cache.resize(max_size=1)
+
+    assert cache.max_size == 1
+    assert cache.get(("app", "A", None)) is None
+    assert cache.get(("app", "B", None)) is None
+    assert cache.get(("app", "C", None)).pointer_types == ["c"]
+
+
+def test_get_permissions_cache_resizes_shared_cache():
+    cache = get_permissions_cache(Config(PERMISSIONS_CACHE_MAX_SIZE=5))
+
+    assert get_permissions_cache(Config(PERMISSIONS_CACHE_MAX_SIZE=10)) is cache
+    assert cache.max_size == 10
+
+
+def _create_permissions_directory(tmp_path: Path) -> str:
+    (tmp_path / "Y05868-app-id").mkdir()
+    (tmp_path / "Y05868-app-id" / "Y05868.json").write_text(json.dumps(POINTER_TYPES))
+    (tmp_path / "Y05868-app-id" / "RX898.001.json").write_text(json.dumps([]))
+    return str(tmp_path)
+
+
+def test_build_permissions_index(tmp_path: Path):
+    permissions_directory = _create_permissions_directory(tmp_path)
+
+    assert build_permissions_index(permissions_directory) == {
+        "Y05868-app-id/RX898.001.json": [],
+        "Y05868-app-id/Y05868.json": POINTER_TYPES,
+    }
+
+
+def test_write_and_load_permissions_index(tmp_path: Path):
+    permissions_directory = _create_permissions_directory(tmp_path)
+
+    write_permissions_index(permissions_directory)
+    index = load_permissions_index(permissions_directory)
+
+    assert index == {
+        "Y05868-app-id/RX898.001.json": (),
+        "Y05868-app-id/Y05868.json": tuple(POINTER_TYPES),
+    }
+    assert "permissions_index.json" not in build_permissions_index(
+        permissions_directory
+    )
+
+
+def test_load_permissions_index_without_index_file(tmp_path: Path):
+    assert load_permissions_index(_create_permissions_directory(tmp_path)) is None
+
+
+def test_parse_permissions_file_uses_permissions_index(tmp_path: Path):
+    permissions_directory = _create_permissions_directory(tmp_path)
+    write_permissions_index(permissions_directory)
+    (tmp_path / "Y05868-app-id" / "Y05868.json").unlink()
+
+    with mock.patch(
+        "nrlf.core.authoriser.TEST_PERMISSIONS_DIRECTORY", permissions_directory
+    ):
+        assert parse_permissions_file(_metadata()) == POINTER_TYPES
+        assert (
+            parse_permissions_file(
+                parse_headers(
+                    create_headers(nrl_app_id="Y05868-app-id", ods_code="Unknown")
+                )
+            )
+            == []
+        )
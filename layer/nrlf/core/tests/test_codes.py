@@ -76,3 +76,12 @@ def test_spine_error_concept_from_code(code, expected_text):
     assert result.coding[0].system == SpineErrorConcept._SYSTEM
     assert result.coding[0].code == code
     assert result.coding[0].display == expected_text
+
+
+def test_from_code_is_cached():
+    assert SpineErrorConcept.from_code("BAD_REQUEST") is SpineErrorConcept.from_code(
+        "BAD_REQUEST"
+    )
+    assert NRLResponseConcept.from_code(
+        "RESOURCE_CREATED"
+    ) is not SpineErrorConcept.from_code("BAD_REQUEST")
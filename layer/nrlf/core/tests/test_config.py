@@ -1,9 +1,10 @@
 import os
+from unittest import mock
 
 import pytest
 from pydantic import ValidationError
 
-from nrlf.core.config import Config
+from nrlf.core.config import Config, get_config, refresh_config
 
 
 def test_config_valid():
@@ -92,3 +93,16 @@ def test_config_reads_from_env_variables():
 
     os.environ.clear()
     os.environ.update(current_env)
+
+
+def test_get_config_is_cached_until_refreshed():
+    config = get_config()
+
+    with mock.patch.dict(os.environ, {"SEARCH_PAGE_SIZE": "5"}):
+        assert get_config() is config
+        assert get_config().SEARCH_PAGE_SIZE == 20
+
+        refresh_config()
+
+        assert get_config() is not config
+        assert get_config().SEARCH_PAGE_SIZE == 5
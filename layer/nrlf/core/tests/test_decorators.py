@@ -1,4 +1,5 @@
 import json
+import os
 import warnings
 
 import pytest
@@ -17,6 +18,7 @@ from nrlf.core.constants import (
 from nrlf.core.decorators import (
     deprecated,
     error_handler,
+    get_pointer_type,
     header_handler,
     load_connection_metadata,
     logger_initialiser,
@@ -27,6 +29,8 @@ from nrlf.core.errors import OperationOutcomeError
 from nrlf.core.logger import LogReference
 from nrlf.core.request import parse_headers
 from nrlf.core.response import Response
+from nrlf.producer.fhir.r4.model import Bundle, DocumentReference, RequestParams
+from nrlf.tests.data import load_document_reference_json
 from nrlf.tests.events import (
     create_headers,
     create_mock_context,
@@ -248,6 +252,34 @@ def test_header_handler_when_response_header_checks_fail(mocker: MockerFixture):
     }
 
 
+def test_header_handler_when_request_metrics_fail(mocker: MockerFixture):
+    mocker.patch(
+        "nrlf.core.decorators.request_metrics.emit",
+        side_effect=Exception("Test exception"),
+    )
+    mock_logger = mocker.patch("nrlf.core.decorators.logger")
+
+    @header_handler
+    def decorated_function(event):
+        return {"statusCode": "200", "body": "{}", "headers": {}}
+
+    test_event = create_test_api_gateway_event(
+        headers={"X-Request-Id": "test_request_id"}
+    )
+    event = APIGatewayProxyEvent(test_event)
+
+    response = decorated_function(event)
+
+    assert response["headers"] == {"X-Request-Id": "test_request_id"}
+    mock_logger.exception.assert_not_called()
+    mock_logger.log.assert_any_call(
+        LogReference.METRICS003,
+        exc_info=mocker.ANY,
+        stacklevel=5,
+        error="Test exception",
+    )
+
+
 def test_logger_initialiser_happy_path(mocker: MockerFixture):
     mock_logger = mocker.patch("nrlf.core.decorators.logger")
 
@@ -786,6 +818,128 @@ def test_request_handler_with_custom_repository(mocker: MockerFixture):
     }
 
 
+def test_request_handler_shares_config_and_repository_between_requests(
+    mocker: MockerFixture,
+):
+    repository_mock = mocker.Mock()
+    received_kwargs = []
+
+    @request_handler(repository=repository_mock)
+    def decorated_function(config, metadata, repository) -> Response:
+        received_kwargs.append({"config": config, "repository": repository})
+        return Response(statusCode="200", body="{}")
+
+    event = create_test_api_gateway_event(headers=create_headers())
+
+    decorated_function(event, create_mock_context())
+    decorated_function(event, create_mock_context())
+
+    first, second = received_kwargs
+    assert isinstance(first["config"], Config)
+    assert first["config"] is second["config"]
+    assert first["repository"] is second["repository"]
+    repository_mock.assert_called_once()
+
+
+def test_request_handler_adds_server_timing_header(mocker: MockerFixture):
+    mocker.patch.dict(os.environ, {"SERVER_TIMING_ENABLED": "true"})
+
+    @request_handler(repository=mocker.Mock())
+    def decorated_function(metadata) -> Response:
+        return Response(statusCode="200", body="{}")
+
+    event = create_test_api_gateway_event(headers=create_headers())
+
+    result = decorated_function(event, create_mock_context())
+
+    server_timing = result["headers"]["Server-Timing"]
+    assert [metric.split(";")[0] for metric in server_timing.split(", ")] == [
+        "headers",
+        "permissions",
+        "parse",
+        "handler",
+        "serialise",
+        "total",
+    ]
+
+
+def test_request_handler_emits_request_metrics(
+    mocker: MockerFixture, capsys: pytest.CaptureFixture
+):
+    @request_handler(params=RequestParams, repository=mocker.Mock())
+    def decorated_function(params) -> Response:
+        return Response.from_search_results(
+            bundle=Bundle(resourceType="Bundle", type="searchset", total=2),
+            documents=["{}", "{}"],
+        )
+
+    event = create_test_api_gateway_event(
+        headers=create_headers(),
+        query_string_parameters={"type": "http://snomed.info/sct|736253002"},
+    )
+
+    result = decorated_function(event, create_mock_context())
+
+    (emitted,) = [
+        json.loads(line)
+        for line in capsys.readouterr().out.splitlines()
+        if line.startswith('{"_aws"') and '"Requests"' in line
+    ]
+    assert emitted["_aws"]["CloudWatchMetrics"][0]["Dimensions"] == [
+        ["Endpoint", "OdsCode", "PointerType"]
+    ]
+    assert emitted["Endpoint"] == "GET /"
+    assert emitted["OdsCode"] == "Y05868"
+    assert emitted["PointerType"] == "http://snomed.info/sct|736253002"
+    assert emitted["StatusCode"] == "200"
+    assert emitted["Requests"] == [1.0]
+    assert emitted["ResultCount"] == [2.0]
+    assert emitted["ResponseBytes"] == [len(result["body"].encode())]
+    assert emitted["ClientErrors"] == [0.0]
+    assert emitted["Duration"][0] > 0
+
+
+def test_request_handler_emits_request_metrics_for_errors(
+    capsys: pytest.CaptureFixture,
+):
+    @request_handler(repository=None)
+    def decorated_function() -> Response:
+        raise OperationOutcomeError(
+            status_code="404",
+            severity="error",
+            code="not-found",
+            details=SpineErrorConcept.from_code("NO_RECORD_FOUND"),
+            diagnostics="Not found",
+        )
+
+    event = create_test_api_gateway_event(headers=create_headers())
+
+    decorated_function(event, create_mock_context())
+
+    (emitted,) = [
+        json.loads(line)
+        for line in capsys.readouterr().out.splitlines()
+        if line.startswith('{"_aws"') and '"Requests"' in line
+    ]
+    assert emitted["StatusCode"] == "404"
+    assert emitted["ClientErrors"] == [1.0]
+    assert emitted["ServerErrors"] == [0.0]
+    assert "ResultCount" not in emitted
+
+
+def test_get_pointer_type():
+    params = RequestParams(type="http://snomed.info/sct|736253002")
+    document_reference = DocumentReference.parse_obj(
+        load_document_reference_json("Y05868-736253002-Valid")
+    )
+
+    assert get_pointer_type(params) == "http://snomed.info/sct|736253002"
+    assert get_pointer_type(None, document_reference) == (
+        "http://snomed.info/sct|736253002"
+    )
+    assert get_pointer_type(RequestParams(), None) is None
+
+
 def test_deprecated_decorator():
     @deprecated("This function is deprecated.")
     def deprecated_function():
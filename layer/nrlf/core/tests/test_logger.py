@@ -0,0 +1,101 @@
+import os
+from unittest import mock
+
+from nrlf.core.logger import Logger, LogReference, SplunkFormatter, is_debug_sampled
+
+
+def _logger(level: str) -> Logger:
+    logger = Logger(service="test", logger_formatter=SplunkFormatter())
+    logger.setLevel(level)
+    return logger
+
+
+def test_logger_is_enabled_for():
+    logger = _logger("INFO")
+
+    assert logger.isEnabledFor(LogReference.HANDLER000) is True
+    assert logger.isEnabledFor(LogReference.HANDLER001) is False
+    assert logger.isEnabledFor(LogReference.S3PERMISSIONS004) is True
+
+
+def test_logger_log_skips_disabled_levels():
+    logger = _logger("INFO")
+    payload = mock.Mock()
+
+    with mock.patch.object(logger, "debug") as mock_debug:
+        logger.log(LogReference.HANDLER001, config=lambda: payload())
+
+    mock_debug.assert_not_called()
+    payload.assert_not_called()
+
+
+def test_logger_log_resolves_lazy_values():
+    logger = _logger("DEBUG")
+
+    with mock.patch.object(logger, "debug") as mock_debug:
+        logger.log(
+            LogReference.HANDLER001,
+            config=lambda: {"TABLE_NAME": "table"},
+            table_name="table",
+        )
+
+    mock_debug.assert_called_once_with(
+        "Loaded config from environment variables",
+        stacklevel=3,
+        config={"TABLE_NAME": "table"},
+        table_name="table",
+        log_reference="HANDLER001",
+    )
+
+
+def test_is_debug_sampled_is_deterministic():
+    correlation_ids = [f"correlation-id-{idx}" for idx in range(1000)]
+
+    sampled = [
+        correlation_id
+        for correlation_id in correlation_ids
+        if is_debug_sampled(correlation_id, 0.1)
+    ]
+
+    assert 50 < len(sampled) < 150
+    assert sampled == [
+        correlation_id
+        for correlation_id in correlation_ids
+        if is_debug_sampled(correlation_id, 0.1)
+    ]
+    assert not any(is_debug_sampled(correlation_id, 0) for correlation_id in sampled)
+    assert all(is_debug_sampled(correlation_id, 1) for correlation_id in sampled)
+
+
+def test_logger_sample_debug_logging_with_sample_rate():
+    logger = _logger("INFO")
+
+    with mock.patch.dict(os.environ, {"DEBUG_LOG_SAMPLE_RATE": "1"}):
+        assert logger.sample_debug_logging("correlation-id") is True
+        assert logger.isEnabledFor(LogReference.HANDLER001) is True
+
+    assert logger.sample_debug_logging("correlation-id") is False
+    assert logger.isEnabledFor(LogReference.HANDLER001) is False
+
+
+def test_logger_sample_debug_logging_with_allowed_correlation_id():
+    logger = _logger("INFO")
+
+    with mock.patch.dict(
+        os.environ, {"DEBUG_LOG_CORRELATION_IDS": "other-id,correlation-id"}
+    ):
+        assert logger.sample_debug_logging("correlation-id") is True
+        assert logger.sample_debug_logging("another-id") is False
+        assert logger.sample_debug_logging(None) is False
+
+    assert logger.isEnabledFor(LogReference.HANDLER000) is True
+    assert logger.isEnabledFor(LogReference.HANDLER001) is False
+
+
+def test_log_reference_pagination_codes_are_distinct():
+    assert LogReference.CONSEARCH006.name == "CONSEARCH006"
+    assert LogReference.CONPOSTSEARCH006.name == "CONPOSTSEARCH006"
+
+
+def test_log_reference_producer_search_parse_error_is_distinct():
+    assert LogReference.PROSEARCH005.name == "PROSEARCH005"
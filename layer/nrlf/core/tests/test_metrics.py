@@ -0,0 +1,48 @@
+import json
+
+import pytest
+
+from nrlf.core.metrics import create_metrics, emit_consumed_capacity
+from nrlf.core.request import parse_headers
+from nrlf.tests.events import create_headers
+
+
+def _emitted_metrics(output: str) -> list:
+    return [
+        json.loads(line) for line in output.splitlines() if line.startswith('{"_aws"')
+    ]
+
+
+def test_create_metrics_skips_empty_dimensions():
+    metrics = create_metrics({"OdsCode": "Y05868", "PointerType": None})
+
+    assert metrics.dimension_set == {"OdsCode": "Y05868"}
+    assert metrics.namespace == "NRLF"
+
+
+def test_emit_consumed_capacity(capsys: pytest.CaptureFixture):
+    metadata = parse_headers(create_headers())
+
+    emit_consumed_capacity(
+        metadata, {"read_capacity_units": 1.5, "write_capacity_units": 2.0}
+    )
+
+    (emitted,) = _emitted_metrics(capsys.readouterr().out)
+    assert emitted["_aws"]["CloudWatchMetrics"][0]["Namespace"] == "NRLF"
+    assert emitted["_aws"]["CloudWatchMetrics"][0]["Dimensions"] == [
+        ["OdsCode", "AppId"]
+    ]
+    assert emitted["OdsCode"] == "Y05868"
+    assert emitted["AppId"] == "Y05868-TestApp-12345678"
+    assert emitted["ReadCapacityUnits"] == [1.5]
+    assert emitted["WriteCapacityUnits"] == [2.0]
+
+
+def test_emit_consumed_capacity_without_capacity(capsys: pytest.CaptureFixture):
+    metadata = parse_headers(create_headers())
+
+    emit_consumed_capacity(
+        metadata, {"read_capacity_units": 0.0, "write_capacity_units": 0.0}
+    )
+
+    assert _emitted_metrics(capsys.readouterr().out) == []
@@ -2,8 +2,8 @@ from nrlf.core.model import (
     ConnectionMetadata,
     ConsumerRequestParams,
     CountRequestParams,
-    ProducerRequestParams,
 )
+from nrlf.core.producer import ProducerRequestParams
 
 
 def test_connection_metadata():
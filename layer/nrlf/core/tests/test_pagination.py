@@ -0,0 +1,160 @@
+import pytest
+
+from nrlf.consumer.fhir.r4.model import NextPageToken
+from nrlf.core.errors import OperationOutcomeError
+from nrlf.core.pagination import (
+    create_next_link,
+    decode_page_token,
+    encode_page_token,
+    get_start_key,
+    search_filters,
+)
+
+SECRET = "test-secret"
+START_KEY = {
+    "pk": "D#Y05868-1234",
+    "sk": "D#Y05868-1234",
+    "patient_key": "P#6700028191",
+    "patient_sort": "C#SCT-734163000#T#SCT-736253002#CO#2024-01-01T00:00:00.000Z#D#Y05868-1234",
+}
+FILTERS = search_filters(["http://snomed.info/sct|736253002"], "Y05868")
+
+
+def test_encode_decode_page_token_round_trip():
+    token = encode_page_token(START_KEY, SECRET)
+
+    assert "patient_key" not in token
+    assert decode_page_token(token, SECRET) == START_KEY
+
+
+def test_decode_page_token_rejects_wrong_secret():
+    token = encode_page_token(START_KEY, SECRET)
+
+    with pytest.raises(ValueError, match="Page token signature is invalid"):
+        decode_page_token(token, "another-secret")
+
+
+def test_decode_page_token_rejects_tampered_payload():
+    token = encode_page_token(START_KEY, SECRET)
+    _, signature = token.split(".")
+    tampered_payload = encode_page_token({**START_KEY, "pk": "D#X26-1234"}, SECRET)
+    tampered_token = ".".join([tampered_payload.split(".")[0], signature])
+
+    with pytest.raises(ValueError, match="Page token signature is invalid"):
+        decode_page_token(tampered_token, SECRET)
+
+
+@pytest.mark.parametrize("token", ["", "no-separator", ".signature", "payload."])
+def test_decode_page_token_rejects_malformed_token(token: str):
+    with pytest.raises(ValueError, match="Page token is not correctly formed"):
+        decode_page_token(token, SECRET)
+
+
+def _create_token(key=START_KEY, filters=FILTERS) -> NextPageToken:
+    return NextPageToken(
+        __root__=encode_page_token({"key": key, "filters": filters}, SECRET)
+    )
+
+
+def test_search_filters():
+    assert search_filters(["b", "a"], "Y05868") == {
+        "pointer_types": ["a", "b"],
+        "custodian": "Y05868",
+        "custodian_suffix": None,
+    }
+    assert search_filters(None) == {
+        "pointer_types": [],
+        "custodian": None,
+        "custodian_suffix": None,
+    }
+
+
+def test_get_start_key_no_token():
+    assert get_start_key(None, "6700028191", FILTERS, SECRET) is None
+
+
+def test_get_start_key_valid_token():
+    token = _create_token()
+
+    assert get_start_key(token, "6700028191", FILTERS, SECRET) == START_KEY
+
+
+def test_get_start_key_token_for_another_patient():
+    token = _create_token()
+
+    with pytest.raises(OperationOutcomeError) as error:
+        get_start_key(token, "9278693472", FILTERS, SECRET)
+
+    assert error.value.status_code == "400"
+    assert error.value.operation_outcome.dict(exclude_none=True)["issue"][0] == {
+        "severity": "error",
+        "code": "invalid",
+        "details": {
+            "coding": [
+                {
+                    "system": "https://fhir.nhs.uk/ValueSet/Spine-ErrorOrWarningCode-1",
+                    "code": "INVALID_PARAMETER",
+                    "display": "Invalid parameter",
+                }
+            ]
+        },
+        "diagnostics": "Invalid next-page-token (The provided token is not valid for this search)",
+        "expression": ["next-page-token"],
+    }
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        search_filters(["http://snomed.info/sct|736253002"]),
+        search_filters(["http://snomed.info/sct|861421000000109"], "Y05868"),
+        search_filters(["http://snomed.info/sct|736253002"], "Y05868", "001"),
+    ],
+)
+def test_get_start_key_token_for_other_filters(filters):
+    token = _create_token()
+
+    with pytest.raises(OperationOutcomeError) as error:
+        get_start_key(token, "6700028191", filters, SECRET)
+
+    assert error.value.status_code == "400"
+    assert (
+        error.value.operation_outcome.issue[0].details.coding[0].code
+        == "INVALID_PARAMETER"
+    )
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        START_KEY,
+        {"key": "not-a-key", "filters": FILTERS},
+    ],
+)
+def test_get_start_key_token_without_key(data):
+    token = NextPageToken(__root__=encode_page_token(data, SECRET))
+
+    with pytest.raises(OperationOutcomeError) as error:
+        get_start_key(token, "6700028191", FILTERS, SECRET)
+
+    assert error.value.status_code == "400"
+
+
+def test_get_start_key_invalid_token():
+    token = NextPageToken(__root__="invalid.token")
+
+    with pytest.raises(OperationOutcomeError) as error:
+        get_start_key(token, "6700028191", FILTERS, SECRET)
+
+    assert error.value.status_code == "400"
+
+
+def test_create_next_link():
+    link = create_next_link(
+        "https://example.com/DocumentReference?a=b", START_KEY, FILTERS, SECRET
+    )
+
+    assert link["relation"] == "next"
+    base_url, token = link["url"].split("&next-page-token=")
+    assert base_url == "https://example.com/DocumentReference?a=b"
+    assert decode_page_token(token, SECRET) == {"key": START_KEY, "filters": FILTERS}
@@ -0,0 +1,104 @@
+import json
+
+import pytest
+
+from nrlf.core.errors import ParseError
+from nrlf.core.pipeline import DocumentReferencePipeline
+from nrlf.producer.fhir.r4.model import DocumentReference, Meta
+from nrlf.tests.data import (
+    load_document_reference,
+    load_document_reference_data,
+    load_document_reference_json,
+)
+
+
+def test_pipeline_from_raw():
+    raw = load_document_reference_data("Y05868-736253002-Valid")
+
+    pipeline = DocumentReferencePipeline.from_raw(raw)
+
+    assert pipeline.data == json.loads(raw)
+    assert isinstance(pipeline.resource, DocumentReference)
+
+
+def test_pipeline_from_raw_invalid_resource():
+    with pytest.raises(ParseError):
+        DocumentReferencePipeline.from_raw('{"resourceType": "DocumentReference"}')
+
+
+def test_pipeline_validate_caches_result():
+    pipeline = DocumentReferencePipeline(
+        load_document_reference("Y05868-736253002-Valid")
+    )
+
+    result = pipeline.validate()
+
+    assert result.is_valid is True
+    assert pipeline.validate() is result
+
+
+def test_pipeline_validate_rejects_extra_fields_from_raw():
+    data = load_document_reference_json("Y05868-736253002-Valid")
+    data["extra_field"] = "extra"
+
+    result = DocumentReferencePipeline.from_raw(json.dumps(data)).validate()
+
+    assert result.is_valid is False
+    assert result.issues[0].diagnostics == "The resource contains extra fields"
+
+
+def test_pipeline_validate_ignores_extra_fields_from_model():
+    data = load_document_reference_json("Y05868-736253002-Valid")
+    data["extra_field"] = "extra"
+
+    pipeline = DocumentReferencePipeline(DocumentReference.parse_obj(data))
+
+    assert pipeline.validate().is_valid is True
+    assert "extra_field" not in json.loads(pipeline.document)
+
+
+def test_pipeline_document_is_rendered_once(mocker):
+    resource = load_document_reference("Y05868-736253002-Valid")
+    pipeline = DocumentReferencePipeline(resource)
+    expected = resource.json(exclude_none=True)
+
+    mock_json = mocker.patch.object(DocumentReference, "json", return_value=expected)
+    document = pipeline.document
+
+    assert pipeline.document is document
+    assert document == expected
+    mock_json.assert_called_once_with(exclude_none=True)
+
+
+def test_pipeline_to_pointer_includes_server_fields():
+    raw = load_document_reference_data("Y05868-736253002-Valid")
+    pipeline = DocumentReferencePipeline.from_raw(raw)
+    pipeline.validate()
+    stale_document = pipeline.document
+
+    pipeline.resource.id = "Y05868-new-id"
+    pipeline.resource.meta = Meta(lastUpdated="2024-01-01T00:00:00.000Z")
+    pipeline.resource.date = "2024-01-01T00:00:00.000Z"
+    pointer = pipeline.to_pointer(created_on="2024-01-01T00:00:00.000Z")
+
+    document = json.loads(pointer.document)
+    assert document["id"] == "Y05868-new-id"
+    assert document["meta"] == {"lastUpdated": "2024-01-01T00:00:00.000Z"}
+    assert document["date"] == "2024-01-01T00:00:00.000Z"
+    assert pointer.document == pipeline.document
+    assert pointer.document != stale_document
+    assert pointer.id == "Y05868-new-id"
+    assert pointer.created_on == "2024-01-01T00:00:00.000Z"
+
+
+@pytest.mark.parametrize("size", ["100", 100.0])
+def test_pipeline_to_pointer_stores_canonical_json(size):
+    data = load_document_reference_json("Y05868-736253002-Valid")
+    data["content"][0]["attachment"]["size"] = size
+
+    pipeline = DocumentReferencePipeline.from_raw(json.dumps(data))
+    pointer = pipeline.to_pointer()
+
+    assert pointer.document == pipeline.resource.json(exclude_none=True)
+    assert json.loads(pointer.document)["content"][0]["attachment"]["size"] == 100
+    assert '"size": 100,' in pointer.document
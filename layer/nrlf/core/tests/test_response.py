@@ -1,6 +1,10 @@
 import json
+import os
+from unittest import mock
 
-from nrlf.core.response import Response
+import pytest
+
+from nrlf.core.response import NRLResponse, Response, SpineErrorResponse
 from nrlf.producer.fhir.r4 import model as producer_model
 
 
@@ -21,6 +25,66 @@ def test_from_resource():
     assert parsed_body == {"id": "test-doc-ref"}
 
 
+def test_from_search_results():
+    documents = [
+        json.dumps({"resourceType": "DocumentReference", "id": "test-doc-ref-1"}),
+        json.dumps({"resourceType": "DocumentReference", "id": "test-doc-ref-2"}),
+    ]
+    links = [{"relation": "self", "url": "https://example.com/DocumentReference"}]
+
+    response = Response.from_search_results(documents, links)
+
+    assert isinstance(response, Response)
+    assert response.statusCode == "200"
+
+    parsed_body = json.loads(response.body)
+    assert parsed_body == {
+        "resourceType": "Bundle",
+        "type": "searchset",
+        "link": links,
+        "total": 2,
+        "entry": [
+            {
+                "resource": {
+                    "resourceType": "DocumentReference",
+                    "id": "test-doc-ref-1",
+                }
+            },
+            {
+                "resource": {
+                    "resourceType": "DocumentReference",
+                    "id": "test-doc-ref-2",
+                }
+            },
+        ],
+    }
+
+
+def test_from_search_results_paged():
+    documents = [
+        json.dumps({"resourceType": "DocumentReference", "id": "test-doc-ref-1"}),
+    ]
+
+    response = Response.from_search_results(documents, paged=True)
+
+    parsed_body = json.loads(response.body)
+    assert "total" not in parsed_body
+    assert len(parsed_body["entry"]) == 1
+    assert response.result_count == 1
+
+
+def test_from_search_results_no_results():
+    response = Response.from_search_results([])
+
+    parsed_body = json.loads(response.body)
+    assert parsed_body == {
+        "resourceType": "Bundle",
+        "type": "searchset",
+        "total": 0,
+        "entry": [],
+    }
+
+
 def test_from_issues():
     response = Response.from_issues(
         issues=[
@@ -84,3 +148,84 @@ def test_from_exception():
             }
         ],
     }
+
+
+def test_from_resource_compact_json():
+    resource = producer_model.DocumentReference.construct(
+        resourceType="DocumentReference", id="test-doc-ref"
+    )
+
+    with mock.patch.dict(os.environ, {"COMPACT_JSON_RESPONSES": "true"}):
+        response = Response.from_resource(resource)
+
+    assert response.body == '{"resourceType":"DocumentReference","id":"test-doc-ref"}'
+
+
+@pytest.mark.parametrize("compact", ["true", "false"])
+@pytest.mark.parametrize("document_count", [0, 1, 2])
+def test_from_search_results_round_trips(compact, document_count):
+    documents = [
+        producer_model.DocumentReference.construct(
+            resourceType="DocumentReference", id=f"test-doc-ref-{index}"
+        ).json(exclude_none=True)
+        for index in range(document_count)
+    ]
+    links = [{"relation": "self", "url": "https://example.com/DocumentReference"}]
+
+    with mock.patch.dict(os.environ, {"COMPACT_JSON_RESPONSES": compact}):
+        response = Response.from_search_results(documents, links)
+
+    assert response.body == json.dumps(json.loads(response.body))
+
+
+def test_nrl_response_resource_created():
+    first = NRLResponse.RESOURCE_CREATED("Y05868-1")
+    second = NRLResponse.RESOURCE_CREATED("Y05868-2")
+
+    assert first.statusCode == "201"
+    assert first.headers == {"Location": "/producer/FHIR/R4/DocumentReference/Y05868-1"}
+    assert second.headers == {
+        "Location": "/producer/FHIR/R4/DocumentReference/Y05868-2"
+    }
+    assert first.body is second.body
+    assert json.loads(first.body) == {
+        "resourceType": "OperationOutcome",
+        "issue": [
+            {
+                "severity": "information",
+                "code": "informational",
+                "details": {
+                    "coding": [
+                        {
+                            "system": "https://fhir.nhs.uk/ValueSet/NRL-ResponseCode",
+                            "code": "RESOURCE_CREATED",
+                            "display": "Resource created",
+                        }
+                    ]
+                },
+                "diagnostics": "The document has been created",
+            }
+        ],
+    }
+
+
+def test_spine_error_response_with_expression():
+    response = SpineErrorResponse.BAD_REQUEST(
+        diagnostics="Invalid type", expression="type.coding[0].code"
+    )
+
+    assert response.statusCode == "400"
+    assert json.loads(response.body)["issue"][0]["expression"] == [
+        "type.coding[0].code"
+    ]
+
+
+def test_render_operation_outcome_respects_compact_json():
+    with mock.patch.dict(os.environ, {"COMPACT_JSON_RESPONSES": "true"}):
+        compact = SpineErrorResponse.NO_RECORD_FOUND()
+
+    indented = SpineErrorResponse.NO_RECORD_FOUND()
+
+    assert "\n" not in compact.body
+    assert "\n" in indented.body
+    assert json.loads(compact.body) == json.loads(indented.body)
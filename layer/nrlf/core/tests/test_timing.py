@@ -0,0 +1,94 @@
+import os
+from unittest import mock
+
+from moto import mock_aws
+
+from nrlf.core.dynamodb.repository import DocumentPointerRepository
+from nrlf.core.timing import SpanRecorder, recorder, server_timing_enabled
+from nrlf.tests.dynamodb import mock_repository
+
+
+def test_span_recorder_aggregates_spans():
+    span_recorder = SpanRecorder()
+
+    with span_recorder.span("parse"):
+        pass
+    span_recorder.record("dynamodb.Query", 0.002)
+    span_recorder.record("dynamodb.Query", 0.003)
+
+    summary = span_recorder.summary()
+    assert summary["spans"]["parse"]["count"] == 1
+    assert summary["spans"]["dynamodb.Query"] == {"count": 2, "duration_ms": 5.0}
+    assert summary["total_ms"] >= 0
+
+
+def test_span_recorder_records_consumed_capacity():
+    span_recorder = SpanRecorder()
+
+    span_recorder.record(
+        "dynamodb.GetItem",
+        0.001,
+        consumed_capacity={"TableName": "pointers", "CapacityUnits": 0.5},
+    )
+    span_recorder.record(
+        "dynamodb.BatchGetItem",
+        0.001,
+        consumed_capacity=[
+            {"TableName": "pointers", "CapacityUnits": 1.5},
+            {"TableName": "other", "CapacityUnits": 1},
+        ],
+    )
+
+    span_recorder.record(
+        "dynamodb.PutItem",
+        0.001,
+        consumed_capacity={"TableName": "pointers", "CapacityUnits": 2},
+        is_write=True,
+    )
+
+    summary = span_recorder.summary()
+    assert summary["consumed_capacity"] == {"pointers": 4.0, "other": 1.0}
+    assert summary["read_capacity_units"] == 3.0
+    assert summary["write_capacity_units"] == 2.0
+
+
+def test_span_recorder_reset():
+    span_recorder = SpanRecorder()
+    span_recorder.record("parse", 0.001, consumed_capacity={"CapacityUnits": 1})
+
+    span_recorder.reset()
+
+    assert span_recorder.summary()["spans"] == {}
+    assert span_recorder.summary()["consumed_capacity"] == {}
+
+
+def test_span_recorder_server_timing():
+    span_recorder = SpanRecorder()
+    span_recorder.record("headers", 0.0012)
+    span_recorder.record("dynamodb.GetItem", 0.0034)
+
+    server_timing = span_recorder.server_timing()
+
+    assert server_timing.startswith("headers;dur=1.2, dynamodb.GetItem;dur=3.4, ")
+    assert server_timing.split(", ")[-1].startswith("total;dur=")
+
+
+def test_server_timing_enabled():
+    assert server_timing_enabled() is False
+
+    with mock.patch.dict(os.environ, {"SERVER_TIMING_ENABLED": "true"}):
+        assert server_timing_enabled() is True
+
+
+@mock_aws
+@mock_repository
+def test_dynamodb_calls_are_recorded(repository: DocumentPointerRepository):
+    recorder.reset()
+
+    repository.get_by_id("Y05868-99999-99999-999999")
+
+    summary = recorder.summary()
+    assert summary["spans"]["dynamodb.GetItem"]["count"] == 1
+    assert summary["consumed_capacity"] == {"unit-test-document-pointer": 0.5}
+    assert summary["read_capacity_units"] == 0.5
+    assert summary["write_capacity_units"] == 0.0
@@ -7,6 +7,7 @@ from nrlf.core.errors import ParseError
 from nrlf.core.validators import (
     DocumentReferenceValidator,
     ValidationResult,
+    matches_model,
     validate_type_system,
 )
 from nrlf.producer.fhir.r4.model import (
@@ -205,6 +206,31 @@ def test_validate_document_reference_valid():
     assert result.issues == []
 
 
+def test_validate_document_reference_with_parsed_resource(mocker):
+    validator = DocumentReferenceValidator()
+    document_ref_data = load_document_reference_json("Y05868-736253002-Valid")
+    resource = DocumentReference.parse_obj(document_ref_data)
+    mock_parse = mocker.patch.object(DocumentReferenceValidator, "parse")
+
+    result = validator.validate(document_ref_data, resource=resource)
+
+    mock_parse.assert_not_called()
+    assert result.is_valid is True
+    assert result.resource is resource
+
+
+def test_validate_document_reference_with_parsed_resource_extra_fields():
+    validator = DocumentReferenceValidator()
+    document_ref_data = load_document_reference_json("Y05868-736253002-Valid")
+    resource = DocumentReference.parse_obj(document_ref_data)
+    document_ref_data["extra_field"] = "extra"
+
+    result = validator.validate(document_ref_data, resource=resource)
+
+    assert result.is_valid is False
+    assert result.issues[0].diagnostics == "The resource contains extra fields"
+
+
 def test_validate_document_reference_missing_fields():
     validator = DocumentReferenceValidator()
     document_ref_data = load_document_reference_json("Y05868-736253002-Valid")
@@ -1206,3 +1232,47 @@ def test_validate_ssp_content_with_multiple_asids():
         "diagnostics": "Multiple ASID identifiers provided. Only a single valid ASID identifier can be provided in the context.related.",
         "expression": ["context.related"],
     }
+
+
+def test_matches_model():
+    document_ref_data = load_document_reference_json("Y05868-736253002-Valid")
+    resource = DocumentReference.parse_obj(document_ref_data)
+
+    assert matches_model(document_ref_data, resource) is True
+
+    document_ref_data["content"][0]["attachment"]["extra"] = "value"
+    assert matches_model(document_ref_data, resource) is False
+
+
+def test_matches_model_with_null_value():
+    document_ref_data = load_document_reference_json("Y05868-736253002-Valid")
+    resource = DocumentReference.parse_obj(document_ref_data)
+
+    document_ref_data["description"] = None
+    assert matches_model(document_ref_data, resource) is False
+
+
+def test_validate_document_reference_nested_extra_fields():
+    validator = DocumentReferenceValidator()
+    document_ref_data = load_document_reference_json("Y05868-736253002-Valid")
+
+    document_ref_data["subject"]["identifier"]["extra_field"] = "extra_value"
+
+    result = validator.validate(document_ref_data)
+
+    assert result.is_valid is False
+    assert [issue.diagnostics for issue in result.issues] == [
+        "The resource contains extra fields"
+    ]
+
+
+def test_validate_document_reference_skips_content_extension_rule():
+    validator = DocumentReferenceValidator()
+    validator._validate_content_extension = Mock()
+    document_ref_data = load_document_reference_json("Y05868-736253002-Valid")
+    document_ref_data["content"][0].pop("extension", None)
+
+    result = validator.validate(document_ref_data)
+
+    assert result.is_valid is True
+    validator._validate_content_extension.assert_not_called()
@@ -0,0 +1,147 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+SERVER_TIMING_ENABLED_ENV = "SERVER_TIMING_ENABLED"
+
+DYNAMODB_READ_OPERATIONS = {
+    "BatchGetItem",
+    "GetItem",
+    "Query",
+    "Scan",
+    "TransactGetItems",
+}
+
+ConsumedCapacity = Union[Dict[str, Any], List[Dict[str, Any]], None]
+
+
+class SpanRecorder:
+    """
+    Records how long each stage of a request takes. The recorder is reset at
+    the start of each request, and the spans are aggregated by name so they
+    can be logged once per request and returned in a Server-Timing header.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started_at = time.perf_counter()
+            self.spans: Dict[str, Dict[str, float]] = {}
+            self.consumed_capacity: Dict[str, float] = {}
+            self.read_capacity_units = 0.0
+            self.write_capacity_units = 0.0
+
+    def record(
+        self,
+        name: str,
+        duration: float,
+        consumed_capacity: ConsumedCapacity = None,
+        is_write: bool = False,
+    ):
+        """
+        Record a span of the given duration (in seconds), along with any
+        capacity consumed by a DynamoDB read or write
+        """
+        with self._lock:
+            span = self.spans.setdefault(name, {"count": 0, "duration_ms": 0.0})
+            span["count"] += 1
+            span["duration_ms"] += duration * 1000
+
+            if isinstance(consumed_capacity, dict):
+                consumed_capacity = [consumed_capacity]
+
+            for capacity in consumed_capacity or []:
+                table_name = capacity.get("TableName", "unknown")
+                units = float(capacity.get("CapacityUnits", 0))
+                self.consumed_capacity[table_name] = (
+                    self.consumed_capacity.get(table_name, 0.0) + units
+                )
+                if is_write:
+                    self.write_capacity_units += units
+                else:
+                    self.read_capacity_units += units
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """
+        Record the time taken by the wrapped block of code
+        """
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started_at)
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Get the recorded spans and consumed capacity for the request
+        """
+        with self._lock:
+            return {
+                "total_ms": round((time.perf_counter() - self.started_at) * 1000, 3),
+                "spans": {
+                    name: {
+                        "count": span["count"],
+                        "duration_ms": round(span["duration_ms"], 3),
+                    }
+                    for name, span in self.spans.items()
+                },
+                "consumed_capacity": dict(self.consumed_capacity),
+                "read_capacity_units": self.read_capacity_units,
+                "write_capacity_units": self.write_capacity_units,
+            }
+
+    def server_timing(self) -> str:
+        """
+        Format the recorded spans as a Server-Timing header value
+        """
+        summary = self.summary()
+        metrics = [
+            f"{name};dur={span['duration_ms']:.1f}"
+            for name, span in summary["spans"].items()
+        ]
+        metrics.append(f"total;dur={summary['total_ms']:.1f}")
+        return ", ".join(metrics)
+
+
+def server_timing_enabled() -> bool:
+    """
+    Check whether the Server-Timing header should be added to responses
+    """
+    return os.getenv(SERVER_TIMING_ENABLED_ENV, "false").lower() == "true"
+
+
+def _before_dynamodb_call(context: Dict[str, Any], **kwargs):
+    context["span_started_at"] = time.perf_counter()
+
+
+def _after_dynamodb_call(
+    model, parsed: Dict[str, Any], context: Dict[str, Any], **kwargs
+):
+    started_at: Optional[float] = context.get("span_started_at")
+    if started_at is None:
+        return
+
+    recorder.record(
+        f"dynamodb.{model.name}",
+        time.perf_counter() - started_at,
+        consumed_capacity=parsed.get("ConsumedCapacity"),
+        is_write=model.name not in DYNAMODB_READ_OPERATIONS,
+    )
+
+
+def register_dynamodb_spans(client):
+    """
+    Record a span, including the consumed capacity, for every call made by
+    the DynamoDB client
+    """
+    client.meta.events.register("before-call.dynamodb", _before_dynamodb_call)
+    client.meta.events.register("after-call.dynamodb", _after_dynamodb_call)
+
+
+recorder = SpanRecorder()
@@ -1,24 +1,32 @@
-from typing import Union
+from typing import TYPE_CHECKING, Any, Union
 
-from mypy_boto3_dynamodb import DynamoDBClient, DynamoDBServiceResource
-from mypy_boto3_lambda import LambdaClient
-from mypy_boto3_s3 import S3Client
+# The boto3 stubs and FHIR models are only needed by type checkers, and are
+# slow to import. Consumer handlers should not load the producer model.
+if TYPE_CHECKING:
+    from mypy_boto3_dynamodb import DynamoDBClient, DynamoDBServiceResource
+    from mypy_boto3_lambda import LambdaClient
+    from mypy_boto3_s3 import S3Client
 
-from nrlf.consumer.fhir.r4 import model as consumer_model
-from nrlf.producer.fhir.r4 import model as producer_model
-
-__all__ = ["DynamoDBServiceResource", "S3Client", "LambdaClient", "DynamoDBClient"]
+    from nrlf.consumer.fhir.r4 import model as consumer_model
+    from nrlf.producer.fhir.r4 import model as producer_model
 
+    # Generic Model Types
+    OperationOutcomeIssue = Union[
+        producer_model.OperationOutcomeIssue, consumer_model.OperationOutcomeIssue
+    ]
+    CodeableConcept = Union[
+        producer_model.CodeableConcept, consumer_model.CodeableConcept
+    ]
+    Bundle = Union[producer_model.Bundle, consumer_model.Bundle]
+    DocumentReference = Union[
+        producer_model.DocumentReference, consumer_model.DocumentReference
+    ]
+    RequestQueryType = Union[
+        producer_model.RequestQueryType, consumer_model.RequestQueryType
+    ]
+else:
+    DynamoDBClient = DynamoDBServiceResource = LambdaClient = S3Client = Any
+    OperationOutcomeIssue = CodeableConcept = Bundle = DocumentReference = Any
+    RequestQueryType = Any
 
-# Generic Model Types
-OperationOutcomeIssue = Union[
-    producer_model.OperationOutcomeIssue, consumer_model.OperationOutcomeIssue
-]
-CodeableConcept = Union[producer_model.CodeableConcept, consumer_model.CodeableConcept]
-Bundle = Union[producer_model.Bundle, consumer_model.Bundle]
-DocumentReference = Union[
-    producer_model.DocumentReference, consumer_model.DocumentReference
-]
-RequestQueryType = Union[
-    producer_model.RequestQueryType, consumer_model.RequestQueryType
-]
+__all__ = ["DynamoDBServiceResource", "S3Client", "LambdaClient", "DynamoDBClient"]
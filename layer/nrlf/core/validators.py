@@ -1,15 +1,28 @@
+import re
 from dataclasses import dataclass
-from re import match
-from typing import Any, Dict, List, Optional
+from functools import partial
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, Type
 
-from pydantic import ValidationError
+from pydantic import BaseModel, ValidationError
 
 from nrlf.core.codes import SpineErrorConcept
-from nrlf.core.constants import CATEGORY_ATTRIBUTES, REQUIRED_CREATE_FIELDS
+from nrlf.core.constants import (
+    ALLOWED_RELATES_TO_CODES,
+    CATEGORY_ATTRIBUTES,
+    NHS_NUMBER_SYSTEM_URL,
+    ODS_SYSTEM,
+    RELATES_TO_REPLACES,
+    REQUIRED_CREATE_FIELDS,
+)
 from nrlf.core.errors import ParseError
 from nrlf.core.logger import LogReference, logger
+from nrlf.core.timing import recorder
 from nrlf.core.types import DocumentReference, OperationOutcomeIssue, RequestQueryType
-from nrlf.producer.fhir.r4 import model as producer_model
+
+ASID_SYSTEM = "https://fhir.nhs.uk/Id/nhsSpineASID"
+ASID_PATTERN = re.compile(r"^\d{12}$")
+SSP_URL_PREFIX = "ssp://"
+CONTENT_STABILITY_CODES = frozenset({"static", "dynamic"})
 
 
 def validate_type_system(
@@ -35,6 +48,8 @@ class ValidationResult:
     issues: List[OperationOutcomeIssue]
 
     def reset(self):
+        from nrlf.producer.fhir.r4 import model as producer_model
+
         self.__init__(resource=producer_model.DocumentReference.construct(), issues=[])
 
     def add_error(
@@ -44,6 +59,8 @@ class ValidationResult:
         diagnostics: Optional[str] = None,
         field: Optional[str] = None,
     ):
+        from nrlf.producer.fhir.r4 import model as producer_model
+
         details = None
         if error_code is not None:
             details = SpineErrorConcept.from_code(error_code)
@@ -56,7 +73,9 @@ class ValidationResult:
             expression=[field] if field else None,  # type: ignore
         )
 
-        logger.log(LogReference.VALIDATOR002, issue=issue.dict(exclude_none=True))
+        logger.log(
+            LogReference.VALIDATOR002, issue=partial(issue.dict, exclude_none=True)
+        )
         self.issues.append(issue)
 
     @property
@@ -68,29 +87,97 @@ class StopValidationError(Exception):
     pass
 
 
+class ValidationRule(NamedTuple):
+    """
+    A validation step, run by calling the validator method named by check
+    when applies (if given) is true for the resource
+    """
+
+    step: str
+    check: str
+    applies: Optional[Callable[[DocumentReference], bool]] = None
+
+
+def matches_model(data: Any, value: Any) -> bool:
+    """
+    Check the parsed data holds exactly the values of the model, the same as
+    comparing it to value.dict(exclude_none=True) but without building
+    the dict. This stops at the first difference.
+    """
+    if isinstance(value, str):
+        return data == value
+
+    if isinstance(value, BaseModel):
+        if value.__custom_root_type__:
+            return matches_model(data, value.__root__)
+
+        if not isinstance(data, dict):
+            return False
+
+        fields = {
+            name: field for name, field in value.__dict__.items() if field is not None
+        }
+        return data.keys() == fields.keys() and all(
+            matches_model(data[name], field) for name, field in fields.items()
+        )
+
+    if isinstance(value, list):
+        return (
+            isinstance(data, list)
+            and len(data) == len(value)
+            and all(map(matches_model, data, value))
+        )
+
+    return data == value
+
+
 class DocumentReferenceValidator:
     """
     A class to validate document references
     """
 
-    MODEL = producer_model.DocumentReference
+    RULES: Tuple[ValidationRule, ...] = (
+        ValidationRule("required_fields", "_validate_required_fields"),
+        ValidationRule("no_extra_fields", "_validate_no_extra_fields"),
+        ValidationRule("identifiers", "_validate_identifiers"),
+        ValidationRule("relates_to", "_validate_relates_to"),
+        ValidationRule("ssp_asid", "_validate_ssp_asid"),
+        ValidationRule("category", "_validate_category"),
+        ValidationRule(
+            "content_extension",
+            "_validate_content_extension",
+            applies=lambda resource: bool(resource.content[0].extension),
+        ),
+    )
+
+    @staticmethod
+    def model() -> Type[BaseModel]:
+        """
+        The model to parse resources to. It is imported when first needed, so
+        that importing this module does not load the producer model.
+        """
+        from nrlf.producer.fhir.r4.model import DocumentReference
+
+        return DocumentReference
 
     def __init__(self):
-        self.result = ValidationResult(resource=self.MODEL.construct(), issues=[])
+        self.result = ValidationResult(resource=self.model().construct(), issues=[])
+        self._data: Dict[str, Any] | DocumentReference | None = None
 
     @classmethod
     def parse(cls, data: Dict[str, Any]):
+        model = cls.model()
         try:
-            logger.log(LogReference.PARSE000, data=data, model=cls.MODEL.__name__)
-            result = cls.MODEL.parse_obj(data)
-            logger.log(LogReference.PARSE001, model=cls.MODEL.__name__)
+            logger.log(LogReference.PARSE000, data=data, model=model.__name__)
+            result = model.parse_obj(data)
+            logger.log(LogReference.PARSE001, model=model.__name__)
             logger.log(LogReference.PARSE001a, result=result)
             return result
 
         except ValidationError as exc:
             logger.log(
                 LogReference.PARSE002,
-                model=cls.MODEL.__name__,
+                model=model.__name__,
                 data=data,
                 validation_error=str(exc),
             )
@@ -100,27 +187,30 @@ class DocumentReferenceValidator:
                 msg="Failed to parse DocumentReference resource",
             ) from None
 
-    def validate(self, data: Dict[str, Any] | DocumentReference):
+    def validate(
+        self,
+        data: Dict[str, Any] | DocumentReference,
+        resource: Optional[DocumentReference] = None,
+    ):
         """
-        Validate the document reference
+        Validate the document reference. If the dict has already been parsed,
+        the resource can be given so that it isn't parsed again.
         """
         logger.log(LogReference.VALIDATOR000, resource_type="DocumentReference")
-        resource = self.parse(data) if isinstance(data, dict) else data
+        if resource is None:
+            resource = self.parse(data) if isinstance(data, dict) else data
 
         self.result = ValidationResult(resource=resource, issues=[])
+        self._data = data
 
-        try:
-            self._validate_required_fields(resource)
-            self._validate_no_extra_fields(resource, data)
-            self._validate_identifiers(resource)
-            self._validate_relates_to(resource)
-            self._validate_ssp_asid(resource)
-            self._validate_category(resource)
-            if resource.content[0].extension:
-                self._validate_content_extension(resource)
-
-        except StopValidationError:
-            logger.log(LogReference.VALIDATOR003)
+        with recorder.span("validate"):
+            try:
+                for rule in self.RULES:
+                    if rule.applies is None or rule.applies(resource):
+                        getattr(self, rule.check)(resource)
+
+            except StopValidationError:
+                logger.log(LogReference.VALIDATOR003)
 
         logger.log(
             LogReference.VALIDATOR999,
@@ -151,21 +241,18 @@ class DocumentReferenceValidator:
         if not self.result.is_valid:
             raise StopValidationError()
 
-    def _validate_no_extra_fields(
-        self, resource: DocumentReference, data: Dict[str, Any] | DocumentReference
-    ):
+    def _validate_no_extra_fields(self, resource: DocumentReference):
         """
         Validate that there are no extra fields
         """
         logger.log(LogReference.VALIDATOR001, step="no_extra_fields")
-        has_extra_fields = False
 
-        if isinstance(data, DocumentReference):
+        if isinstance(self._data, dict):
+            has_extra_fields = not matches_model(self._data, resource)
+        else:
             has_extra_fields = (
                 len(set(resource.__dict__) - set(resource.__fields__)) > 0
             )
-        else:
-            has_extra_fields = data != resource.dict(exclude_none=True)
 
         if has_extra_fields:
             self.result.add_error(
@@ -196,10 +283,7 @@ class DocumentReferenceValidator:
             )
             raise StopValidationError()
 
-        if (
-            custodian_identifier.system
-            != "https://fhir.nhs.uk/Id/ods-organization-code"
-        ):
+        if custodian_identifier.system != ODS_SYSTEM:
             self.result.add_error(
                 issue_code="invalid",
                 error_code="INVALID_IDENTIFIER_SYSTEM",
@@ -207,7 +291,7 @@ class DocumentReferenceValidator:
                 field="custodian.identifier.system",
             )
 
-        if subject_identifier.system != "https://fhir.nhs.uk/Id/nhs-number":
+        if subject_identifier.system != NHS_NUMBER_SYSTEM_URL:
             self.result.add_error(
                 issue_code="invalid",
                 error_code="INVALID_IDENTIFIER_SYSTEM",
@@ -231,14 +315,7 @@ class DocumentReferenceValidator:
         logger.debug("Validating relatesTo")
 
         for index, relates_to in enumerate(model.relatesTo):
-            if relates_to.code not in [
-                "replaces",
-                "transforms",
-                "signs",
-                "appends",
-                "incorporates",
-                "summarizes",
-            ]:
+            if relates_to.code not in ALLOWED_RELATES_TO_CODES:
                 self.result.add_error(
                     issue_code="value",
                     error_code="INVALID_CODE_VALUE",
@@ -247,7 +324,7 @@ class DocumentReferenceValidator:
                 )
                 continue
 
-            if relates_to.code == "replaces" and not (
+            if relates_to.code == RELATES_TO_REPLACES and not (
                 relates_to.target.identifier and relates_to.target.identifier.value
             ):
                 self.result.add_error(
@@ -274,7 +351,7 @@ class DocumentReferenceValidator:
 
         idx, asid_reference = asid_references[0]
         asid_value = getattr(asid_reference.identifier, "value", "")
-        if not match(r"^\d{12}$", asid_value):
+        if not ASID_PATTERN.match(asid_value):
             self.result.add_error(
                 issue_code="value",
                 error_code="INVALID_IDENTIFIER_VALUE",
@@ -289,11 +366,8 @@ class DocumentReferenceValidator:
         """
 
         ssp_content = any(
-            [
-                content
-                for content in model.content
-                if content.attachment.url.startswith("ssp://")
-            ]
+            content.attachment.url.startswith(SSP_URL_PREFIX)
+            for content in model.content
         )
 
         logger.log(LogReference.VALIDATOR001, step="ssp_content_and_asid_exists")
@@ -304,7 +378,7 @@ class DocumentReferenceValidator:
             asid_references = [
                 (idx, related)
                 for idx, related in enumerate(getattr(model.context, "related", []))
-                if related.identifier.system == "https://fhir.nhs.uk/Id/nhsSpineASID"
+                if related.identifier.system == ASID_SYSTEM
             ]
             if len(asid_references) > 0:
                 does_asid_exist = True
@@ -427,10 +501,10 @@ class DocumentReferenceValidator:
                 )
                 return
 
-            if content.extension[0].valueCodeableConcept.coding[0].code not in [
-                "static",
-                "dynamic",
-            ]:
+            if (
+                content.extension[0].valueCodeableConcept.coding[0].code
+                not in CONTENT_STABILITY_CODES
+            ):
                 self.result.add_error(
                     issue_code="value",
                     error_code="INVALID_RESOURCE",
@@ -0,0 +1,326 @@
+#!/usr/bin/env python
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import (
+    ALL_COMPLETED,
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from itertools import islice
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+import boto3
+import fire
+from aws_session_assume import get_boto_session
+from botocore.exceptions import ClientError
+
+from nrlf.core.logger import logger
+from nrlf.core.pipeline import DocumentReferencePipeline
+
+BATCH_WRITE_MAX_ITEMS = 25
+DEFAULT_CHUNK_SIZE = 500
+MAX_WRITE_ATTEMPTS = 10
+THROTTLING_ERROR_CODES = {
+    "ProvisionedThroughputExceededException",
+    "RequestLimitExceeded",
+    "ThrottlingException",
+}
+
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket shared by the write workers. The rate is increased additively
+    while writes succeed and halved whenever DynamoDB throttles a request.
+    """
+
+    def __init__(
+        self,
+        initial_rate: float,
+        min_rate: float = 25.0,
+        max_rate: Optional[float] = None,
+        increase: float = 25.0,
+    ):
+        self.rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self._tokens = 0.0
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, count: int):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.rate, self._tokens + (now - self._updated_at) * self.rate
+                )
+                self._updated_at = now
+                if self._tokens >= count or self._tokens >= self.rate:
+                    self._tokens -= count
+                    return
+                wait_seconds = (count - self._tokens) / self.rate
+            time.sleep(wait_seconds)
+
+    def on_success(self):
+        with self._lock:
+            self.rate += self.increase
+            if self.max_rate:
+                self.rate = min(self.rate, self.max_rate)
+
+    def on_throttle(self):
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+
+
+class Checkpoint:
+    """
+    Records the number of input lines that have been fully written, so that
+    an interrupted load can be resumed. Chunks may complete out of order, so
+    only the contiguous prefix of completed chunks is committed.
+    """
+
+    def __init__(self, path: Optional[str]):
+        self.path = Path(path) if path else None
+        self.line = 0
+        self._pending = {}
+
+        if self.path and self.path.exists():
+            self.line = json.loads(self.path.read_text())["line"]
+
+    def complete(self, start_line: int, end_line: int):
+        self._pending[start_line] = end_line
+        while self.line in self._pending:
+            self.line = self._pending.pop(self.line)
+
+        if self.path:
+            self.path.write_text(json.dumps({"line": self.line}))
+
+
+def _init_worker(log_level: str):
+    logger.setLevel(log_level)
+
+
+def _read_chunks(
+    input_file: str, start_line: int, chunk_size: int
+) -> Iterator[Tuple[int, List[str]]]:
+    with open(input_file) as f:
+        line_number = start_line
+        lines = islice(f, start_line, None)
+        while chunk := list(islice(lines, chunk_size)):
+            yield line_number, chunk
+            line_number += len(chunk)
+
+
+def _parse_chunk(start_line: int, lines: List[str]) -> Tuple[List[dict], List[str]]:
+    """
+    Convert a chunk of NDJSON DocumentReferences into DynamoDB items
+    """
+    items = []
+    errors = []
+
+    for line_number, line in enumerate(lines, start=start_line + 1):
+        if not line.strip():
+            continue
+
+        try:
+            pipeline = DocumentReferencePipeline.from_raw(line)
+            result = pipeline.validate()
+            if not result.is_valid:
+                diagnostics = "; ".join(
+                    issue.diagnostics or "" for issue in result.issues
+                )
+                errors.append(f"Line {line_number}: {diagnostics}")
+                continue
+
+            resource = result.resource
+            created_on = resource.meta.lastUpdated if resource.meta else None
+            items.append(pipeline.to_pointer(created_on=created_on).dict())
+
+        except Exception as exc:
+            errors.append(f"Line {line_number}: {exc}")
+
+    return items, errors
+
+
+def _write_items(
+    client, table_name: str, items: List[dict], rate_limiter: AdaptiveRateLimiter
+):
+    """
+    Write items with BatchWriteItem, resending unprocessed items and backing
+    off when DynamoDB throttles the writes
+    """
+    for idx in range(0, len(items), BATCH_WRITE_MAX_ITEMS):
+        requests = [
+            {"PutRequest": {"Item": item}}
+            for item in items[idx : idx + BATCH_WRITE_MAX_ITEMS]
+        ]
+
+        for _ in range(MAX_WRITE_ATTEMPTS):
+            rate_limiter.acquire(len(requests))
+            try:
+                response = client.batch_write_item(RequestItems={table_name: requests})
+            except ClientError as exc:
+                if exc.response["Error"]["Code"] not in THROTTLING_ERROR_CODES:
+                    raise
+                rate_limiter.on_throttle()
+                continue
+
+            requests = response.get("UnprocessedItems", {}).get(table_name, [])
+            if not requests:
+                rate_limiter.on_success()
+                break
+
+            rate_limiter.on_throttle()
+        else:
+            raise RuntimeError(
+                f"Unable to write {len(requests)} items after {MAX_WRITE_ATTEMPTS} attempts"
+            )
+
+
+def bulk_load(
+    input_file: str,
+    table_name: str,
+    dynamodb_resource,
+    checkpoint_file: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    processes: Optional[int] = None,
+    threads: int = 8,
+    initial_rate: float = 500.0,
+    max_rate: Optional[float] = None,
+    log_level: str = "ERROR",
+) -> dict:
+    checkpoint = Checkpoint(checkpoint_file)
+    client = dynamodb_resource.meta.client
+    rate_limiter = AdaptiveRateLimiter(initial_rate=initial_rate, max_rate=max_rate)
+
+    written = 0
+    errors = []
+    start_time = time.monotonic()
+
+    print(f"Loading {input_file} from line {checkpoint.line}....")  # noqa
+
+    with ProcessPoolExecutor(
+        max_workers=processes, initializer=_init_worker, initargs=(log_level,)
+    ) as parsers, ThreadPoolExecutor(max_workers=threads) as writers:
+        pending_writes = {}
+        max_pending = threads * 2
+
+        def _complete_writes(return_when: str):
+            nonlocal written
+            done, _ = wait(pending_writes, return_when=return_when)
+            for future in done:
+                start_line, end_line, count = pending_writes.pop(future)
+                future.result()
+                written += count
+                checkpoint.complete(start_line, end_line)
+
+        def _write_parsed_chunk(start_line: int, line_count: int, parse_future):
+            items, chunk_errors = parse_future.result()
+            errors.extend(chunk_errors)
+
+            write_future = writers.submit(
+                _write_items, client, table_name, items, rate_limiter
+            )
+            pending_writes[write_future] = (
+                start_line,
+                start_line + line_count,
+                len(items),
+            )
+
+            if len(pending_writes) >= max_pending:
+                _complete_writes(FIRST_COMPLETED)
+
+            elapsed = time.monotonic() - start_time
+            print(  # noqa
+                f"Written {written} items ({written / elapsed:.0f} items/s, "
+                f"rate limit {rate_limiter.rate:.0f} items/s)"
+            )
+
+        pending_parses = deque()
+        max_pending_parses = (processes or os.cpu_count() or 1) * 2
+        for start_line, lines in _read_chunks(input_file, checkpoint.line, chunk_size):
+            pending_parses.append(
+                (
+                    start_line,
+                    len(lines),
+                    parsers.submit(_parse_chunk, start_line, lines),
+                )
+            )
+            if len(pending_parses) >= max_pending_parses:
+                _write_parsed_chunk(*pending_parses.popleft())
+
+        while pending_parses:
+            _write_parsed_chunk(*pending_parses.popleft())
+
+        if pending_writes:
+            _complete_writes(ALL_COMPLETED)
+
+    elapsed = time.monotonic() - start_time
+    return {
+        "written": written,
+        "errors": errors,
+        "elapsed": elapsed,
+        "items_per_second": written / elapsed if elapsed else 0.0,
+        "checkpoint": checkpoint.line,
+    }
+
+
+def main(
+    input_file: str,
+    table_name: str,
+    env: Optional[str] = None,
+    endpoint_url: Optional[str] = None,
+    checkpoint_file: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    processes: Optional[int] = None,
+    threads: int = 8,
+    initial_rate: float = 500.0,
+    max_rate: Optional[float] = None,
+):
+    """
+    Bulk load an NDJSON file of DocumentReferences into a pointers table.
+
+    Use --endpoint-url to load into a local DynamoDB (e.g. http://localhost:8000)
+    and --checkpoint-file to resume an interrupted load.
+    """
+    logger.setLevel("ERROR")
+
+    if endpoint_url:
+        dynamodb = boto3.resource(
+            "dynamodb", region_name="eu-west-2", endpoint_url=endpoint_url
+        )
+    elif env:
+        dynamodb = get_boto_session(env).resource("dynamodb", region_name="eu-west-2")
+    else:
+        dynamodb = boto3.resource("dynamodb", region_name="eu-west-2")
+
+    result = bulk_load(
+        input_file=input_file,
+        table_name=table_name,
+        dynamodb_resource=dynamodb,
+        checkpoint_file=checkpoint_file,
+        chunk_size=chunk_size,
+        processes=processes,
+        threads=threads,
+        initial_rate=initial_rate,
+        max_rate=max_rate,
+    )
+
+    for error in result["errors"]:
+        print(error)  # noqa
+
+    print(  # noqa
+        f"Loaded {result['written']} items in {result['elapsed']:.1f}s "
+        f"({result['items_per_second']:.0f} items/s) with {len(result['errors'])} errors"
+    )
+
+
+if __name__ == "__main__":
+    fire.Fire(main)
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import fire
+
+DEFAULT_BUDGET_MS = 600
+DEFAULT_RUNS = 3
+HANDLER_ENVIRONMENT = {
+    "AWS_REGION": "eu-west-2",
+    "AWS_DEFAULT_REGION": "eu-west-2",
+}
+
+
+def find_handler_modules(api_path: str = "api") -> List[str]:
+    """
+    Find the module of every Lambda handler under the API directory
+    """
+    modules = []
+    for handler_file in sorted(Path(api_path).glob("*/*/*.py")):
+        if handler_file.name.startswith("_"):
+            continue
+        modules.append(".".join(handler_file.with_suffix("").parts))
+    return modules
+
+
+def parse_import_times(stderr: str) -> Dict[str, int]:
+    """
+    Parse the cumulative import time (in microseconds) of each module from
+    the output of python -X importtime
+    """
+    import_times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+
+        _, cumulative_time, module = line.split(":", maxsplit=1)[1].split("|")
+        if not cumulative_time.strip().isdigit():
+            continue
+
+        import_times[module.strip()] = int(cumulative_time)
+    return import_times
+
+
+def measure_import_time(module: str, layer_path: str = "layer") -> float:
+    """
+    Import the module in a fresh interpreter and return the cumulative import
+    time in milliseconds
+    """
+    env = {
+        **os.environ,
+        **HANDLER_ENVIRONMENT,
+        "PYTHONPATH": os.pathsep.join([layer_path, "."]),
+    }
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    return parse_import_times(result.stderr)[module] / 1000
+
+
+def main(
+    budget_ms: float = DEFAULT_BUDGET_MS,
+    runs: int = DEFAULT_RUNS,
+    module: Optional[str] = None,
+):
+    """
+    Measure the cold import time of each Lambda handler, failing if any of
+    them exceeds the budget. The fastest of several runs is used to reduce
+    noise from the machine running the check.
+    """
+    modules = [module] if module else find_handler_modules()
+    failures = []
+
+    for handler_module in modules:
+        import_time = min(measure_import_time(handler_module) for _ in range(runs))
+        status = "OK" if import_time <= budget_ms else "OVER BUDGET"
+        print(f"{import_time:8.1f}ms  {status:11}  {handler_module}")  # noqa
+
+        if import_time > budget_ms:
+            failures.append(handler_module)
+
+    if failures:
+        print(  # noqa
+            f"{len(failures)} handler(s) exceeded the import budget of {budget_ms}ms"
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    fire.Fire(main)
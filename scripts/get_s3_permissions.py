@@ -6,6 +6,7 @@ from pathlib import Path
 import fire
 from aws_session_assume import get_boto_session
 
+from nrlf.core.authoriser import write_permissions_index
 from nrlf.core.constants import PointerTypes
 
 
@@ -76,15 +77,13 @@ def main(use_shared_resources: str, env: str, workspace: str, path_to_store: str
     s3 = boto_session.client("s3")
     files, folders = get_file_folders(s3, bucket)
 
-    download_files(
-        s3,
-        bucket,
-        path.abspath(path.join(path_to_store + "/nrlf_permissions")),
-        files,
-        folders,
-    )
+    permissions_path = path.abspath(path.join(path_to_store + "/nrlf_permissions"))
+    download_files(s3, bucket, permissions_path, files, folders)
     print("Downloaded S3 permissions...")
 
+    index_path = write_permissions_index(permissions_path)
+    print(f"Compiled permissions index to {index_path}...")
+
 
 if __name__ == "__main__":
     fire.Fire(main)
@@ -0,0 +1,102 @@
+import json
+import tempfile
+from pathlib import Path
+
+from moto import mock_aws
+
+from nrlf.core.dynamodb.repository import DocumentPointerRepository
+from nrlf.tests.data import load_document_reference_json
+from nrlf.tests.dynamodb import mock_repository
+from scripts.bulk_load_pointers import AdaptiveRateLimiter, Checkpoint, bulk_load
+
+
+def _write_input_file(path, count: int, invalid_lines: tuple = ()) -> str:
+    lines = []
+    for idx in range(count):
+        resource = load_document_reference_json("Y05868-736253002-Valid")
+        resource["id"] = f"Y05868-bulk-{idx:04}"
+        if idx in invalid_lines:
+            del resource["subject"]
+        lines.append(json.dumps(resource))
+
+    input_file = path / "pointers.ndjson"
+    input_file.write_text("\n".join(lines) + "\n")
+    return str(input_file)
+
+
+@mock_aws
+@mock_repository
+def test_bulk_load(repository: DocumentPointerRepository):
+    tmp_path = Path(tempfile.mkdtemp())
+    input_file = _write_input_file(tmp_path, 60, invalid_lines=(5,))
+    checkpoint_file = str(tmp_path / "checkpoint.json")
+
+    result = bulk_load(
+        input_file=input_file,
+        table_name=repository.table_name,
+        dynamodb_resource=repository.dynamodb,
+        checkpoint_file=checkpoint_file,
+        chunk_size=20,
+        processes=1,
+        threads=2,
+        initial_rate=10000,
+    )
+
+    assert result["written"] == 59
+    assert result["checkpoint"] == 60
+    assert len(result["errors"]) == 1
+    assert result["errors"][0].startswith("Line 6: ")
+    assert json.loads((tmp_path / "checkpoint.json").read_text()) == {"line": 60}
+
+    assert repository.get_by_id("Y05868-bulk-0000") is not None
+    assert repository.get_by_id("Y05868-bulk-0005") is None
+    assert repository.get_by_id("Y05868-bulk-0059") is not None
+
+
+@mock_aws
+@mock_repository
+def test_bulk_load_resumes_from_checkpoint(repository: DocumentPointerRepository):
+    tmp_path = Path(tempfile.mkdtemp())
+    input_file = _write_input_file(tmp_path, 30)
+    checkpoint_file = tmp_path / "checkpoint.json"
+    checkpoint_file.write_text(json.dumps({"line": 20}))
+
+    result = bulk_load(
+        input_file=input_file,
+        table_name=repository.table_name,
+        dynamodb_resource=repository.dynamodb,
+        checkpoint_file=str(checkpoint_file),
+        chunk_size=20,
+        processes=1,
+        threads=1,
+        initial_rate=10000,
+    )
+
+    assert result["written"] == 10
+    assert result["checkpoint"] == 30
+    assert repository.get_by_id("Y05868-bulk-0019") is None
+    assert repository.get_by_id("Y05868-bulk-0020") is not None
+
+
+def test_checkpoint_commits_contiguous_chunks(tmp_path):
+    checkpoint = Checkpoint(str(tmp_path / "checkpoint.json"))
+
+    checkpoint.complete(10, 20)
+    assert checkpoint.line == 0
+
+    checkpoint.complete(0, 10)
+    assert checkpoint.line == 20
+    assert Checkpoint(str(tmp_path / "checkpoint.json")).line == 20
+
+
+def test_adaptive_rate_limiter():
+    rate_limiter = AdaptiveRateLimiter(initial_rate=100, min_rate=40, max_rate=110)
+
+    rate_limiter.on_success()
+    assert rate_limiter.rate == 110
+
+    rate_limiter.on_throttle()
+    assert rate_limiter.rate == 55
+
+    rate_limiter.on_throttle()
+    assert rate_limiter.rate == 40
@@ -0,0 +1,54 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from scripts.check_import_times import (
+    HANDLER_ENVIRONMENT,
+    find_handler_modules,
+    parse_import_times,
+)
+
+
+def test_parse_import_times():
+    stderr = "\n".join(
+        [
+            "import time: self [us] | cumulative | imported package",
+            "import time:       967 |        967 |             botocore",
+            "import time:      2309 |       4588 |       botocore.exceptions",
+            "some other output",
+        ]
+    )
+
+    assert parse_import_times(stderr) == {
+        "botocore": 967,
+        "botocore.exceptions": 4588,
+    }
+
+
+def test_find_handler_modules():
+    modules = find_handler_modules()
+
+    assert "api.consumer.readDocumentReference.read_document_reference" in modules
+    assert "api.producer.status.status" in modules
+    assert not any(".tests." in module for module in modules)
+
+
+@pytest.mark.parametrize(
+    "module",
+    [module for module in find_handler_modules() if module.startswith("api.consumer.")],
+)
+def test_consumer_handlers_do_not_import_producer_model(module):
+    env = {**os.environ, **HANDLER_ENVIRONMENT, "PYTHONPATH": f"layer{os.pathsep}."}
+    code = f"import sys, {module}; print('nrlf.producer.fhir.r4.model' in sys.modules)"
+
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+
+    assert result.stdout.strip() == "False"
@@ -20,6 +20,7 @@ resource "aws_iam_policy" "pointers-table-read" {
           "dynamodb:Query",
           "dynamodb:Scan",
           "dynamodb:GetItem",
+          "dynamodb:BatchGetItem",
         ],
         Resource = [
           "${aws_dynamodb_table.pointers.arn}*"
@@ -51,6 +52,7 @@ resource "aws_iam_policy" "pointers-table-write" {
           "dynamodb:PutItem",
           "dynamodb:UpdateItem",
           "dynamodb:DeleteItem",
+          "dynamodb:BatchWriteItem",
         ],
         Resource = [
           "${aws_dynamodb_table.pointers.arn}*"
@@ -66,12 +66,13 @@ module "consumer__searchDocumentReference" {
   api_gateway_source_arn = ["arn:aws:execute-api:${local.region}:${local.aws_account_id}:${module.consumer__gateway.api_gateway_id}/*/GET/DocumentReference"]
   kms_key_id             = module.kms__cloudwatch.kms_arn
   environment_variables = {
-    PREFIX               = "${local.prefix}--"
-    ENVIRONMENT          = local.environment
-    AUTH_STORE           = local.auth_store_id
-    POWERTOOLS_LOG_LEVEL = local.log_level
-    SPLUNK_INDEX         = module.firehose__processor.splunk.index
-    TABLE_NAME           = local.pointers_table_name
+    PREFIX                  = "${local.prefix}--"
+    ENVIRONMENT             = local.environment
+    AUTH_STORE              = local.auth_store_id
+    POWERTOOLS_LOG_LEVEL    = local.log_level
+    SPLUNK_INDEX            = module.firehose__processor.splunk.index
+    TABLE_NAME              = local.pointers_table_name
+    PAGINATION_TOKEN_SECRET = random_password.pagination_token_secret.result
   }
   additional_policies = [
     local.pointers_table_read_policy_arn,
@@ -95,12 +96,13 @@ module "consumer__searchPostDocumentReference" {
   api_gateway_source_arn = ["arn:aws:execute-api:${local.region}:${local.aws_account_id}:${module.consumer__gateway.api_gateway_id}/*/POST/DocumentReference/_search"]
   kms_key_id             = module.kms__cloudwatch.kms_arn
   environment_variables = {
-    PREFIX               = "${local.prefix}--"
-    ENVIRONMENT          = local.environment
-    AUTH_STORE           = local.auth_store_id
-    POWERTOOLS_LOG_LEVEL = local.log_level
-    SPLUNK_INDEX         = module.firehose__processor.splunk.index
-    TABLE_NAME           = local.pointers_table_name
+    PREFIX                  = "${local.prefix}--"
+    ENVIRONMENT             = local.environment
+    AUTH_STORE              = local.auth_store_id
+    POWERTOOLS_LOG_LEVEL    = local.log_level
+    SPLUNK_INDEX            = module.firehose__processor.splunk.index
+    TABLE_NAME              = local.pointers_table_name
+    PAGINATION_TOKEN_SECRET = random_password.pagination_token_secret.result
   }
   additional_policies = [
     local.pointers_table_read_policy_arn,
@@ -321,6 +323,36 @@ module "producer__upsertDocumentReference" {
   retention = var.log_retention_period
 }
 
+module "producer__processTransaction" {
+  source                 = "./modules/lambda"
+  parent_path            = "api/producer"
+  name                   = "processTransaction"
+  region                 = local.region
+  prefix                 = local.prefix
+  layers                 = [module.nrlf.layer_arn, module.third_party.layer_arn, module.nrlf_permissions.layer_arn]
+  api_gateway_source_arn = ["arn:aws:execute-api:${local.region}:${local.aws_account_id}:${module.producer__gateway.api_gateway_id}/*/POST/"]
+  kms_key_id             = module.kms__cloudwatch.kms_arn
+  environment_variables = {
+    PREFIX               = "${local.prefix}--"
+    ENVIRONMENT          = local.environment
+    AUTH_STORE           = local.auth_store_id
+    POWERTOOLS_LOG_LEVEL = local.log_level
+    SPLUNK_INDEX         = module.firehose__processor.splunk.index
+    TABLE_NAME           = local.pointers_table_name
+  }
+  additional_policies = [
+    local.pointers_table_write_policy_arn,
+    local.pointers_table_read_policy_arn,
+    local.pointers_kms_read_write_arn,
+    local.auth_store_read_policy_arn
+  ]
+  firehose_subscriptions = [
+    module.firehose__processor.firehose_subscription
+  ]
+  handler   = "process_transaction.handler"
+  retention = var.log_retention_period
+}
+
 module "consumer__status" {
   source                 = "./modules/lambda"
   parent_path            = "api/consumer"
@@ -0,0 +1,4 @@
+resource "random_password" "pagination_token_secret" {
+  length  = 64
+  special = false
+}